@@ -0,0 +1,38 @@
+"""
+Alert Routes - Upcoming renewal and notice deadlines
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.dependencies import get_alert_scheduler
+from app.services.alert_service import AlertScheduler
+
+router = APIRouter()
+
+
+@router.get("/upcoming")
+async def upcoming_alerts(
+    organization_id: str,
+    days: int = Query(30, ge=0, le=3660),
+    include_dismissed: bool = False,
+    scheduler: AlertScheduler = Depends(get_alert_scheduler),
+):
+    """Alerts of an organization due in the next `days` days, soonest first"""
+    alerts = scheduler.due_within(organization_id, days, include_dismissed=include_dismissed)
+    return {"alerts": [alert.to_dict() for alert in alerts], "count": len(alerts), "days": days}
+
+
+@router.get("/contracts/{contract_id}")
+async def contract_alerts(contract_id: str, scheduler: AlertScheduler = Depends(get_alert_scheduler)):
+    """All scheduled alerts of one contract"""
+    alerts = scheduler.for_contract(contract_id)
+    return {"alerts": [alert.to_dict() for alert in alerts], "count": len(alerts)}
+
+
+@router.post("/{alert_id}/dismiss")
+async def dismiss_alert(alert_id: str, scheduler: AlertScheduler = Depends(get_alert_scheduler)):
+    """Stop listing and sending an alert"""
+    alert = scheduler.dismiss(alert_id)
+    if alert is None:
+        raise HTTPException(status_code=404, detail="Alert not found")
+    return alert.to_dict()
@@ -0,0 +1,34 @@
+"""
+Analysis Routes - Contract Q&A
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field
+
+from app.dependencies import get_rag_service
+from app.services.rag_service import RAGService
+
+router = APIRouter()
+
+
+class ClarifyRequest(BaseModel):
+    """A question about one contract"""
+    question: str = Field(..., min_length=1, max_length=2000)
+    token_budget: Optional[int] = Field(None, gt=0, le=8000)
+
+
+@router.get("/answer-cache")
+async def answer_cache_stats(rag: RAGService = Depends(get_rag_service)):
+    """Answer cache hit rate, sampled false-hit rate and the recent false hits"""
+    if rag.answer_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **rag.answer_cache.stats(include_samples=True)}
+
+
+@router.post("/{contract_id}/clarify")
+async def clarify(contract_id: str, request: ClarifyRequest, rag: RAGService = Depends(get_rag_service)):
+    """RAG-based answer to a question, citing the contract sections used"""
+    answer = await rag.answer_question(request.question, contract_id, token_budget=request.token_budget)
+    return {"contract_id": contract_id, "question": request.question, **answer}
@@ -0,0 +1,99 @@
+"""
+Contract Routes - Upload, analysis submission & deletion
+"""
+
+from typing import Optional
+import asyncio
+import os
+import re
+import uuid
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+
+from app.config import get_settings
+from app.dependencies import ServiceContainer, get_document_storage, get_job_queue, get_services
+from app.services.storage import DocumentStorage, UploadTooLarge
+from app.tasks import JobPriority, JobQueue
+
+router = APIRouter()
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+_SAFE_FILENAME = re.compile(r"[^A-Za-z0-9_.-]+")
+_SAFE_ID = re.compile(r"[A-Za-z0-9_.-]+")
+
+
+@router.post("/upload", status_code=status.HTTP_202_ACCEPTED)
+async def upload_contract(
+    file: UploadFile = File(...),
+    organization_id: str = Form(...),
+    vendor: Optional[str] = Form(None),
+    priority: str = Form("interactive"),
+    jobs: JobQueue = Depends(get_job_queue),
+    storage: DocumentStorage = Depends(get_document_storage),
+):
+    """
+    Upload a contract (PDF, image or UTF-8 text) and queue its analysis
+
+    The file is streamed to document storage in 1 MiB chunks and hashed
+    on the way. Returns immediately with a job id; poll
+    /api/v1/jobs/{job_id} for progress. Re-uploading identical content
+    returns the existing job.
+    """
+    try:
+        job_priority = JobPriority[priority.upper()]
+    except KeyError:
+        raise HTTPException(status_code=422, detail=f"Unknown priority: {priority}")
+    # Used as a storage key segment: reject anything that is not a plain name
+    if not _SAFE_ID.fullmatch(organization_id) or organization_id in (".", ".."):
+        raise HTTPException(status_code=422, detail=f"Invalid organization_id: {organization_id!r}")
+
+    async def chunks():
+        while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+            yield chunk
+
+    contract_id = uuid.uuid4().hex
+    filename = _SAFE_FILENAME.sub("-", os.path.basename(file.filename or "contract")) or "contract"
+    try:
+        stored = await storage.save(
+            f"{organization_id}/{contract_id}/{filename}",
+            chunks(),
+            content_type=file.content_type,
+            max_bytes=get_settings().max_upload_mb * 1024 * 1024,
+        )
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    job = await jobs.submit(
+        "analyze_contract",
+        payload={
+            "contract_id": contract_id,
+            "organization_id": organization_id,
+            "vendor": vendor,
+            "filename": file.filename,
+            "document_key": stored.key,
+            "content_type": stored.content_type,
+        },
+        tenant_id=organization_id,
+        priority=job_priority,
+        dedup_key=f"{organization_id}:{stored.sha256}",
+    )
+    if job.get("deduplicated"):
+        await storage.delete(stored.key)
+    return {**job, "status_url": f"/api/v1/jobs/{job['id']}"}
+
+
+@router.delete("/{contract_id}")
+async def delete_contract(contract_id: str, services: ServiceContainer = Depends(get_services)):
+    """
+    Delete a contract's derived data
+
+    Removes its embeddings and stored text, cancels its alerts, takes it
+    out of the organization's dashboard aggregates and lets its content be
+    uploaded (and analysed) again.
+    """
+    removed = await asyncio.to_thread(services.dashboard_store.remove, contract_id)
+    alerts = services.alert_scheduler.cancel_contract(contract_id)
+    await services.job_queue.forget_contract(contract_id)
+    if not await services.rag_service.cleanup_contract(contract_id):
+        raise HTTPException(status_code=502, detail="Failed to remove contract embeddings")
+    return {"contract_id": contract_id, "deleted": True, "dashboard": removed, "alerts_cancelled": alerts}
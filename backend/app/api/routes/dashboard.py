@@ -0,0 +1,29 @@
+"""
+Dashboard Routes - Organization portfolio metrics from materialized aggregates
+"""
+
+import asyncio
+
+from fastapi import APIRouter, Depends, Query
+
+from app.dependencies import get_dashboard_store
+from app.services.dashboard_store import DashboardStore
+
+router = APIRouter()
+
+
+@router.get("")
+async def get_dashboard(
+    organization_id: str,
+    days: int = Query(90, ge=0, le=3660),
+    limit: int = Query(10, ge=1, le=100),
+    store: DashboardStore = Depends(get_dashboard_store),
+):
+    """Risk distribution, average scores, clause categories and upcoming renewals/obligations"""
+    return store.dashboard(organization_id, days=days, limit=limit)
+
+
+@router.post("/rebuild")
+async def rebuild_dashboard(store: DashboardStore = Depends(get_dashboard_store)):
+    """Recompute every organization's aggregates from the stored contract summaries"""
+    return await asyncio.to_thread(store.rebuild)
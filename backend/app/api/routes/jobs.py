@@ -0,0 +1,25 @@
+"""
+Job Routes - Background job status polling
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.dependencies import get_job_queue
+from app.tasks import JobQueue
+
+router = APIRouter()
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str, jobs: JobQueue = Depends(get_job_queue)):
+    """Status, progress (0-1), current stage and result of a job"""
+    job = await jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("")
+async def queue_stats(jobs: JobQueue = Depends(get_job_queue)):
+    """Queue depth per priority and worker utilisation"""
+    return jobs.stats()
@@ -0,0 +1,98 @@
+"""
+Configuration Management
+Settings loaded from environment variables (see docker-compose.yml)
+"""
+
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Application settings"""
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    app_name: str = "ContractGuard API"
+    app_version: str = "1.0.0"
+    environment: str = "development"
+
+    # External services
+    openai_api_key: str = ""
+    openai_model: str = "gpt-4-turbo"
+    pinecone_api_key: str = ""
+    pinecone_environment: str = "prod"
+    pinecone_index_name: str = "contractguard"
+    vector_partitions: int = 4  # Per organization
+
+    # Per-organization vector memory (0 disables a limit). Partitions over a
+    # tenant's budget or idle too long are spilled to vector_spill_dir (a
+    # temporary directory when empty) and reloaded on first query
+    vector_tenant_memory_mb: int = 256
+    vector_idle_unload_seconds: float = 900.0
+    vector_spill_dir: str = ""
+
+    # Large partitions are scored in shards across cores (0 = one thread per core)
+    vector_search_workers: int = 0
+    vector_shard_rows: int = 4096
+
+    # Pooled HTTP clients (one pool per upstream, shared by all requests)
+    http_max_connections: int = 100
+    http_max_keepalive: int = 20
+    http_keepalive_expiry: float = 30.0
+    http_connect_timeout: float = 5.0
+
+    # Time budgets (seconds). Outbound calls get what is left of the request
+    # or job deadline, capped per call; slow idempotent calls (embeddings,
+    # vector queries sent to Pinecone) are hedged after their recent p95 latency
+    request_deadline: float = 30.0
+    job_deadline: float = 600.0
+    llm_timeout: float = 60.0
+    vector_timeout: float = 10.0
+    hedge_requests: bool = True
+
+    # Semantic answer cache for /clarify (0 entries disables it)
+    answer_cache_entries: int = 64
+    answer_cache_threshold: float = 0.92
+    answer_cache_sample_rate: float = 0.02
+
+    # Local clause classifier (chunks below the confidence go to the LLM)
+    clause_classifier: bool = True
+    clause_min_confidence: float = 0.6
+
+    # Near-duplicate reuse: above the threshold a new upload reuses an
+    # analysed contract's embeddings and clauses; above the judgement
+    # threshold (same vendor) also its summary and scores
+    near_duplicates: bool = True
+    near_duplicate_threshold: float = 0.85
+    near_duplicate_judgement_threshold: float = 0.95
+
+    # Renewal alerts: notify this many days before a due date; the
+    # dispatcher checks for due notifications every interval seconds
+    alert_lead_days: int = 30
+    alert_check_interval: float = 3600.0
+
+    # Background jobs (REDIS_URL shares job status across API processes)
+    job_workers: int = 4
+    redis_url: str = ""
+
+    # Tracing (OTLP/HTTP JSON collector, e.g. http://localhost:4318/v1/traces)
+    otlp_endpoint: str = ""
+
+    # Local storage
+    text_store_dir: str = "data/text_store"
+    dashboard_store_dir: str = "data/dashboard"
+
+    # Uploaded files (setting S3_BUCKET switches to S3 / S3-compatible storage)
+    upload_dir: str = "data/uploads"
+    s3_bucket: str = ""
+    s3_prefix: str = "contracts/"
+    s3_endpoint_url: str = ""
+    max_upload_mb: int = 50
+
+    # Text extraction (0 = one process per core)
+    extraction_processes: int = 0
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Cached settings instance"""
+    return Settings()
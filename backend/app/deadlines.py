@@ -0,0 +1,208 @@
+"""
+Deadlines - Per-request time budgets for outbound calls
+A contextvar deadline bounds every upstream call, recent call latencies are
+tracked per call name, and idempotent calls can be hedged with a second
+attempt once they run past their recent p95 latency
+"""
+
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Optional, TypeVar
+import asyncio
+import logging
+import time
+
+from app.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_deadline: ContextVar[Optional[float]] = ContextVar("contractguard_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's time budget ran out before an upstream call finished"""
+
+
+@contextmanager
+def deadline(seconds: Optional[float]):
+    """
+    Bound everything awaited inside the block to seconds from now
+
+    Nested deadlines can only shorten the budget. Tasks and threads
+    started inside inherit it through contextvars.
+
+    Args:
+        seconds: Budget in seconds (None leaves the current deadline)
+    """
+    if seconds is None:
+        yield
+        return
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(expires if current is None else min(current, expires))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current deadline (None when unbounded)"""
+    expires = _deadline.get()
+    return None if expires is None else expires - time.monotonic()
+
+
+async def bounded(call: Callable[[Optional[float]], Awaitable[T]], name: str, cap: Optional[float] = None) -> T:
+    """
+    Run an upstream call with the remaining budget as its timeout
+
+    Successful call latencies feed latency_window(name).
+
+    Args:
+        call: Receives the timeout (seconds or None) to pass to the client
+        name: Call name for metrics, e.g. "llm.completion"
+        cap: Longest a single call may take, deadline or not
+
+    Returns:
+        The call's result
+
+    Raises:
+        DeadlineExceeded: Budget exhausted before or during the call
+    """
+    left = remaining()
+    timeout = cap if left is None else (left if cap is None else min(left, cap))
+    if timeout is not None and timeout <= 0:
+        _exceeded(name).inc()
+        raise DeadlineExceeded(f"{name}: no time budget left")
+    started = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(call(timeout), timeout)
+    except asyncio.TimeoutError:
+        _exceeded(name).inc()
+        raise DeadlineExceeded(f"{name}: timed out after {timeout:.2f}s")
+    latency_window(name).observe(time.perf_counter() - started)
+    return result
+
+
+class LatencyWindow:
+    """Recent successful call latencies (hedge delays, time reserves)"""
+
+    def __init__(self, size: int = 256, quantile: float = 0.95, min_samples: int = 20):
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def estimate(self) -> Optional[float]:
+        """The window's p95 (None until enough samples were seen)"""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(int(self.quantile * len(ordered)), len(ordered) - 1)]
+
+
+_windows: dict[str, LatencyWindow] = {}
+
+
+def latency_window(name: str) -> LatencyWindow:
+    window = _windows.get(name)
+    if window is None:
+        window = _windows.setdefault(name, LatencyWindow())
+    return window
+
+
+async def hedged(call: Callable[[], Awaitable[T]], name: str, enabled: bool = True) -> T:
+    """
+    Run an idempotent call, firing a second attempt if the first is slow
+
+    The backup starts once the first attempt has run for the call's
+    recent p95 latency (and only if the deadline leaves time for it);
+    whichever attempt succeeds first wins and the other is cancelled.
+
+    Args:
+        call: Starts one attempt, wrapping bounded() under the same name
+            (which records the latencies the delay is taken from)
+        name: Call name for the latency window and metrics
+        enabled: False runs a single attempt
+
+    Returns:
+        Result of the first successful attempt
+    """
+    delay = latency_window(name).estimate() if enabled else None
+    first = asyncio.ensure_future(call())
+    attempts = [first]
+
+    try:
+        if delay is not None:
+            done, _ = await asyncio.wait({first}, timeout=delay)
+            left = remaining()
+            if not done and (left is None or left > delay):
+                REGISTRY.gauge(
+                    "contractguard_hedge_delay_seconds", "Current hedge delay (recent p95)", call=name
+                ).set(delay)
+                _hedges(name, "fired").inc()
+                attempts.append(asyncio.ensure_future(call()))
+
+        pending = set(attempts)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for attempt in done:
+                if attempt.cancelled():
+                    # exception() would raise CancelledError out of the loop; the other attempt may still win
+                    error = error or asyncio.CancelledError()
+                    continue
+                if attempt.exception() is None:
+                    if attempt is not first:
+                        _hedges(name, "won").inc()
+                    return attempt.result()
+                error = attempt.exception()
+        raise error
+    finally:
+        for attempt in attempts:
+            attempt.cancel()
+
+
+def _exceeded(name: str):
+    return REGISTRY.counter(
+        "contractguard_deadline_exceeded_total", "Upstream calls cut off by the request deadline", call=name
+    )
+
+
+def _hedges(name: str, outcome: str):
+    return REGISTRY.counter(
+        "contractguard_hedged_requests_total", "Hedged second attempts fired, and those that won", call=name, outcome=outcome
+    )
+
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware giving each HTTP request a time budget
+
+    Clients may ask for a shorter budget with an X-Request-Timeout header
+    (seconds); it is never extended past the server default.
+    """
+
+    def __init__(self, app, default_seconds: float = 30.0):
+        self.app = app
+        self.default_seconds = default_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        budget = self.default_seconds
+        for name, value in scope.get("headers") or []:
+            if name == b"x-request-timeout":
+                try:
+                    budget = min(budget, max(float(value), 0.0))
+                except ValueError:
+                    pass
+        with deadline(budget):
+            await self.app(scope, receive, send)
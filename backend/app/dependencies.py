@@ -0,0 +1,325 @@
+"""
+Dependency Injection
+Application-lifetime service container and FastAPI dependencies
+"""
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+import asyncio
+import logging
+import time
+
+from fastapi import Request
+
+from app.config import Settings
+from app.metrics import instrument
+from app.services.alert_service import AlertScheduler
+from app.services.answer_cache import SemanticAnswerCache
+from app.services.clause_classifier import ClauseClassifier
+from app.services.context_packer import count_tokens, tokenizer_backend
+from app.services.dashboard_store import DashboardStore
+from app.services.llm_service import LLMService
+from app.services.near_duplicates import NearDuplicateIndex
+from app.services.ocr_service import OCRService
+from app.services.rag_service import RAGService
+from app.services.storage import DocumentStorage, LocalDocumentStorage, S3DocumentStorage
+from app.services.text_store import DocumentTextStore
+from app.services.vector_service import VectorService
+from app.tasks import HANDLERS, InMemoryJobStore, JobQueue, RedisJobStore
+from app.tracing import OTLPExporter, trace_service
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ServiceContainer:
+    """
+    Services shared by every request
+
+    Built once in the app lifespan: the pooled HTTP clients (one per
+    upstream, with keep-alive) are handed to the services, warmed up
+    before traffic is accepted and closed on shutdown. Heavy imports
+    (NumPy, tokenizer tables) happen in a background warmup after the
+    container reports ready, so they do not lengthen cold starts.
+    """
+    settings: Settings
+    http_clients: dict[str, "httpx.AsyncClient"]
+    llm_service: LLMService
+    vector_service: VectorService
+    rag_service: RAGService
+    text_store: DocumentTextStore
+    storage: DocumentStorage
+    ocr_service: OCRService
+    alert_scheduler: AlertScheduler
+    dashboard_store: DashboardStore
+    job_queue: Optional[JobQueue] = None
+    trace_exporter: Optional[OTLPExporter] = None
+    ready: bool = False
+    warmup_ms: Optional[float] = None
+    warmup_errors: list[str] = field(default_factory=list)
+    background_warmup: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Settings,
+        llm_service: Optional[LLMService] = None,
+        vector_service: Optional[VectorService] = None
+    ) -> "ServiceContainer":
+        """
+        Build services around shared connection pools
+
+        Args:
+            settings: Application settings
+            llm_service: Prebuilt LLM service to use instead (e.g. a load-test fake)
+            vector_service: Prebuilt vector service to use instead
+
+        Returns:
+            Container (not yet warmed up)
+        """
+        import httpx
+
+        limits = httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        )
+        timeout = httpx.Timeout(None, connect=settings.http_connect_timeout)
+        http_clients = {
+            "openai": httpx.AsyncClient(limits=limits, timeout=timeout),
+            "pinecone": httpx.AsyncClient(limits=limits, timeout=timeout),
+        }
+        if settings.otlp_endpoint:
+            http_clients["otlp"] = httpx.AsyncClient(limits=limits, timeout=timeout)
+
+        llm_service = llm_service or LLMService(
+            api_key=settings.openai_api_key,
+            model=settings.openai_model,
+            http_client=http_clients["openai"],
+            request_timeout=settings.llm_timeout,
+            hedge_embeddings=settings.hedge_requests,
+        )
+        vector_service = vector_service or VectorService(
+            api_key=settings.pinecone_api_key,
+            environment=settings.pinecone_environment,
+            index_name=settings.pinecone_index_name,
+            partition_count=settings.vector_partitions,
+            http_client=http_clients["pinecone"],
+            request_timeout=settings.vector_timeout,
+            hedge_searches=settings.hedge_requests,
+            tenant_memory_bytes=settings.vector_tenant_memory_mb * 1024 * 1024 or None,
+            idle_unload_seconds=settings.vector_idle_unload_seconds or None,
+            spill_dir=settings.vector_spill_dir or None,
+            search_workers=settings.vector_search_workers or None,
+            shard_rows=settings.vector_shard_rows,
+        )
+        text_store = DocumentTextStore(settings.text_store_dir)
+        if settings.s3_bucket:
+            storage = S3DocumentStorage(
+                settings.s3_bucket, prefix=settings.s3_prefix, endpoint_url=settings.s3_endpoint_url
+            )
+        else:
+            storage = LocalDocumentStorage(settings.upload_dir)
+        answer_cache = None
+        if settings.answer_cache_entries > 0:
+            answer_cache = SemanticAnswerCache(
+                threshold=settings.answer_cache_threshold,
+                max_entries=settings.answer_cache_entries,
+                sample_rate=settings.answer_cache_sample_rate,
+            )
+        rag_service = RAGService(
+            llm_service=llm_service,
+            vector_service=vector_service,
+            text_store=text_store,
+            answer_cache=answer_cache,
+            clause_classifier=(
+                ClauseClassifier(min_confidence=settings.clause_min_confidence) if settings.clause_classifier else None
+            ),
+            near_duplicates=(
+                NearDuplicateIndex(
+                    threshold=settings.near_duplicate_threshold,
+                    judgement_threshold=settings.near_duplicate_judgement_threshold,
+                )
+                if settings.near_duplicates else None
+            ),
+        )
+        container = cls(
+            settings=settings,
+            http_clients=http_clients,
+            llm_service=trace_service(instrument(llm_service, "llm"), "llm", private=("_call_gpt",)),
+            vector_service=trace_service(
+                instrument(vector_service, "vector"), "vector", private=("_search_partition",)
+            ),
+            rag_service=trace_service(instrument(rag_service, "rag"), "rag"),
+            text_store=text_store,
+            storage=storage,
+            ocr_service=OCRService(storage, processes=settings.extraction_processes or None),
+            alert_scheduler=AlertScheduler(
+                lead_days={"renewal": settings.alert_lead_days, "termination_window": settings.alert_lead_days}
+            ),
+            dashboard_store=DashboardStore(settings.dashboard_store_dir, expiring_days=settings.alert_lead_days),
+        )
+        container.job_queue = JobQueue(
+            handlers=HANDLERS,
+            context=container,
+            concurrency=settings.job_workers,
+            store=RedisJobStore(settings.redis_url) if settings.redis_url else InMemoryJobStore(),
+            attempt_timeout=settings.job_deadline,
+        )
+        if settings.otlp_endpoint:
+            container.trace_exporter = OTLPExporter(settings.otlp_endpoint, http_clients["otlp"])
+        return container
+
+    async def start(self) -> bool:
+        """Warm up, then start job workers, alert dispatch, trace export and background warmup"""
+        ready = await self.warmup()
+        self.job_queue.start()
+        self.alert_scheduler.start(self.settings.alert_check_interval)
+        if self.trace_exporter:
+            self.trace_exporter.start()
+        self.background_warmup = asyncio.create_task(self.warmup_background())
+        return ready
+
+    async def warmup(self) -> bool:
+        """
+        Prepare services before the first request
+
+        - Initialize the vector index (connection + index handle)
+        - Load index stats into memory
+        - Rebuild dashboard aggregates from stored contract summaries
+        - Reschedule renewal and notice alerts from the summaries' terms
+
+        Returns:
+            Whether the container is ready to serve
+        """
+        started = time.perf_counter()
+        self.warmup_errors = []
+
+        if not await self.vector_service.init_index():
+            self.warmup_errors.append("vector index initialization failed")
+
+        stats = await self.vector_service.get_stats()
+        if "error" in stats:
+            self.warmup_errors.append(f"vector stats unavailable: {stats['error']}")
+
+        try:
+            await asyncio.to_thread(self.dashboard_store.rebuild)
+        except OSError as e:
+            self.warmup_errors.append(f"dashboard aggregates unavailable: {str(e)}")
+        else:
+            self.alert_scheduler.restore(self.dashboard_store.summaries())
+
+        self.warmup_ms = (time.perf_counter() - started) * 1000
+        self.ready = not self.warmup_errors
+        logger.info(f"Service warmup finished in {self.warmup_ms:.1f}ms (ready={self.ready})")
+        return self.ready
+
+    async def warmup_background(self) -> None:
+        """
+        Load heavy dependencies off the request path once serving
+
+        Imports NumPy (vector index, MMR) and primes the tokenizer in a
+        worker thread; a request that needs either first simply waits on
+        the import lock instead of doing the work itself.
+        """
+        started = time.perf_counter()
+
+        def preload() -> None:
+            import numpy  # noqa: F401
+            count_tokens("ContractGuard warmup")
+
+        try:
+            await asyncio.to_thread(preload)
+            logger.info(f"Background warmup finished in {(time.perf_counter() - started) * 1000:.1f}ms")
+        except Exception as e:
+            logger.warning(f"Background warmup failed: {str(e)}")
+
+    async def close(self) -> None:
+        """Stop job workers and alert dispatch, close connection pools, release memory maps and worker pools"""
+        self.ready = False
+        if self.background_warmup:
+            self.background_warmup.cancel()
+            await asyncio.gather(self.background_warmup, return_exceptions=True)
+        await self.job_queue.stop()
+        await self.alert_scheduler.stop()
+        if self.trace_exporter:
+            await self.trace_exporter.stop()
+        for name, client in self.http_clients.items():
+            await client.aclose()
+            logger.debug(f"Closed {name} HTTP pool")
+        self.text_store.close()
+        self.ocr_service.close()
+        self.vector_service.close()
+
+    def readiness(self) -> dict:
+        """Pool and cache state for the readiness probe"""
+        return {
+            "ready": self.ready,
+            "warmup_ms": self.warmup_ms,
+            "background_warmup": (
+                "done" if self.background_warmup and self.background_warmup.done() else "pending"
+            ),
+            "errors": self.warmup_errors,
+            "pools": {
+                name: {
+                    "closed": client.is_closed,
+                    "max_connections": self.settings.http_max_connections,
+                    "max_keepalive": self.settings.http_max_keepalive,
+                }
+                for name, client in self.http_clients.items()
+            },
+            "jobs": self.job_queue.stats(),
+            "alerts": self.alert_scheduler.stats(),
+            "dashboard": self.dashboard_store.stats(),
+            "caches": {
+                "tokenizer": tokenizer_backend(),
+                "text_store": self.text_store.stats(),
+                "answers": self.rag_service.answer_cache.stats() if self.rag_service.answer_cache else None,
+                "near_duplicates": (
+                    self.rag_service.near_duplicates.stats() if self.rag_service.near_duplicates else None
+                ),
+            },
+        }
+
+
+def get_services(request: Request) -> ServiceContainer:
+    """FastAPI dependency: the application's service container"""
+    return request.app.state.services
+
+
+def get_job_queue(request: Request) -> JobQueue:
+    """FastAPI dependency: background job queue"""
+    return request.app.state.services.job_queue
+
+
+def get_document_storage(request: Request) -> DocumentStorage:
+    """FastAPI dependency: storage for uploaded files"""
+    return request.app.state.services.storage
+
+
+def get_alert_scheduler(request: Request) -> AlertScheduler:
+    """FastAPI dependency: renewal alert scheduler"""
+    return request.app.state.services.alert_scheduler
+
+
+def get_dashboard_store(request: Request) -> DashboardStore:
+    """FastAPI dependency: materialized dashboard aggregates"""
+    return request.app.state.services.dashboard_store
+
+
+def get_llm_service(request: Request) -> LLMService:
+    """FastAPI dependency: shared LLMService"""
+    return request.app.state.services.llm_service
+
+
+def get_vector_service(request: Request) -> VectorService:
+    """FastAPI dependency: shared VectorService"""
+    return request.app.state.services.vector_service
+
+
+def get_rag_service(request: Request) -> RAGService:
+    """FastAPI dependency: shared RAGService"""
+    return request.app.state.services.rag_service
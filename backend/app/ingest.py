@@ -0,0 +1,282 @@
+"""
+Bulk Corpus Ingestion - Onboard a customer's historical contracts
+Walks a directory of contract text files, chunks them in a process pool and
+feeds the async embed/upsert stages, checkpointing to a local manifest
+
+Usage:
+    python -m app.ingest /data/acme-contracts --organization acme --text-store data/text_store
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import sys
+import time
+import zlib
+
+from app.services.context_packer import count_tokens
+from app.services.llm_service import LLMService
+from app.services.rag_service import RAGService, chunk_text, prepare_document
+from app.services.text_store import DocumentTextStore
+from app.services.vector_service import VectorService
+
+logger = logging.getLogger(__name__)
+
+_SAFE_ID = re.compile(r"[^A-Za-z0-9_-]+")
+MANIFEST_NAME = ".ingest_manifest.jsonl"
+
+
+def contract_id_for(root: str, path: str) -> str:
+    """Stable contract id derived from the file's path under the corpus root"""
+    relative = os.path.splitext(os.path.relpath(path, root))[0].replace(os.sep, "/")
+    contract_id = _SAFE_ID.sub("-", relative).strip("-")
+    if contract_id != relative:
+        # Sanitizing can map distinct paths to one id (a/b.txt, a-b.txt): tell them apart by hash
+        contract_id = f"{contract_id}-{zlib.crc32(relative.encode('utf-8')):08x}"
+    return contract_id
+
+
+def _chunk_file(
+    path: str,
+    contract_id: str,
+    metadata: dict,
+    chunk_size: int,
+    chunk_overlap: int,
+    text_store_root: Optional[str]
+) -> list[dict]:
+    """
+    Process-pool worker: read, normalize, store and chunk one contract
+
+    Runs in a child process, so it only touches the filesystem (the text
+    store is file-per-contract) and returns plain picklable chunks.
+    """
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        text, metadata = prepare_document(handle.read(), metadata)
+    if text_store_root:
+        DocumentTextStore(text_store_root).put(contract_id, text)
+    return chunk_text(text, {**metadata, "contract_id": contract_id}, chunk_size, chunk_overlap)
+
+
+class Manifest:
+    """
+    Append-only JSONL checkpoint of completed files
+
+    A file counts as done only once all of its vectors are upserted; its
+    entry records size and mtime so edited files are ingested again.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.completed: dict[str, dict] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn final line from a crash
+                    self.completed[entry["path"]] = entry
+        self._handle = open(path, "a", encoding="utf-8")
+
+    def is_done(self, path: str, stat: os.stat_result) -> bool:
+        entry = self.completed.get(path)
+        return entry is not None and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime
+
+    def record(self, entry: dict) -> None:
+        self.completed[entry["path"]] = entry
+        self._handle.write(json.dumps(entry) + "\n")
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+class IngestStats:
+    """Running totals and throughput for the progress line"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.docs = 0
+        self.chunks = 0
+        self.embed_tokens = 0
+        self.skipped = 0
+        self.failed = 0
+
+    def line(self) -> str:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return (
+            f"docs {self.docs} ({self.docs / elapsed:.1f}/s)  "
+            f"chunks {self.chunks} ({self.chunks / elapsed:.1f}/s)  "
+            f"embed tokens {self.embed_tokens} ({self.embed_tokens / elapsed:.0f}/s)  "
+            f"skipped {self.skipped}  failed {self.failed}"
+        )
+
+
+class BulkIngestor:
+    """
+    Three-stage ingestion pipeline
+
+    1. Chunk: files are normalized, stored and chunked in a process pool
+       (CPU-bound, uses every core)
+    2. Embed/upsert: async workers pull chunked contracts from a bounded
+       queue and call RAGService.store_embeddings (I/O-bound)
+    3. Checkpoint: each finished contract is appended to the manifest, so
+       a rerun after a crash skips everything already upserted
+    """
+
+    def __init__(
+        self,
+        rag_service: RAGService,
+        root: str,
+        metadata: dict,
+        pattern: str = ".txt",
+        processes: Optional[int] = None,
+        embed_concurrency: int = 8,
+        text_store_root: Optional[str] = None,
+        manifest_path: Optional[str] = None,
+        progress_interval: float = 2.0
+    ):
+        self.rag = rag_service
+        self.root = root
+        self.metadata = metadata
+        self.pattern = pattern
+        self.processes = processes or os.cpu_count() or 1
+        self.embed_concurrency = embed_concurrency
+        self.text_store_root = text_store_root
+        self.manifest = Manifest(manifest_path or os.path.join(root, MANIFEST_NAME))
+        self.progress_interval = progress_interval
+        self.stats = IngestStats()
+
+    def discover(self) -> list[str]:
+        """Contract files under the root, in a stable order"""
+        found = []
+        for directory, _, files in os.walk(self.root):
+            found.extend(
+                os.path.join(directory, name)
+                for name in files
+                if name.endswith(self.pattern) and name != MANIFEST_NAME
+            )
+        return sorted(found)
+
+    async def run(self) -> IngestStats:
+        """Ingest every pending file and return the final stats"""
+        pending = []
+        for path in self.discover():
+            if self.manifest.is_done(path, os.stat(path)):
+                self.stats.skipped += 1
+            else:
+                pending.append(path)
+        logger.info(f"Ingesting {len(pending)} files ({self.stats.skipped} already done) from {self.root}")
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.embed_concurrency * 2)
+        loop = asyncio.get_running_loop()
+        progress = asyncio.create_task(self._report_progress())
+
+        with ProcessPoolExecutor(max_workers=self.processes) as pool:
+            embedders = [asyncio.create_task(self._embed_worker(queue)) for _ in range(self.embed_concurrency)]
+
+            async def chunk(path: str) -> None:
+                contract_id = contract_id_for(self.root, path)
+                try:
+                    chunks = await loop.run_in_executor(
+                        pool, _chunk_file, path, contract_id, self.metadata,
+                        self.rag.chunk_size, self.rag.chunk_overlap, self.text_store_root
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to chunk {path}: {str(e)}")
+                    self.stats.failed += 1
+                    return
+                await queue.put((path, contract_id, chunks))
+
+            # Bound in-flight chunk jobs so memory stays flat on huge corpora
+            in_flight = asyncio.Semaphore(self.processes * 2)
+
+            async def bounded(path: str) -> None:
+                async with in_flight:
+                    await chunk(path)
+
+            await asyncio.gather(*[bounded(path) for path in pending])
+            for _ in embedders:
+                await queue.put(None)
+            await asyncio.gather(*embedders)
+
+        progress.cancel()
+        self.manifest.close()
+        print(self.stats.line(), file=sys.stderr)
+        return self.stats
+
+    async def _embed_worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            path, contract_id, chunks = item
+            try:
+                vector_ids = await self.rag.store_embeddings(contract_id, chunks)
+            except Exception as e:
+                logger.error(f"Failed to embed {path}: {str(e)}")
+                self.stats.failed += 1
+                continue
+
+            stat = os.stat(path)
+            self.manifest.record({
+                "path": path,
+                "contract_id": contract_id,
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+                "chunks": len(chunks),
+                "vectors": len(vector_ids),
+            })
+            self.stats.docs += 1
+            self.stats.chunks += len(chunks)
+            self.stats.embed_tokens += sum(count_tokens(chunk["text"]) for chunk in chunks)
+
+    async def _report_progress(self) -> None:
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            print(self.stats.line(), file=sys.stderr)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk-ingest a directory of contract text files")
+    parser.add_argument("root", help="Directory of contract text files")
+    parser.add_argument("--organization", required=True, help="organization_id stamped on every contract")
+    parser.add_argument("--pattern", default=".txt", help="File suffix to ingest (default: .txt)")
+    parser.add_argument("--processes", type=int, default=None, help="Chunking processes (default: all cores)")
+    parser.add_argument("--embed-concurrency", type=int, default=8, help="Concurrent embed/upsert workers")
+    parser.add_argument("--text-store", default=None, help="DocumentTextStore directory")
+    parser.add_argument("--manifest", default=None, help=f"Checkpoint file (default: <root>/{MANIFEST_NAME})")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    text_store = DocumentTextStore(args.text_store) if args.text_store else None
+    rag = RAGService(
+        llm_service=LLMService(api_key=os.environ.get("OPENAI_API_KEY", "")),
+        vector_service=VectorService(
+            api_key=os.environ.get("PINECONE_API_KEY", ""),
+            environment=os.environ.get("PINECONE_ENVIRONMENT", "prod"),
+        ),
+        text_store=text_store,
+    )
+    ingestor = BulkIngestor(
+        rag,
+        root=args.root,
+        metadata={"organization_id": args.organization},
+        pattern=args.pattern,
+        processes=args.processes,
+        embed_concurrency=args.embed_concurrency,
+        text_store_root=args.text_store,
+        manifest_path=args.manifest,
+    )
+    stats = asyncio.run(ingestor.run())
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,15 +4,25 @@ Comprehensive AI-powered contract analysis platform
 """
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from typing import Callable, Optional
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 import logging
+import time
+
+from app.api.routes import alerts, analysis, contracts, dashboard, jobs
+from app.config import Settings, get_settings
+from app.deadlines import DeadlineExceeded, DeadlineMiddleware
+from app.dependencies import ServiceContainer
+from app.metrics import REGISTRY
+from app.tracing import TracingMiddleware
 
 logger = logging.getLogger(__name__)
 
-# Import routers (to be created)
-# from app.api.routes import auth, contracts, analysis, alerts, dashboard
+# Remaining routers (to be created)
+# from app.api.routes import auth
 
 
 @asynccontextmanager
@@ -23,16 +33,29 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     logger.info("ContractGuard Backend starting up...")
-    # Initialize connections, load models, etc.
+    started = time.perf_counter()
+    services = app.state.service_factory(get_settings())
+    app.state.services = services
+    app.state.trace_exporter = services.trace_exporter
+    built_ms = (time.perf_counter() - started) * 1000
+    await services.start()
+    logger.info(
+        f"Startup: services built in {built_ms:.1f}ms, ready after "
+        f"{(time.perf_counter() - started) * 1000:.1f}ms (heavy imports continue in background)"
+    )
     yield
     # Shutdown
     logger.info("ContractGuard Backend shutting down...")
-    # Cleanup
+    await services.close()
 
 
-def create_app() -> FastAPI:
+def create_app(service_factory: Optional[Callable[[Settings], ServiceContainer]] = None) -> FastAPI:
     """
     Application factory for ContractGuard backend
+
+    Args:
+        service_factory: Builds the service container at startup
+            (defaults to ServiceContainer.from_settings; load tests pass fakes)
     """
     app = FastAPI(
         title="ContractGuard API",
@@ -43,6 +66,7 @@ def create_app() -> FastAPI:
         openapi_url="/api/openapi.json",
         lifespan=lifespan,
     )
+    app.state.service_factory = service_factory or ServiceContainer.from_settings
 
     # CORS Configuration
     app.add_middleware(
@@ -72,22 +96,46 @@ def create_app() -> FastAPI:
         ],
     )
 
-    # Health Check Endpoint
+    # Per-request tracing (Server-Timing / X-Trace-Id headers)
+    app.add_middleware(TracingMiddleware)
+
+    # Per-request time budget (X-Request-Timeout may shorten it)
+    app.add_middleware(DeadlineMiddleware, default_seconds=get_settings().request_deadline)
+
+    @app.exception_handler(DeadlineExceeded)
+    async def deadline_exceeded(request: Request, exc: DeadlineExceeded):
+        """An upstream call ran out of request budget"""
+        logger.warning(f"{request.method} {request.url.path} exceeded its deadline: {exc}")
+        return JSONResponse(status_code=504, content={"detail": "Request deadline exceeded"})
+
+    # Health Check Endpoint (readiness probe)
     @app.get("/health")
-    async def health_check():
-        """AI-powered contract analysis API is healthy"""
+    async def health_check(request: Request, response: Response):
+        """Ready once services are warmed up; reports pool and cache state"""
+        services = getattr(request.app.state, "services", None)
+        readiness = services.readiness() if services else {"ready": False}
+        if not readiness["ready"]:
+            response.status_code = 503
         return {
-            "status": "healthy",
+            "status": "healthy" if readiness["ready"] else "starting",
             "version": "1.0.0",
             "service": "ContractGuard",
+            **readiness,
         }
 
+    # Prometheus scrape endpoint
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    async def metrics():
+        """Service latency histograms, error/token/cache/scan counters and SLO targets"""
+        return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
     # API v1 Routes (to be added)
     # app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
-    # app.include_router(contracts.router, prefix="/api/v1/contracts", tags=["Contracts"])
-    # app.include_router(analysis.router, prefix="/api/v1/analysis", tags=["Analysis"])
-    # app.include_router(alerts.router, prefix="/api/v1/alerts", tags=["Alerts"])
-    # app.include_router(dashboard.router, prefix="/api/v1/dashboard", tags=["Dashboard"])
+    app.include_router(contracts.router, prefix="/api/v1/contracts", tags=["Contracts"])
+    app.include_router(jobs.router, prefix="/api/v1/jobs", tags=["Jobs"])
+    app.include_router(analysis.router, prefix="/api/v1/analysis", tags=["Analysis"])
+    app.include_router(alerts.router, prefix="/api/v1/alerts", tags=["Alerts"])
+    app.include_router(dashboard.router, prefix="/api/v1/dashboard", tags=["Dashboard"])
 
     return app
 
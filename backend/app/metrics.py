@@ -0,0 +1,234 @@
+"""
+Metrics - Latency histograms and counters for service hot paths
+Exposed in Prometheus text format at /metrics
+"""
+
+from bisect import bisect_left
+from typing import Optional
+import functools
+import inspect
+import threading
+import time
+
+# Seconds; includes every SLO target below so breach ratios are exact
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 12.0, 15.0, 30.0, 60.0)
+
+# Performance targets from the service docstrings
+SLO_TARGETS = {
+    ("vector", "search"): 0.1,
+    ("vector", "hybrid_search"): 0.1,
+    ("llm", "summarize_contract"): 10.0,
+    ("llm", "analyze_risk"): 15.0,
+    ("llm", "extract_clauses"): 12.0,
+}
+
+
+class Counter:
+    """Monotonic counter"""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Gauge:
+    """Settable value"""
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Histogram:
+    """Fixed-bucket histogram (per-bucket counts, cumulated on render)"""
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Named metric families keyed by label values
+
+    Metrics are created on first use, so instrumented code only pays a
+    dict lookup and a bucket increment per observation.
+    """
+
+    def __init__(self):
+        self._families: dict[str, tuple[str, str, dict]] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str = "", **labels) -> Counter:
+        return self._get(name, "counter", help_text, Counter, labels)
+
+    def gauge(self, name: str, help_text: str = "", **labels) -> Gauge:
+        return self._get(name, "gauge", help_text, Gauge, labels)
+
+    def histogram(self, name: str, help_text: str = "", **labels) -> Histogram:
+        return self._get(name, "histogram", help_text, Histogram, labels)
+
+    def _get(self, name: str, kind: str, help_text: str, factory, labels: dict):
+        key = tuple(sorted(labels.items()))
+        family = self._families.get(name)
+        if family is None:
+            with self._lock:
+                family = self._families.setdefault(name, (kind, help_text, {}))
+        metric = family[2].get(key)
+        if metric is None:
+            with self._lock:
+                metric = family[2].setdefault(key, factory())
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for name, (kind, help_text, series) in sorted(self._families.items()):
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, metric in series.items():
+                if kind == "histogram":
+                    cumulative = 0
+                    for bound, count in zip(metric.buckets, metric.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels(key, le=_number(bound))} {cumulative}")
+                    lines.append(f"{name}_bucket{_labels(key, le='+Inf')} {metric.count}")
+                    lines.append(f"{name}_sum{_labels(key)} {_number(metric.sum)}")
+                    lines.append(f"{name}_count{_labels(key)} {metric.count}")
+                else:
+                    lines.append(f"{name}{_labels(key)} {_number(metric.value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(key: tuple, **extra) -> str:
+    pairs = list(key) + list(extra.items())
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{label}="{value}"' for (label, _), value in zip(pairs, escaped)) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+REGISTRY = MetricsRegistry()
+
+
+def is_callable_member(member) -> bool:
+    """Bound methods, plus functions already wrapped onto the instance (instrument/trace_service)"""
+    return inspect.ismethod(member) or inspect.isfunction(member)
+
+
+def instrument(service, name: str, registry: Optional[MetricsRegistry] = None):
+    """
+    Time every public async method of a service instance
+
+    Each call records contractguard_service_latency_seconds, a call count
+    and, on exception, an error count; calls slower than the method's SLO
+    target also increment contractguard_slo_breaches_total. Wrappers are
+    set on the instance, so internal self.method() calls are measured too.
+
+    Args:
+        service: Service instance (LLMService, VectorService, RAGService)
+        name: Label for the service ("llm", "vector", "rag")
+        registry: Registry to record into (defaults to REGISTRY)
+
+    Returns:
+        The same service instance
+    """
+    registry = registry or REGISTRY
+    for method_name, method in inspect.getmembers(service, predicate=is_callable_member):
+        if method_name.startswith("_"):
+            continue
+        if inspect.iscoroutinefunction(method):
+            wrapper = _time_coroutine(method, registry, name, method_name)
+        elif inspect.isasyncgenfunction(method):
+            wrapper = _time_async_generator(method, registry, name, method_name)
+        else:
+            continue
+        setattr(service, method_name, wrapper)
+
+    for (service_name, method_name), target in SLO_TARGETS.items():
+        if service_name == name:
+            registry.gauge(
+                "contractguard_slo_target_seconds", "Latency target per service method",
+                service=name, method=method_name
+            ).set(target)
+    return service
+
+
+def _recorders(registry: MetricsRegistry, service: str, method: str):
+    labels = {"service": service, "method": method}
+    latency = registry.histogram("contractguard_service_latency_seconds", "Service call latency", **labels)
+    calls = registry.counter("contractguard_service_calls_total", "Service calls", **labels)
+    errors = registry.counter("contractguard_service_errors_total", "Service calls that raised", **labels)
+    target = SLO_TARGETS.get((service, method))
+    breaches = registry.counter(
+        "contractguard_slo_breaches_total", "Calls slower than their SLO target", **labels
+    ) if target else None
+
+    def record(elapsed: float, failed: bool) -> None:
+        latency.observe(elapsed)
+        calls.inc()
+        if failed:
+            errors.inc()
+        if target and elapsed > target:
+            breaches.inc()
+
+    return record
+
+
+def _time_coroutine(method, registry: MetricsRegistry, service: str, method_name: str):
+    record = _recorders(registry, service, method_name)
+
+    @functools.wraps(method)
+    async def timed(*args, **kwargs):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = await method(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            record(time.perf_counter() - started, failed)
+
+    return timed
+
+
+def _time_async_generator(method, registry: MetricsRegistry, service: str, method_name: str):
+    record = _recorders(registry, service, method_name)
+
+    @functools.wraps(method)
+    async def timed(*args, **kwargs):
+        started = time.perf_counter()
+        failed = True
+        try:
+            async for item in method(*args, **kwargs):
+                yield item
+            failed = False
+        except GeneratorExit:
+            # Consumer stopped early (e.g. took the first few results)
+            failed = False
+            raise
+        finally:
+            record(time.perf_counter() - started, failed)
+
+    return timed
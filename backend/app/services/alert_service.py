@@ -0,0 +1,415 @@
+"""
+Alert Service - Renewal and notice-deadline alerts
+Alerts are indexed by due day per organization and by notification day in a
+min-heap, so "what is due in the next N days" and the dispatcher never scan
+the whole portfolio. Auto-renewing contracts roll on to their next renewal
+once a deadline passes, and the schedule is rebuilt from stored terms at startup
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable, Optional
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+from app.metrics import REGISTRY
+from app.services.term_extractor import ContractTerms, describe_period
+
+if TYPE_CHECKING:
+    from app.services.dashboard_store import ContractSummary
+
+logger = logging.getLogger(__name__)
+
+_ALERTS_SENT = REGISTRY.counter("contractguard_alerts_sent_total", "Alerts handed to the notifier")
+_ALERTS_SCHEDULED = REGISTRY.gauge("contractguard_alerts_scheduled", "Alerts currently scheduled")
+
+
+@dataclass
+class Alert:
+    """A contract deadline to notify about (mirrors the frontend's Alert)"""
+    id: str
+    contract_id: str
+    organization_id: str
+    type: str  # renewal, termination_window
+    severity: str  # Low, Medium, High
+    title: str
+    message: str
+    due_date: date
+    notify_on: date  # due_date minus the type's lead time
+    sent: bool = False
+    dismissed: bool = False
+    created_at: float = field(default_factory=time.time)
+
+    def to_dict(self, today: Optional[date] = None) -> dict:
+        return {
+            "id": self.id,
+            "contract_id": self.contract_id,
+            "organization_id": self.organization_id,
+            "type": self.type,
+            "severity": self.severity,
+            "title": self.title,
+            "message": self.message,
+            "due_date": self.due_date.isoformat(),
+            "notify_on": self.notify_on.isoformat(),
+            "days_until": (self.due_date - (today or date.today())).days,
+            "sent": self.sent,
+            "dismissed": self.dismissed,
+            "created_at": self.created_at,
+        }
+
+
+class AlertScheduler:
+    """
+    Indexed alert schedule
+
+    - _due[organization][day ordinal] -> {alert_id: alert}: due_within()
+      reads only the day buckets inside the window, O(days + results)
+    - _heap of (notify_on ordinal, seq, alert_id): pop_ready() pops the
+      alerts whose notification day has arrived, O(log n) each
+    - _by_contract: re-analysing a contract replaces its alerts; heap
+      entries of removed alerts are skipped when they surface
+    - _expiry of (due ordinal, seq, alert_id): once an alert's due day has
+      passed, its contract is rescheduled from its terms as of today, so
+      an auto-renewing contract gets the next renewal's alerts
+    """
+
+    def __init__(self, lead_days: Optional[dict[str, int]] = None):
+        """
+        Initialize scheduler
+
+        Args:
+            lead_days: Days before the due date to notify, per alert type
+        """
+        self.lead_days = {"renewal": 30, "termination_window": 30, **(lead_days or {})}
+        self._alerts: dict[str, Alert] = {}
+        self._due: dict[str, dict[int, dict[str, Alert]]] = {}
+        self._by_contract: dict[str, set[str]] = {}
+        self._heap: list[tuple[int, int, str]] = []
+        self._expiry: list[tuple[int, int, str]] = []
+        self._terms: dict[str, tuple[str, ContractTerms, Optional[str]]] = {}  # contract_id -> (org, terms, vendor)
+        self._seq = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+
+    def schedule_contract(
+        self,
+        contract_id: str,
+        organization_id: str,
+        terms: ContractTerms,
+        vendor: Optional[str] = None,
+        today: Optional[date] = None
+    ) -> list[Alert]:
+        """
+        (Re)build a contract's alerts from its extracted terms
+
+        - Notice deadline of an auto-renewing contract: termination_window, High
+        - Renewal date: renewal (auto-renews) or expiry, Medium
+        Deadlines already past are not scheduled. An alert the contract
+        already had (same type and due date) keeps its sent and dismissed flags.
+
+        Args:
+            contract_id: Contract the terms belong to
+            organization_id: Owning organization
+            terms: Output of extract_terms()
+            vendor: Counterparty name for alert text
+            today: Reference date (defaults to today)
+
+        Returns:
+            The contract's scheduled alerts
+        """
+        today = today or date.today()
+        label = vendor or f"Contract {contract_id}"
+        alerts = []
+
+        if terms.notice_deadline and terms.notice_for:
+            action = "renews automatically" if terms.auto_renews else "expires"
+            alerts.append(self._build(
+                contract_id, organization_id, "termination_window", "High",
+                "Non-renewal notice due" if terms.auto_renews else "Expiry notice due",
+                f"{label} {action} on {terms.notice_for.isoformat()}; notice is due by "
+                f"{terms.notice_deadline.isoformat()}",
+                terms.notice_deadline,
+            ))
+        if terms.renewal_date:
+            if terms.auto_renews:
+                title, message = "Contract renewal upcoming", (
+                    f"{label} renews automatically on {terms.renewal_date.isoformat()}"
+                    + (f" for {describe_period(terms.renewal_term)}" if terms.renewal_term else "")
+                )
+            else:
+                title, message = "Contract expiring", f"{label} expires on {terms.renewal_date.isoformat()}"
+            alerts.append(self._build(
+                contract_id, organization_id, "renewal", "Medium", title, message, terms.renewal_date
+            ))
+
+        # Same contract, type and due date: already sent or dismissed stays so
+        previous = {alert.id: alert for alert in self.for_contract(contract_id)}
+        self.cancel_contract(contract_id)
+        for alert in alerts:
+            if alert.due_date >= today:
+                if alert.id in previous:
+                    alert.sent = previous[alert.id].sent
+                    alert.dismissed = previous[alert.id].dismissed
+                    alert.created_at = previous[alert.id].created_at
+                self.add(alert)
+        if contract_id in self._by_contract:
+            self._terms[contract_id] = (organization_id, terms, vendor)
+        return self.for_contract(contract_id)
+
+    def restore(self, summaries: Iterable["ContractSummary"], today: Optional[date] = None) -> int:
+        """
+        Rebuild the schedule from stored contract summaries (startup)
+
+        Alerts whose notification day is already behind us are marked sent:
+        the previous process delivered them. Its dismissals are not kept.
+
+        Args:
+            summaries: Summaries holding each contract's extracted terms
+            today: Reference date (defaults to today)
+
+        Returns:
+            Number of alerts scheduled
+        """
+        today = today or date.today()
+        scheduled = 0
+        for summary in summaries:
+            if not summary.terms:
+                continue
+            try:
+                terms = ContractTerms.from_dict(summary.terms).as_of(today)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Skipping unreadable terms of contract {summary.contract_id}: {str(e)}")
+                continue
+            for alert in self.schedule_contract(
+                summary.contract_id, summary.organization_id, terms, vendor=summary.vendor, today=today
+            ):
+                alert.sent = alert.sent or alert.notify_on < today
+                scheduled += 1
+        logger.info(f"Restored {scheduled} alerts for {len(self._by_contract)} contracts")
+        return scheduled
+
+    def roll_forward(self, today: Optional[date] = None) -> int:
+        """
+        Reschedule contracts with an alert whose due day has passed
+
+        An auto-renewing contract moves on to its next renewal and notice
+        deadline; other contracts just drop the expired alert.
+
+        Returns:
+            Number of contracts rescheduled
+        """
+        today = today or date.today()
+        now = today.toordinal()
+        expired: set[str] = set()
+        while self._expiry and self._expiry[0][0] < now:
+            due, _, alert_id = heapq.heappop(self._expiry)
+            alert = self._alerts.get(alert_id)
+            if alert is not None and alert.due_date.toordinal() == due:
+                expired.add(alert.contract_id)
+        for contract_id in expired:
+            organization_id, terms, vendor = self._terms.get(contract_id, (None, None, None))
+            if terms is None:
+                self.cancel_contract(contract_id)
+                continue
+            self.schedule_contract(contract_id, organization_id, terms.as_of(today), vendor, today)
+        return len(expired)
+
+    def add(self, alert: Alert) -> None:
+        """Index an alert (replacing one with the same id)"""
+        self._remove(alert.id)
+        self._alerts[alert.id] = alert
+        self._due.setdefault(alert.organization_id, {}).setdefault(
+            alert.due_date.toordinal(), {}
+        )[alert.id] = alert
+        self._by_contract.setdefault(alert.contract_id, set()).add(alert.id)
+        heapq.heappush(self._expiry, (alert.due_date.toordinal(), next(self._seq), alert.id))
+        if not alert.sent:
+            heapq.heappush(self._heap, (alert.notify_on.toordinal(), next(self._seq), alert.id))
+        _ALERTS_SCHEDULED.set(len(self._alerts))
+
+    def cancel_contract(self, contract_id: str) -> int:
+        """
+        Remove a contract's alerts (contract deleted or re-analysed)
+
+        Returns:
+            Number of alerts removed
+        """
+        alert_ids = self._by_contract.pop(contract_id, set())
+        self._terms.pop(contract_id, None)
+        for alert_id in alert_ids:
+            self._remove(alert_id)
+        if len(self._heap) + len(self._expiry) > 4 * len(self._alerts) + 2048:
+            # Mostly stale entries: rebuild from the live alerts
+            self._heap = [
+                (alert.notify_on.toordinal(), next(self._seq), alert.id)
+                for alert in self._alerts.values() if not alert.sent
+            ]
+            self._expiry = [(alert.due_date.toordinal(), next(self._seq), alert.id) for alert in self._alerts.values()]
+            heapq.heapify(self._heap)
+            heapq.heapify(self._expiry)
+        _ALERTS_SCHEDULED.set(len(self._alerts))
+        return len(alert_ids)
+
+    def due_within(
+        self,
+        organization_id: str,
+        days: int,
+        today: Optional[date] = None,
+        include_dismissed: bool = False
+    ) -> list[Alert]:
+        """
+        Alerts of an organization due between today and today + days
+
+        Args:
+            organization_id: Organization to query
+            days: Window length in days
+            today: Reference date (defaults to today)
+            include_dismissed: Also return dismissed alerts
+
+        Returns:
+            Alerts ordered by due date
+        """
+        buckets = self._due.get(organization_id)
+        if not buckets:
+            return []
+        start = (today or date.today()).toordinal()
+        if days + 1 <= len(buckets):
+            days_in_window: Iterable[int] = range(start, start + days + 1)
+        else:
+            # Fewer occupied days than the window is long
+            days_in_window = sorted(day for day in buckets if start <= day <= start + days)
+        return [
+            alert
+            for day in days_in_window
+            for alert in buckets.get(day, {}).values()
+            if include_dismissed or not alert.dismissed
+        ]
+
+    def for_contract(self, contract_id: str) -> list[Alert]:
+        """A contract's scheduled alerts, ordered by due date"""
+        alerts = (self._alerts[alert_id] for alert_id in self._by_contract.get(contract_id, ()))
+        return sorted(alerts, key=lambda alert: alert.due_date)
+
+    def dismiss(self, alert_id: str) -> Optional[Alert]:
+        """Mark an alert dismissed (it is no longer listed or sent)"""
+        alert = self._alerts.get(alert_id)
+        if alert:
+            alert.dismissed = True
+        return alert
+
+    def pop_ready(self, today: Optional[date] = None) -> list[Alert]:
+        """
+        Take the alerts whose notification day has arrived
+
+        Contracts with a deadline behind them are rolled forward first, so
+        the next renewal's alerts can be sent in the same pass.
+
+        Returns:
+            Unsent, undismissed alerts with notify_on <= today (marked sent)
+        """
+        today = today or date.today()
+        self.roll_forward(today)
+        now = today.toordinal()
+        ready = []
+        while self._heap and self._heap[0][0] <= now:
+            notify_on, _, alert_id = heapq.heappop(self._heap)
+            alert = self._alerts.get(alert_id)
+            # Skip entries of removed or rescheduled alerts
+            if alert is None or alert.sent or alert.notify_on.toordinal() != notify_on:
+                continue
+            alert.sent = True
+            if not alert.dismissed:
+                ready.append(alert)
+        return ready
+
+    async def dispatch(self, notify: Optional[Callable[[Alert], Awaitable[None]]] = None) -> int:
+        """
+        Send every alert that is ready
+
+        Args:
+            notify: Delivery function (defaults to logging)
+
+        Returns:
+            Number of alerts sent
+        """
+        ready = self.pop_ready()
+        for alert in ready:
+            try:
+                await (notify or _log_alert)(alert)
+            except Exception as e:
+                alert.sent = False
+                heapq.heappush(self._heap, (alert.notify_on.toordinal(), next(self._seq), alert.id))
+                logger.error(f"Failed to send alert {alert.id}: {str(e)}")
+                continue
+            self.sent += 1
+            _ALERTS_SENT.inc()
+        return len(ready)
+
+    def start(self, interval: float = 3600.0) -> None:
+        """Dispatch ready alerts every interval seconds"""
+        self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def stats(self) -> dict:
+        """Scheduled alerts, heap size (including stale entries) and sends"""
+        return {
+            "scheduled": len(self._alerts),
+            "contracts": len(self._by_contract),
+            "organizations": len(self._due),
+            "heap_entries": len(self._heap) + len(self._expiry),
+            "sent": self.sent,
+        }
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            await self.dispatch()
+            await asyncio.sleep(interval)
+
+    def _build(
+        self,
+        contract_id: str,
+        organization_id: str,
+        alert_type: str,
+        severity: str,
+        title: str,
+        message: str,
+        due_date: date
+    ) -> Alert:
+        return Alert(
+            id=f"{contract_id}:{alert_type}:{due_date.isoformat()}",
+            contract_id=contract_id,
+            organization_id=organization_id,
+            type=alert_type,
+            severity=severity,
+            title=title,
+            message=message,
+            due_date=due_date,
+            notify_on=due_date - timedelta(days=self.lead_days.get(alert_type, 0)),
+        )
+
+    def _remove(self, alert_id: str) -> None:
+        alert = self._alerts.pop(alert_id, None)
+        if alert is None:
+            return
+        buckets = self._due.get(alert.organization_id, {})
+        day = alert.due_date.toordinal()
+        bucket = buckets.get(day)
+        if bucket is not None:
+            bucket.pop(alert_id, None)
+            if not bucket:
+                del buckets[day]
+        if not buckets:
+            self._due.pop(alert.organization_id, None)
+
+
+async def _log_alert(alert: Alert) -> None:
+    logger.info(f"[{alert.severity}] {alert.organization_id}: {alert.title} - {alert.message}")
+    # In production: email / in-app notification
+    # await notifier.send(alert.organization_id, alert.title, alert.message)
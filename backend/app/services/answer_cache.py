@@ -0,0 +1,240 @@
+"""
+Answer Cache - Semantic cache of chat answers per contract
+Questions are matched by embedding similarity, so "when does this renew?" and
+"what's the renewal date?" share one GPT answer until the contract is re-indexed
+"""
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Optional
+import logging
+import random
+import time
+
+from app.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+_CACHE_HITS = REGISTRY.counter("contractguard_cache_requests_total", "Cache lookups", cache="answers", result="hit")
+_CACHE_MISSES = REGISTRY.counter("contractguard_cache_requests_total", "Cache lookups", cache="answers", result="miss")
+_SAMPLED_MATCH = REGISTRY.counter(
+    "contractguard_answer_cache_samples_total", "Cache hits re-checked against fresh retrieval", result="match"
+)
+_SAMPLED_FALSE_HIT = REGISTRY.counter(
+    "contractguard_answer_cache_samples_total", "Cache hits re-checked against fresh retrieval", result="false_hit"
+)
+
+
+@dataclass
+class CachedAnswer:
+    """A stored answer and the question it was generated for"""
+    question: str
+    answer: dict
+    similarity: float = 1.0  # Of the question that matched it (set on lookup)
+    created_at: float = field(default_factory=time.time)
+
+
+class _ContractEntries:
+    """One contract's cached questions: unit embeddings as a matrix plus answers"""
+
+    def __init__(self):
+        self.matrix = None
+        self.answers: list[CachedAnswer] = []
+
+
+class SemanticAnswerCache:
+    """
+    Per-contract cache of answers keyed by question embedding
+
+    - A lookup scores the question against every cached question of the
+      contract (one matrix-vector product) and hits at >= threshold
+    - Each contract has a generation; invalidate() bumps it, and answers
+      computed against an older generation are not stored
+    - Generations come from one counter and only the last max_contracts
+      invalidated contracts keep their own; the rest read the highest one
+      forgotten, which is still newer than anything handed out before it
+    - A sample of hits is retrieved again in the background and compared
+      by cited sections to estimate the false-hit rate
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        max_entries: int = 64,
+        max_contracts: int = 10000,
+        sample_rate: float = 0.02,
+        max_samples: int = 100
+    ):
+        """
+        Initialize answer cache
+
+        Args:
+            threshold: Minimum cosine similarity between questions for a hit
+            max_entries: Answers kept per contract (oldest dropped first)
+            max_contracts: Contracts kept (least recently used dropped first)
+            sample_rate: Fraction of hits re-checked for false hits
+            max_samples: Recent false hits kept for review
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_contracts = max_contracts
+        self.sample_rate = sample_rate
+        self._contracts: OrderedDict[str, _ContractEntries] = OrderedDict()
+        self._generations: OrderedDict[str, int] = OrderedDict()
+        self._last_generation = 0
+        self._forgotten_generation = 0
+        self._false_hits: deque[dict] = deque(maxlen=max_samples)
+        self.hits = 0
+        self.misses = 0
+        self.sampled = 0
+        self.false_hit_count = 0
+
+    def generation(self, contract_id: str) -> int:
+        """Current generation of a contract (pass it back to store())"""
+        return self._generations.get(contract_id, self._forgotten_generation)
+
+    def lookup(self, contract_id: str, embedding) -> Optional[CachedAnswer]:
+        """
+        Find a cached answer to a similar question
+
+        Args:
+            contract_id: Contract the question is about
+            embedding: Question embedding
+
+        Returns:
+            Best-matching answer at or above the threshold, or None
+        """
+        import numpy as np
+
+        entries = self._contracts.get(contract_id)
+        if entries is None or entries.matrix is None:
+            return self._miss()
+
+        query = _unit(np.asarray(embedding, dtype=np.float32))
+        scores = entries.matrix @ query
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return self._miss()
+
+        self._contracts.move_to_end(contract_id)
+        self.hits += 1
+        _CACHE_HITS.inc()
+        cached = entries.answers[best]
+        return CachedAnswer(
+            question=cached.question, answer=cached.answer,
+            similarity=float(scores[best]), created_at=cached.created_at,
+        )
+
+    def store(self, contract_id: str, question: str, embedding, answer: dict, generation: int) -> bool:
+        """
+        Cache an answer
+
+        Args:
+            contract_id: Contract the question is about
+            question: Question text
+            embedding: Question embedding
+            answer: Answer payload to serve on later hits
+            generation: generation(contract_id) from before the answer was computed
+
+        Returns:
+            False if the contract was re-indexed meanwhile (answer not stored)
+        """
+        import numpy as np
+
+        if generation != self.generation(contract_id):
+            return False
+
+        entries = self._contracts.get(contract_id)
+        if entries is None:
+            entries = self._contracts[contract_id] = _ContractEntries()
+            while len(self._contracts) > self.max_contracts:
+                self._contracts.popitem(last=False)
+        self._contracts.move_to_end(contract_id)
+
+        row = _unit(np.asarray(embedding, dtype=np.float32))[None, :]
+        entries.matrix = row if entries.matrix is None else np.vstack([entries.matrix, row])[-self.max_entries:]
+        entries.answers = (entries.answers + [CachedAnswer(question=question, answer=answer)])[-self.max_entries:]
+        return True
+
+    def invalidate(self, contract_id: str) -> None:
+        """Drop a contract's answers (its index changed)"""
+        self._last_generation += 1
+        self._generations[contract_id] = self._last_generation
+        self._generations.move_to_end(contract_id)
+        while len(self._generations) > self.max_contracts:
+            _, forgotten = self._generations.popitem(last=False)
+            self._forgotten_generation = max(self._forgotten_generation, forgotten)
+        if self._contracts.pop(contract_id, None) is not None:
+            logger.debug(f"Invalidated cached answers for contract {contract_id}")
+
+    def should_sample(self) -> bool:
+        """Whether to re-check this hit"""
+        return random.random() < self.sample_rate
+
+    def record_sample(self, contract_id: str, question: str, cached: CachedAnswer, fresh: dict) -> bool:
+        """
+        Compare a cached answer with fresh retrieval for the new question
+
+        A hit counts as false when the fresh context cites none of the
+        sections the cached answer did, i.e. the matched question was really
+        about another part of the contract.
+
+        Args:
+            contract_id: Contract the question is about
+            question: The question that hit
+            cached: The answer it was served
+            fresh: Dict with the citations retrieval now returns
+
+        Returns:
+            True if it was a false hit
+        """
+        cached_citations = set(cached.answer.get("citations") or [])
+        fresh_citations = set(fresh.get("citations") or [])
+        false_hit = bool(cached_citations or fresh_citations) and not (cached_citations & fresh_citations)
+
+        self.sampled += 1
+        if false_hit:
+            self.false_hit_count += 1
+            _SAMPLED_FALSE_HIT.inc()
+            self._false_hits.append({
+                "contract_id": contract_id,
+                "question": question,
+                "matched_question": cached.question,
+                "similarity": round(cached.similarity, 4),
+                "cached_citations": sorted(cached_citations),
+                "fresh_citations": sorted(fresh_citations),
+            })
+            logger.info(
+                f"Answer cache false hit on {contract_id}: {question!r} matched {cached.question!r} "
+                f"({cached.similarity:.3f})"
+            )
+        else:
+            _SAMPLED_MATCH.inc()
+        return false_hit
+
+    def stats(self, include_samples: bool = False) -> dict:
+        """Hit rate, sampled false-hit rate and occupancy (and recent false hits)"""
+        lookups = self.hits + self.misses
+        stats = {
+            "threshold": self.threshold,
+            "contracts": len(self._contracts),
+            "entries": sum(len(entries.answers) for entries in self._contracts.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "sampled": self.sampled,
+            "false_hit_rate": round(self.false_hit_count / self.sampled, 4) if self.sampled else None,
+        }
+        if include_samples:
+            stats["recent_false_hits"] = list(self._false_hits)
+        return stats
+
+    def _miss(self) -> None:
+        self.misses += 1
+        _CACHE_MISSES.inc()
+        return None
+
+
+def _unit(vector):
+    import numpy as np
+    return vector / max(float(np.linalg.norm(vector)), 1e-12)
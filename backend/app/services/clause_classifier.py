@@ -0,0 +1,306 @@
+"""
+Clause Classifier - Local ClauseCategory labels for contract chunks
+Nearest-centroid matching on chunk embeddings plus a compiled keyword layer,
+so most chunks are labelled at ingest without an LLM round trip
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+import asyncio
+import logging
+import re
+
+from app.services.rag_service import ClauseCategory
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = list(ClauseCategory)
+
+# One alternation per category; all are compiled into a single pattern with
+# named groups so a chunk is scanned once
+KEYWORDS = {
+    ClauseCategory.LIABILITY: (
+        r"limitation of liability|aggregate liability|liab(?:le|ility)|consequential damages|"
+        r"in no event|damages cap"
+    ),
+    ClauseCategory.TERMINATION: (
+        r"terminat(?:e|es|ed|ing|ion)|for convenience|material breach|cure period|wind[- ]down"
+    ),
+    ClauseCategory.RENEWAL: (
+        r"renew(?:al|als|s|ed)?|non-renewal|auto(?:matic(?:ally)?)?[- ]renew|initial term|"
+        r"successive (?:\w+[- ])?(?:periods?|terms?)|then-current term"
+    ),
+    ClauseCategory.PAYMENT: (
+        r"invoices?|fees?|payments?|payable|late (?:fees?|charges?)|interest|net \d+|pric(?:e|es|ing)"
+    ),
+    ClauseCategory.CONFIDENTIALITY: (
+        r"confidential(?:ity)?|non-disclosure|proprietary information|trade secrets?"
+    ),
+    ClauseCategory.IP: (
+        r"intellectual property|copyrights?|patents?|trademarks?|licen[cs](?:e|es|ed|or|ee)|"
+        r"work product|derivative works?"
+    ),
+    ClauseCategory.WARRANTY: (
+        r"warrant(?:y|ies|s)|as is|merchantability|fitness for a particular purpose|disclaim(?:s|ed|er)?|"
+        r"workmanlike"
+    ),
+    ClauseCategory.INDEMNIFICATION: (
+        r"indemnif(?:y|ies|ied|ication)|indemnified party|hold harmless|defend"
+    ),
+    ClauseCategory.COMPLIANCE: (
+        r"compl(?:y|iance)|applicable laws?|regulat(?:ion|ions|ory)|gdpr|hipaa|audit|"
+        r"data protection|personal data|anti-bribery|export control"
+    ),
+    ClauseCategory.OTHER: (
+        r"counterparts|entire agreement|governing law|severab(?:le|ility)|assign(?:ment)?|"
+        r"force majeure|headings|waiver|notices? shall be"
+    ),
+}
+
+_KEYWORD_PATTERN = re.compile(
+    "|".join(rf"\b(?P<{category.name}>{pattern})\b" for category, pattern in KEYWORDS.items()),
+    re.IGNORECASE,
+)
+_CATEGORY_INDEX = {category.name: i for i, category in enumerate(CATEGORIES)}
+
+# Seed examples per category; their embeddings start each centroid and
+# confidently labelled chunks are added as contracts are ingested
+PROTOTYPES = {
+    ClauseCategory.LIABILITY: [
+        "Limitation of liability. Neither party's total liability shall exceed the amounts paid.",
+        "In no event will either party be liable for lost profits or consequential damages.",
+    ],
+    ClauseCategory.TERMINATION: [
+        "Termination. Either party may terminate this agreement upon material breach not cured.",
+        "Customer may terminate for convenience upon thirty days prior written notice.",
+    ],
+    ClauseCategory.RENEWAL: [
+        "Term and renewal. The agreement automatically renews for successive one-year terms.",
+        "Either party may give notice of non-renewal before the end of the initial term.",
+    ],
+    ClauseCategory.PAYMENT: [
+        "Payment terms. Customer shall pay each invoice within thirty days of receipt.",
+        "Fees are payable in advance; late payments accrue interest.",
+    ],
+    ClauseCategory.CONFIDENTIALITY: [
+        "Confidentiality. Each party shall protect the other party's confidential information.",
+        "The recipient shall not disclose proprietary information to any third party.",
+    ],
+    ClauseCategory.IP: [
+        "Intellectual property. All patents, copyrights and trademarks remain with the licensor.",
+        "Customer receives a non-exclusive license; work product and derivative works are owned by provider.",
+    ],
+    ClauseCategory.WARRANTY: [
+        "Warranties. Provider warrants the services will be performed in a workmanlike manner.",
+        "All other warranties, including merchantability and fitness for a particular purpose, are disclaimed.",
+    ],
+    ClauseCategory.INDEMNIFICATION: [
+        "Indemnification. Provider shall indemnify, defend and hold harmless customer against third-party claims.",
+        "The indemnified party shall give prompt notice of any claim.",
+    ],
+    ClauseCategory.COMPLIANCE: [
+        "Compliance. Each party shall comply with applicable laws and data protection regulations such as GDPR.",
+        "Customer may audit compliance; provider shall report any personal data breach.",
+    ],
+    ClauseCategory.OTHER: [
+        "This agreement may be executed in counterparts and constitutes the entire agreement of the parties.",
+        "Governing law, severability, waiver, assignment and notices provisions; headings are for convenience.",
+    ],
+}
+
+
+@dataclass
+class ClauseLabel:
+    """Category assigned to one chunk"""
+    category: ClauseCategory
+    confidence: float  # 0-1; below the classifier's min_confidence the LLM decides
+
+
+class ClauseClassifier:
+    """
+    Nearest-centroid + keyword clause classifier
+
+    For a batch of chunks:
+    - Centroid layer: cosine similarity of every chunk embedding to every
+      category centroid in one matrix product, softmaxed over categories
+    - Keyword layer: per-category keyword hits from one regex scan per
+      chunk (hits in the section heading count heading_weight times)
+    - The two distributions are blended; the top category and its
+      probability become the label and confidence
+
+    Centroids start from embedded PROTOTYPES and absorb chunks the keyword
+    layer labels decisively, so they adapt to real contract language. What
+    is learned stays with the organization whose chunks taught it: each
+    organization gets its own centroids (one small matrix) on first use, so
+    one tenant's contracts never move another tenant's labels.
+
+    Without embeddings, confidence is the keyword share scaled by the hits
+    found, reaching the full share at learn_min_hits hits: one incidental
+    keyword is not enough to skip the LLM.
+    """
+
+    def __init__(
+        self,
+        min_confidence: float = 0.6,
+        temperature: float = 0.02,
+        keyword_weight: float = 0.5,
+        heading_weight: float = 3.0,
+        learn_min_hits: int = 3
+    ):
+        """
+        Initialize classifier
+
+        Args:
+            min_confidence: Labels below this are sent to the LLM
+            temperature: Softmax temperature over centroid similarities
+            keyword_weight: Share of the keyword layer in the blend (when it has hits)
+            heading_weight: Weight of a keyword hit in the chunk's section heading
+            learn_min_hits: Keyword hits (all for one category) needed to add a
+                chunk's embedding to that category's centroid, and for full
+                keyword-only confidence
+        """
+        self.min_confidence = min_confidence
+        self.temperature = temperature
+        self.keyword_weight = keyword_weight
+        self.heading_weight = heading_weight
+        self.learn_min_hits = learn_min_hits
+        self._sums: Optional["np.ndarray"] = None
+        self._centroids: Optional["np.ndarray"] = None  # Prototypes only
+        self._tenant_sums: dict[str, "np.ndarray"] = {}
+        self._tenant_centroids: dict[str, "np.ndarray"] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """Whether centroids exist (otherwise only keywords are used)"""
+        return self._centroids is not None
+
+    async def prepare(self, embed_texts: Callable[[list[str]], Awaitable[list]]) -> None:
+        """
+        Build the initial centroids from PROTOTYPES (once, one embeddings request)
+
+        Args:
+            embed_texts: Batch embedding function (LLMService.embed_texts)
+        """
+        if self._centroids is not None:
+            return
+        async with self._lock:
+            if self._centroids is not None:
+                return
+            import numpy as np
+
+            texts = [text for category in CATEGORIES for text in PROTOTYPES[category]]
+            owners = [i for i, category in enumerate(CATEGORIES) for _ in PROTOTYPES[category]]
+            try:
+                vectors = _unit_rows(np.asarray(await embed_texts(texts), dtype=np.float32))
+            except Exception as e:
+                logger.error(f"Failed to embed clause prototypes; using keywords only: {str(e)}")
+                return
+            sums = np.zeros((len(CATEGORIES), vectors.shape[1]), dtype=np.float32)
+            np.add.at(sums, owners, vectors)
+            self._sums = sums
+            self._centroids = _unit_rows(sums)
+            logger.info(f"Clause classifier ready ({len(texts)} prototypes, {len(CATEGORIES)} categories)")
+
+    def keyword_scores(self, texts: list[str], headings: Optional[list[Optional[str]]] = None) -> "np.ndarray":
+        """
+        Weighted keyword hits per chunk and category
+
+        Returns:
+            (len(texts), len(CATEGORIES)) array
+        """
+        import numpy as np
+
+        scores = np.zeros((len(texts), len(CATEGORIES)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for match in _KEYWORD_PATTERN.finditer(text):
+                scores[row, _CATEGORY_INDEX[match.lastgroup]] += 1.0
+            heading = headings[row] if headings else None
+            if heading:
+                for match in _KEYWORD_PATTERN.finditer(heading):
+                    scores[row, _CATEGORY_INDEX[match.lastgroup]] += self.heading_weight
+        return scores
+
+    def classify(
+        self,
+        texts: list[str],
+        embeddings: Optional[list] = None,
+        headings: Optional[list[Optional[str]]] = None,
+        learn: bool = True,
+        organization_id: Optional[str] = None
+    ) -> list[ClauseLabel]:
+        """
+        Label a batch of chunks
+
+        Args:
+            texts: Chunk texts
+            embeddings: Chunk embeddings (rows aligned with texts); without
+                them, or before prepare(), only keywords are used
+            headings: Section heading of each chunk, if known
+            learn: Fold decisively keyword-labelled chunks into the centroids
+            organization_id: Organization whose centroids are used and
+                taught; without one, the prototype centroids are used and
+                nothing is learned
+
+        Returns:
+            One ClauseLabel per chunk
+        """
+        import numpy as np
+
+        if not texts:
+            return []
+
+        keywords = self.keyword_scores(texts, headings)
+        hits = keywords.sum(axis=1, keepdims=True)
+        keyword_probs = np.divide(keywords, hits, out=np.zeros_like(keywords), where=hits > 0)
+
+        if self._centroids is not None and embeddings is not None:
+            vectors = _unit_rows(np.asarray(embeddings, dtype=np.float32))
+            centroids = self._tenant_centroids.get(organization_id, self._centroids)
+            similarity = vectors @ centroids.T
+            logits = (similarity - similarity.max(axis=1, keepdims=True)) / self.temperature
+            centroid_probs = np.exp(logits)
+            centroid_probs /= centroid_probs.sum(axis=1, keepdims=True)
+            probs = np.where(
+                hits > 0,
+                (1.0 - self.keyword_weight) * centroid_probs + self.keyword_weight * keyword_probs,
+                centroid_probs,
+            )
+            if learn and organization_id:
+                self._learn(organization_id, vectors, keywords, np.argmax(probs, axis=1))
+        else:
+            probs = keyword_probs * np.minimum(hits / self.learn_min_hits, 1.0)
+
+        best = np.argmax(probs, axis=1)
+        # Nothing to go on (no keyword hits, no centroids): OTHER with zero confidence, left to the LLM
+        best = np.where(probs.max(axis=1) > 0, best, _CATEGORY_INDEX[ClauseCategory.OTHER.name])
+        confidence = probs[np.arange(len(texts)), best]
+        return [
+            ClauseLabel(category=CATEGORIES[index], confidence=float(score))
+            for index, score in zip(best, confidence)
+        ]
+
+    def _learn(self, organization_id: str, vectors: "np.ndarray", keywords: "np.ndarray", labels: "np.ndarray") -> None:
+        """Add chunks whose keyword hits all point to their final label to the organization's centroid"""
+        import numpy as np
+
+        top = np.argmax(keywords, axis=1)
+        decisive = (
+            (keywords.max(axis=1) >= self.learn_min_hits)
+            & (keywords.max(axis=1) == keywords.sum(axis=1))
+            & (top == labels)
+        )
+        if decisive.any():
+            sums = self._tenant_sums.get(organization_id)
+            if sums is None:
+                sums = self._tenant_sums[organization_id] = self._sums.copy()
+            np.add.at(sums, top[decisive], vectors[decisive])
+            self._tenant_centroids[organization_id] = _unit_rows(sums)
+
+
+def _unit_rows(matrix: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+    return matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
@@ -0,0 +1,195 @@
+"""
+Context Packer - Token-budgeted prompt context for RAG
+Merges overlapping retrieved chunks by offset and fills a token budget by relevance
+"""
+
+from typing import Callable, Optional
+from dataclasses import dataclass, field
+import logging
+
+logger = logging.getLogger(__name__)
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count prompt tokens for text
+
+    Uses tiktoken's cl100k_base encoding when it is installed and falls
+    back to the ~4 characters per token rule of thumb otherwise.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Token count
+    """
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text))
+    return (len(text) + 3) // 4
+
+
+def tokenizer_backend() -> str:
+    """Which counter count_tokens uses ("unprimed" until its first call)"""
+    if _encoding is None:
+        return "unprimed"
+    return "tiktoken" if _encoding else "heuristic"
+
+
+@dataclass
+class PackedSpan:
+    """A contiguous span of contract text selected for the prompt"""
+    contract_id: Optional[str]
+    start: Optional[int]
+    end: Optional[int]
+    text: str
+    relevance_score: float
+    section: Optional[str] = None
+    page_number: Optional[int] = None
+    source_chunks: list[str] = field(default_factory=list)
+    tokens: int = 0
+
+    @property
+    def citation(self) -> str:
+        """Human-readable source reference, e.g. "Section 4 Termination, p. 3" """
+        parts = [part for part in (self.section, f"p. {self.page_number}" if self.page_number else None) if part]
+        return ", ".join(parts) if parts else "Unlabelled section"
+
+
+class ContextPacker:
+    """
+    Packs retrieved chunks into a token budget
+
+    Strategy:
+    1. Group chunks by contract and merge spans that overlap or touch
+       (the chunker overlaps neighbours, so their shared text is dropped)
+    2. Score each merged span by its best member's relevance
+    3. Greedily add spans in relevance order while they fit the budget
+    4. Render each span with its section/page citation
+    """
+
+    def __init__(self, token_budget: int = 1500, tokenizer: Optional[Callable[[str], int]] = None, max_gap: int = 1):
+        """
+        Initialize context packer
+
+        Args:
+            token_budget: Max tokens of context to pack
+            tokenizer: Token counting function (defaults to count_tokens)
+            max_gap: Max characters between two spans that still counts as adjacent
+        """
+        self.token_budget = token_budget
+        self.count_tokens = tokenizer or count_tokens
+        self.max_gap = max_gap
+
+    def pack(self, chunks: list[dict], token_budget: Optional[int] = None) -> list[PackedSpan]:
+        """
+        Merge and select chunks for the prompt
+
+        Args:
+            chunks: Retrieved chunks (text, relevance_score, metadata, source_chunk)
+            token_budget: Override for the packer's default budget
+
+        Returns:
+            Selected spans, most relevant first
+        """
+        budget = self.token_budget if token_budget is None else token_budget
+        spans = self._merge(chunks)
+        for span in spans:
+            span.tokens = self.count_tokens(span.text)
+        spans.sort(key=lambda span: span.relevance_score, reverse=True)
+
+        packed = []
+        used = 0
+        for span in spans:
+            if used + span.tokens <= budget:
+                packed.append(span)
+                used += span.tokens
+
+        # Never return an empty context when the best span alone is over budget
+        if not packed and spans and budget > 0:
+            best = spans[0]
+            keep = max(len(best.text) * budget // max(best.tokens, 1), 1)
+            best.text = best.text[:keep]
+            best.end = best.start + keep if best.start is not None else None
+            best.tokens = self.count_tokens(best.text)
+            packed.append(best)
+            used = best.tokens
+
+        logger.debug(f"Packed {len(chunks)} chunks into {len(packed)} spans ({used}/{budget} tokens)")
+        return packed
+
+    @staticmethod
+    def render(spans: list[PackedSpan]) -> str:
+        """
+        Format packed spans as prompt context with citations
+
+        Args:
+            spans: Packed spans
+
+        Returns:
+            Context block for the prompt
+        """
+        return "\n\n".join(
+            f"[Source {i + 1} | {span.citation}]\n{span.text.strip()}"
+            for i, span in enumerate(spans)
+        )
+
+    def _merge(self, chunks: list[dict]) -> list[PackedSpan]:
+        """Merge overlapping/adjacent chunks of the same contract into spans"""
+        spans = []
+        by_contract: dict[Optional[str], list[dict]] = {}
+
+        for chunk in chunks:
+            if not chunk.get("text"):
+                continue
+            metadata = chunk.get("metadata") or {}
+            if metadata.get("start") is None or metadata.get("end") is None:
+                # No offsets to merge on; keep the chunk as its own span
+                spans.append(self._span(chunk))
+                continue
+            by_contract.setdefault(metadata.get("contract_id"), []).append(chunk)
+
+        for group in by_contract.values():
+            group.sort(key=lambda chunk: chunk["metadata"]["start"])
+            current = self._span(group[0])
+            for chunk in group[1:]:
+                metadata = chunk["metadata"]
+                if metadata["start"] <= current.end + self.max_gap:
+                    if metadata["end"] > current.end:
+                        # Append only the part beyond what the span already covers
+                        skip = max(current.end - metadata["start"], 0)
+                        gap = " " * max(metadata["start"] - current.end, 0)
+                        current.text += gap + chunk["text"][skip:]
+                        current.end = metadata["end"]
+                    current.relevance_score = max(current.relevance_score, chunk.get("relevance_score", 0.0))
+                    current.source_chunks.append(chunk.get("source_chunk"))
+                    if current.page_number is None:
+                        current.page_number = metadata.get("page_number")
+                else:
+                    spans.append(current)
+                    current = self._span(chunk)
+            spans.append(current)
+
+        return spans
+
+    @staticmethod
+    def _span(chunk: dict) -> PackedSpan:
+        metadata = chunk.get("metadata") or {}
+        return PackedSpan(
+            contract_id=metadata.get("contract_id"),
+            start=metadata.get("start"),
+            end=metadata.get("end"),
+            text=chunk["text"],
+            relevance_score=chunk.get("relevance_score", 0.0),
+            section=metadata.get("section"),
+            page_number=metadata.get("page_number"),
+            source_chunks=[chunk.get("source_chunk")],
+        )
@@ -0,0 +1,343 @@
+"""
+Dashboard Store - Materialized per-organization dashboard aggregates
+Each analysed contract contributes a small summary; counters, sums and sorted
+date lists are adjusted when a summary is added or removed, so dashboard reads
+never touch individual analyses
+"""
+
+from bisect import bisect_left, insort
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from typing import Optional
+import json
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]")
+_RISK_LEVELS = ("High", "Medium", "Low")
+_RENEWAL_TYPES = ("renewal", "termination", "notice_required")
+
+
+@dataclass
+class ContractSummary:
+    """What one analysed contract contributes to its organization's dashboard"""
+    contract_id: str
+    organization_id: str
+    risk_level: str  # Low, Medium, High
+    risk_score: float  # 0-100
+    compliance_score: Optional[float] = None  # 0-100
+    clause_categories: dict[str, int] = field(default_factory=dict)
+    high_risk_clauses: int = 0
+    obligation_count: int = 0
+    obligations: list[dict] = field(default_factory=list)  # Dated obligations: date, description, party, priority
+    key_dates: list[dict] = field(default_factory=list)  # Renewal, expiry and notice dates: date, type, description, priority
+    terms: dict = field(default_factory=dict)  # ContractTerms.to_dict() without key_dates (rebuilds alerts)
+    vendor: Optional[str] = None
+    analyzed_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_analysis(cls, organization_id: str, result: dict, vendor: Optional[str] = None) -> "ContractSummary":
+        """
+        Summarize an analyze_contract result
+
+        Args:
+            organization_id: Owning organization
+            result: Job result (risk, clauses, obligations, terms)
+            vendor: Counterparty name
+
+        Returns:
+            Contract summary
+        """
+        clauses = result.get("key_clauses") or []
+        obligations = result.get("obligations") or []
+        terms = result.get("terms") or {}
+        key_dates = terms.get("key_dates") or []
+        return cls(
+            contract_id=result["contract_id"],
+            organization_id=organization_id,
+            risk_level=result.get("risk_level") or "Medium",
+            risk_score=float(result.get("risk_score") or 0),
+            compliance_score=(
+                float(result["compliance_score"]) if result.get("compliance_score") is not None else None
+            ),
+            clause_categories=dict(Counter(clause.get("category") or "other" for clause in clauses)),
+            high_risk_clauses=sum(1 for clause in clauses if clause.get("risk_level") == "High"),
+            obligation_count=len(obligations),
+            obligations=[
+                {
+                    "date": obligation["due_date"],
+                    "description": obligation.get("description", ""),
+                    "party": obligation.get("party"),
+                    "priority": (obligation.get("priority") or "medium").lower(),
+                }
+                for obligation in obligations
+                if _parse_date(obligation.get("due_date"))
+            ],
+            key_dates=[
+                {key: key_date[key] for key in ("date", "type", "description", "priority")}
+                for key_date in key_dates
+                if key_date.get("type") in _RENEWAL_TYPES
+            ],
+            terms={key: value for key, value in terms.items() if key != "key_dates"},
+            vendor=vendor,
+        )
+
+
+class _Aggregate:
+    """Running totals for one organization"""
+
+    def __init__(self):
+        self.contracts = 0
+        self.risk_levels: Counter[str] = Counter()
+        self.risk_sum = 0.0
+        self.compliance_sum = 0.0
+        self.compliance_count = 0
+        self.clause_categories: Counter[str] = Counter()
+        self.high_risk_clauses = 0
+        self.obligations = 0
+        # (day ordinal, contract_id, index into the summary's list), kept sorted
+        self.renewals: list[tuple[int, str, int]] = []
+        self.deadlines: list[tuple[int, str, int]] = []
+        self.expiries: list[tuple[int, str, int]] = []  # Renewal/expiry dates only (no notice deadlines)
+        self.updated_at: Optional[float] = None
+
+    def apply(self, summary: ContractSummary, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) one contract's contribution"""
+        self.contracts += sign
+        self.risk_levels[summary.risk_level] += sign
+        self.risk_sum += sign * summary.risk_score
+        if summary.compliance_score is not None:
+            self.compliance_sum += sign * summary.compliance_score
+            self.compliance_count += sign
+        self.clause_categories.update({category: sign * count for category, count in summary.clause_categories.items()})
+        self.clause_categories = +self.clause_categories  # Drop categories that reached zero
+        self.high_risk_clauses += sign * summary.high_risk_clauses
+        self.obligations += sign * summary.obligation_count
+        for entries, dated, types in (
+            (self.renewals, summary.key_dates, None),
+            (self.expiries, summary.key_dates, ("renewal", "termination")),
+            (self.deadlines, summary.obligations, None),
+        ):
+            for index, item in enumerate(dated):
+                day = _parse_date(item["date"])
+                if day is None or (types and item.get("type") not in types):
+                    continue
+                entry = (day.toordinal(), summary.contract_id, index)
+                if sign > 0:
+                    insort(entries, entry)
+                else:
+                    position = bisect_left(entries, entry)
+                    if position < len(entries) and entries[position] == entry:
+                        del entries[position]
+        self.updated_at = time.time()
+
+
+class DashboardStore:
+    """
+    Per-organization dashboard aggregates, updated per contract
+
+    - record() / remove() adjust counters (risk levels, clause categories),
+      sums (risk and compliance scores) and sorted date lists (renewal and
+      notice dates, expiries, obligation due dates) by one contract's
+      contribution
+    - dashboard() reads the counters in O(1) and date windows by bisection,
+      O(log n + limit), however many contracts an organization has
+    - Summaries are persisted one JSON file per contract; rebuild()
+      recomputes every aggregate from them (startup, or to repair drift)
+    """
+
+    def __init__(self, root: str, expiring_days: int = 30):
+        """
+        Initialize dashboard store
+
+        Args:
+            root: Directory holding one summary file per contract
+            expiring_days: Renewals/expiries this close count as expiring soon
+        """
+        self.root = root
+        self.expiring_days = expiring_days
+        self._summaries: dict[str, ContractSummary] = {}
+        self._aggregates: dict[str, _Aggregate] = {}
+        self._lock = threading.Lock()
+        self.rebuilt_at: Optional[float] = None
+        os.makedirs(root, exist_ok=True)
+
+    def record(self, summary: ContractSummary) -> None:
+        """
+        Add a contract's analysis (replacing its previous one)
+
+        Args:
+            summary: Contract summary
+        """
+        path = self._path(summary.contract_id)
+        with open(f"{path}.tmp", "w") as handle:
+            json.dump(asdict(summary), handle)
+        with self._lock:
+            os.replace(f"{path}.tmp", path)
+            self._discard(summary.contract_id)
+            self._summaries[summary.contract_id] = summary
+            self._aggregates.setdefault(summary.organization_id, _Aggregate()).apply(summary, 1)
+
+    def remove(self, contract_id: str) -> bool:
+        """
+        Remove a deleted contract's contribution
+
+        Args:
+            contract_id: Contract identifier
+
+        Returns:
+            True if the contract was recorded
+        """
+        with self._lock:
+            found = self._discard(contract_id)
+            try:
+                os.remove(self._path(contract_id))
+            except FileNotFoundError:
+                pass
+        return found
+
+    def dashboard(self, organization_id: str, today: Optional[date] = None, days: int = 90, limit: int = 10) -> dict:
+        """
+        Dashboard metrics for one organization
+
+        Args:
+            organization_id: Organization to report on
+            today: Reference date (defaults to today)
+            days: Window for upcoming renewals and obligations
+            limit: Most upcoming items listed per kind
+
+        Returns:
+            Contract stats, compliance metrics, clause-category counts and
+            upcoming renewals/obligations
+        """
+        today = today or date.today()
+        with self._lock:
+            aggregate = self._aggregates.get(organization_id) or _Aggregate()
+            contracts = aggregate.contracts
+            start, end = today.toordinal(), today.toordinal() + days
+            return {
+                "organization_id": organization_id,
+                "contract_stats": {
+                    "total": contracts,
+                    **{level.lower(): aggregate.risk_levels[level] for level in _RISK_LEVELS},
+                    "avg_risk": round(aggregate.risk_sum / contracts, 1) if contracts else 0,
+                    "avg_compliance": (
+                        round(aggregate.compliance_sum / aggregate.compliance_count, 1)
+                        if aggregate.compliance_count else None
+                    ),
+                    "expiring_soon": (
+                        bisect_left(aggregate.expiries, (start + self.expiring_days + 1,))
+                        - bisect_left(aggregate.expiries, (start,))
+                    ),
+                },
+                "compliance_metrics": {
+                    "high_risk_clauses": aggregate.high_risk_clauses,
+                    "obligations": aggregate.obligations,
+                    "compliance_score": (
+                        round(aggregate.compliance_sum / aggregate.compliance_count, 1)
+                        if aggregate.compliance_count else None
+                    ),
+                },
+                "clause_categories": dict(aggregate.clause_categories),
+                "upcoming_renewals": self._window(aggregate.renewals, "key_dates", start, end, limit, today),
+                "upcoming_obligations": self._window(aggregate.deadlines, "obligations", start, end, limit, today),
+                "updated_at": aggregate.updated_at,
+            }
+
+    def rebuild(self) -> dict:
+        """
+        Recompute every aggregate from the stored summaries
+
+        Returns:
+            Contracts and organizations loaded, and the time taken
+        """
+        started = time.perf_counter()
+        summaries: dict[str, ContractSummary] = {}
+        for name in os.listdir(self.root):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.root, name)) as handle:
+                    summary = ContractSummary(**json.load(handle))
+                summaries[summary.contract_id] = summary
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"Skipping unreadable dashboard summary {name}: {str(e)}")
+
+        aggregates: dict[str, _Aggregate] = {}
+        for summary in summaries.values():
+            aggregates.setdefault(summary.organization_id, _Aggregate()).apply(summary, 1)
+        with self._lock:
+            self._summaries, self._aggregates = summaries, aggregates
+            self.rebuilt_at = time.time()
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Rebuilt dashboard aggregates for {len(summaries)} contracts in {elapsed_ms:.1f}ms")
+        return {"contracts": len(summaries), "organizations": len(aggregates), "elapsed_ms": round(elapsed_ms, 1)}
+
+    def summaries(self) -> list[ContractSummary]:
+        """Every recorded contract summary"""
+        with self._lock:
+            return list(self._summaries.values())
+
+    def stats(self) -> dict:
+        """Contracts and organizations aggregated"""
+        return {
+            "contracts": len(self._summaries),
+            "organizations": len(self._aggregates),
+            "rebuilt_at": self.rebuilt_at,
+        }
+
+    def _discard(self, contract_id: str) -> bool:
+        previous = self._summaries.pop(contract_id, None)
+        if previous is None:
+            return False
+        aggregate = self._aggregates[previous.organization_id]
+        aggregate.apply(previous, -1)
+        if aggregate.contracts == 0:
+            del self._aggregates[previous.organization_id]
+        return True
+
+    def _window(
+        self,
+        entries: list[tuple[int, str, int]],
+        kind: str,
+        start: int,
+        end: int,
+        limit: int,
+        today: date
+    ) -> list[dict]:
+        """Items dated start..end (day ordinals), soonest first"""
+        items = []
+        for position in range(bisect_left(entries, (start,)), len(entries)):
+            day, contract_id, index = entries[position]
+            if day > end or len(items) >= limit:
+                break
+            summary = self._summaries[contract_id]
+            items.append({
+                **getattr(summary, kind)[index],
+                "contract_id": contract_id,
+                "vendor": summary.vendor,
+                "days_until": day - today.toordinal(),
+            })
+        return items
+
+    def _path(self, contract_id: str) -> str:
+        name = _SAFE_NAME.sub("_", contract_id)
+        if name != contract_id:
+            # Sanitizing can map distinct ids to one name (a/b, a_b): tell them apart by hash
+            name = f"{name}-{zlib.crc32(contract_id.encode('utf-8')):08x}"
+        return os.path.join(self.root, f"{name}.json")
+
+
+def _parse_date(value) -> Optional[date]:
+    try:
+        return date.fromisoformat(value) if value else None
+    except (TypeError, ValueError):
+        return None
@@ -9,8 +9,16 @@ from typing import Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from app.deadlines import bounded, hedged
+from app.metrics import REGISTRY
+from app.services.context_packer import count_tokens
+
 logger = logging.getLogger(__name__)
 
+_TOKENS_PROMPT = REGISTRY.counter("contractguard_llm_tokens_total", "Tokens sent to/received from OpenAI", kind="prompt")
+_TOKENS_COMPLETION = REGISTRY.counter("contractguard_llm_tokens_total", "Tokens sent to/received from OpenAI", kind="completion")
+_TOKENS_EMBEDDING = REGISTRY.counter("contractguard_llm_tokens_total", "Tokens sent to/received from OpenAI", kind="embedding")
+
 
 class RiskLevel(str, Enum):
     """Risk assessment levels"""
@@ -50,7 +58,15 @@ class LLMService:
     - Clause extraction: < 12s
     """
 
-    def __init__(self, api_key: str, model: str = "gpt-4-turbo", max_tokens: int = 2000):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4-turbo",
+        max_tokens: int = 2000,
+        http_client=None,
+        request_timeout: Optional[float] = 60.0,
+        hedge_embeddings: bool = True
+    ):
         """
         Initialize LLM service
         
@@ -58,13 +74,21 @@ class LLMService:
             api_key: OpenAI API key
             model: Model identifier (gpt-4-turbo or gpt-4o)
             max_tokens: Max completion tokens
+            http_client: Shared pooled httpx.AsyncClient (owned by the caller)
+            request_timeout: Longest a single API call may take (the request
+                deadline, when shorter, wins)
+            hedge_embeddings: Send a backup embedding request when the first
+                runs past its recent p95 latency
         """
         self.api_key = api_key
         self.model = model
         self.max_tokens = max_tokens
+        self.http_client = http_client
+        self.request_timeout = request_timeout
+        self.hedge_embeddings = hedge_embeddings
         # OpenAI client initialization would go here
         # from openai import AsyncOpenAI
-        # self.client = AsyncOpenAI(api_key=api_key)
+        # self.client = AsyncOpenAI(api_key=api_key, http_client=http_client)
         
     async def summarize_contract(self, text: str, vendor: str = None) -> str:
         """
@@ -100,9 +124,9 @@ Keep language simple and avoid legal jargon. Maximum 300 words.
         logger.info(f"Generated summary for contract by {vendor}")
         return response
 
-    async def analyze_risk(self, text: str) -> tuple[RiskLevel, int]:
+    async def analyze_risk(self, text: str) -> tuple[RiskLevel, int, int]:
         """
-        Classify contract risk level and generate risk score
+        Classify contract risk level and generate risk and compliance scores
         
         Risk Classification:
         - Low (0-33): Standard terms, minimal exposure
@@ -113,7 +137,7 @@ Keep language simple and avoid legal jargon. Maximum 300 words.
             text: Contract text
             
         Returns:
-            (risk_level, risk_score) tuple
+            (risk_level, risk_score, compliance_score) tuple
         """
         prompt = f"""
 Analyze the legal and financial risk of this contract.
@@ -125,6 +149,7 @@ Respond ONLY with valid JSON (no markdown):
 {{
     "risk_level": "Low|Medium|High",
     "risk_score": 0-100,
+    "compliance_score": 0-100,
     "primary_risks": ["risk1", "risk2", "risk3"],
     "reasoning": "brief explanation"
 }}
@@ -135,6 +160,7 @@ Based on:
 - Payment terms and late fees
 - IP and confidentiality restrictions
 - Renewal and cancellation terms
+- Compliance score: coverage of data protection, audit and regulatory obligations
 """
         
         response = await self._call_gpt(prompt)
@@ -143,10 +169,11 @@ Based on:
             parsed = json.loads(response)
             risk_level = RiskLevel(parsed.get("risk_level", "Medium"))
             risk_score = parsed.get("risk_score", 50)
-            return risk_level, risk_score
+            compliance_score = parsed.get("compliance_score", 50)
+            return risk_level, risk_score, compliance_score
         except Exception as e:
             logger.error(f"Failed to parse risk analysis: {str(e)}")
-            return RiskLevel.MEDIUM, 50
+            return RiskLevel.MEDIUM, 50, 50
 
     async def extract_clauses(self, text: str) -> list[dict]:
         """
@@ -204,7 +231,10 @@ Respond ONLY with valid JSON:
 
     async def identify_obligations(self, text: str) -> list[dict]:
         """
-        Identify party obligations and key dates
+        Identify party obligations
+        
+        Key dates (renewal, notice, expiry) come from term_extractor, so
+        the prompt only asks for obligations.
         
         Args:
             text: Contract text
@@ -213,7 +243,7 @@ Respond ONLY with valid JSON:
             List of obligations with dates and responsible party
         """
         prompt = f"""
-Identify all obligations and key dates in this contract.
+Identify all obligations in this contract.
 
 CONTRACT TEXT:
 {text[:4000]}
@@ -224,12 +254,6 @@ List each obligation with:
 - Due date if specified
 - Consequence of non-compliance
 
-Also identify key dates for:
-- Renewal or extension windows
-- Termination notice requirements
-- Payment schedules
-- Compliance audits
-
 Respond ONLY with valid JSON:
 {{
     "obligations": [
@@ -240,13 +264,6 @@ Respond ONLY with valid JSON:
             "consequence": "string",
             "priority": "Low|Medium|High"
         }}
-    ],
-    "key_dates": [
-        {{
-            "date": "YYYY-MM-DD or 'relative' (e.g., 90 days before renewal)",
-            "type": "renewal|termination|notice|payment|compliance|other",
-            "description": "string"
-        }}
     ]
 }}
 """
@@ -302,10 +319,46 @@ If the answer isn't in the provided context, say "This information is not addres
         Returns:
             Embedding vector
         """
-        # In production: client.embeddings.create(model="text-embedding-3-large", input=text)
-        # Returning mock vector for now
+        return (await self.embed_texts([text]))[0]
+
+    async def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        """
+        Create embedding vectors for a batch of texts in one request
+        
+        Args:
+            texts: Texts to embed (the API accepts up to 2048 inputs)
+            
+        Returns:
+            Embedding vectors, in input order
+        """
+        _TOKENS_EMBEDDING.inc(sum(count_tokens(text) for text in texts))
+        # Embeddings are idempotent, so a slow request can safely be hedged
+        return await hedged(
+            lambda: bounded(lambda timeout: self._embed(texts, timeout), "llm.embedding", cap=self.request_timeout),
+            "llm.embedding",
+            enabled=self.hedge_embeddings,
+        )
+
+    async def _embed(self, texts: list[str], timeout: Optional[float]) -> list[list[float]]:
+        """
+        Single embeddings API request
+        
+        Args:
+            texts: Texts to embed
+            timeout: Seconds the request may take (remaining request budget)
+            
+        Returns:
+            Embedding vectors, in input order
+        """
+        # In production:
+        # response = await self.client.embeddings.create(
+        #     model="text-embedding-3-large", input=texts, timeout=timeout
+        # )
+        # return [item.embedding for item in response.data]
+        
+        # Returning mock vectors for now
         import random
-        return [random.random() for _ in range(1536)]  # OpenAI embedding dimension
+        return [[random.random() for _ in range(1536)] for _ in texts]  # OpenAI embedding dimension
 
     async def _call_gpt(self, prompt: str) -> str:
         """
@@ -318,13 +371,32 @@ If the answer isn't in the provided context, say "This information is not addres
             Model response
         """
         logger.debug(f"Calling GPT-4o with prompt length: {len(prompt)}")
+        _TOKENS_PROMPT.inc(count_tokens(prompt))
+        # Completions are costly and not hedged; they only get the remaining budget
+        content = await bounded(
+            lambda timeout: self._complete(prompt, timeout), "llm.completion", cap=self.request_timeout
+        )
+        _TOKENS_COMPLETION.inc(count_tokens(content))
+        return content
+
+    async def _complete(self, prompt: str, timeout: Optional[float]) -> str:
+        """
+        Single chat completion API request
         
+        Args:
+            prompt: Full prompt text
+            timeout: Seconds the request may take (remaining request budget)
+            
+        Returns:
+            Model response
+        """
         # In production:
         # response = await self.client.chat.completions.create(
         #     model=self.model,
         #     messages=[{"role": "user", "content": prompt}],
         #     max_tokens=self.max_tokens,
-        #     temperature=0.2  # Low temperature for consistency
+        #     temperature=0.2,  # Low temperature for consistency
+        #     timeout=timeout
         # )
         # return response.choices[0].message.content
         
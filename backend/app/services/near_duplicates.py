@@ -0,0 +1,273 @@
+"""
+Near-Duplicate Index - MinHash/LSH over contract text
+Finds the most similar contract an organization has already analysed without
+comparing against every one, so templated paper reuses earlier analyses and
+chunk embeddings
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+import hashlib
+import logging
+import re
+import zlib
+
+from app.metrics import REGISTRY
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_LOOKUP_HIT = REGISTRY.counter("contractguard_near_duplicates_total", "Near-duplicate lookups", result="hit")
+_LOOKUP_MISS = REGISTRY.counter("contractguard_near_duplicates_total", "Near-duplicate lookups", result="miss")
+
+_WORD = re.compile(r"\w+")
+_SHINGLE_BLOCK = 8192  # Shingles hashed per block (bounds the permutation matrix)
+
+
+def chunk_fingerprint(text: str) -> str:
+    """Content hash of a chunk (whitespace-insensitive), stored as text_hash"""
+    return hashlib.blake2b(" ".join(text.split()).encode("utf-8"), digest_size=8).hexdigest()
+
+
+@dataclass
+class NearDuplicate:
+    """An analysed contract similar to the one being looked up"""
+    contract_id: str
+    similarity: float  # Estimated Jaccard similarity of word shingles
+    result: dict  # Its analysis result
+    vendor: Optional[str] = None
+
+
+@dataclass
+class _Entry:
+    organization_id: str
+    signature: "np.ndarray"
+    result: dict
+    vendor: Optional[str]
+
+
+class NearDuplicateIndex:
+    """
+    MinHash signatures of analysed contracts, bucketed by LSH band
+
+    - A contract's text becomes word shingles (shingle_words long); its
+      signature is the minimum of num_perm multiply-shift hashes over them,
+      and the share of equal positions estimates Jaccard similarity
+    - The signature is cut into bands of rows; contracts sharing any band
+      are candidates, so a lookup costs O(bands + candidates) rather than
+      one comparison per stored contract. With 16 bands of 8 rows, pairs
+      at 0.85 similarity become candidates ~99% of the time and pairs at
+      0.5 ~6%
+    - Buckets are per organization: analyses are never shared across tenants
+    - Chunk fingerprints map identical chunk text to an existing vector,
+      so re-uploads embed only what changed
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_words: int = 5,
+        threshold: float = 0.85,
+        judgement_threshold: float = 0.95,
+        max_contracts: int = 50000,
+        seed: int = 1
+    ):
+        """
+        Initialize index
+
+        Args:
+            num_perm: Signature length (hash functions)
+            bands: LSH bands (num_perm must divide evenly)
+            shingle_words: Words per shingle
+            threshold: Minimum similarity to reuse an analysis (diffing
+                clauses and obligations)
+            judgement_threshold: Minimum similarity to also reuse whole-document
+                judgements (summary, risk and compliance scores)
+            max_contracts: Contracts kept (least recently analysed dropped first)
+            seed: Seed of the hash functions
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_words = shingle_words
+        self.threshold = threshold
+        self.judgement_threshold = judgement_threshold
+        self.max_contracts = max_contracts
+        self.seed = seed
+        self._hash_params: Optional[tuple["np.ndarray", "np.ndarray"]] = None
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._buckets: dict[str, list[dict[bytes, set[str]]]] = {}
+        self._chunks: dict[str, dict[str, tuple[str, str]]] = {}  # org -> fingerprint -> (contract_id, vector_id)
+        self._contract_chunks: dict[str, list[tuple[str, str]]] = {}  # contract_id -> [(org, fingerprint)]
+
+    def signature(self, text: str) -> "np.ndarray":
+        """
+        MinHash signature of a text (CPU-bound; run in a worker thread)
+
+        Returns:
+            num_perm uint32 values
+        """
+        import numpy as np
+
+        words = _WORD.findall(text.lower())
+        ids = np.fromiter((zlib.crc32(word.encode("utf-8")) for word in words), dtype=np.uint64, count=len(words))
+        count = max(len(ids) - self.shingle_words + 1, 1 if len(ids) else 0)
+        signature = np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        if count == 0:
+            return signature
+
+        # Polynomial hash of each window of shingle_words word ids (wraps mod 2^64)
+        shingles = np.zeros(count, dtype=np.uint64)
+        for offset in range(min(self.shingle_words, len(ids))):
+            shingles = shingles * np.uint64(1000003) + ids[offset:offset + count]
+
+        a, b = self._hashes()
+        for start in range(0, count, _SHINGLE_BLOCK):
+            block = shingles[start:start + _SHINGLE_BLOCK]
+            # Multiply-shift hashing: top 32 bits of a*x + b (mod 2^64) per permutation
+            hashed = ((a * block + b) >> np.uint64(32)).astype(np.uint32)
+            np.minimum(signature, hashed.min(axis=1), out=signature)
+        return signature
+
+    def nearest(
+        self,
+        organization_id: str,
+        signature: "np.ndarray",
+        exclude: Optional[str] = None
+    ) -> Optional[NearDuplicate]:
+        """
+        Most similar analysed contract of an organization, if similar enough
+
+        Args:
+            organization_id: Organization to search
+            signature: Signature of the new contract
+            exclude: Contract to ignore (the one being analysed)
+
+        Returns:
+            Best candidate at or above threshold, or None
+        """
+        import numpy as np
+
+        bands = self._buckets.get(organization_id)
+        candidates: set[str] = set()
+        if bands:
+            for band, bucket in enumerate(bands):
+                candidates |= bucket.get(self._band_key(signature, band), set())
+        candidates.discard(exclude)
+
+        best, best_similarity = None, 0.0
+        for contract_id in candidates:
+            similarity = float(np.mean(self._entries[contract_id].signature == signature))
+            if similarity > best_similarity:
+                best, best_similarity = contract_id, similarity
+
+        if best is None or best_similarity < self.threshold:
+            _LOOKUP_MISS.inc()
+            return None
+        _LOOKUP_HIT.inc()
+        entry = self._entries[best]
+        logger.info(f"Near-duplicate of contract {best} ({best_similarity:.2f}, {len(candidates)} candidates)")
+        return NearDuplicate(contract_id=best, similarity=best_similarity, result=entry.result, vendor=entry.vendor)
+
+    def add(
+        self,
+        contract_id: str,
+        organization_id: str,
+        signature: "np.ndarray",
+        result: dict,
+        vendor: Optional[str] = None
+    ) -> None:
+        """
+        Index an analysed contract (replacing an earlier analysis of it)
+
+        Args:
+            contract_id: Contract identifier
+            organization_id: Owning organization
+            signature: Its signature
+            result: Its analysis result (reused by near-duplicates)
+            vendor: Counterparty name
+        """
+        self._remove_signature(contract_id)
+        self._entries[contract_id] = _Entry(organization_id, signature, result, vendor)
+        bands = self._buckets.setdefault(organization_id, [{} for _ in range(self.bands)])
+        for band, bucket in enumerate(bands):
+            bucket.setdefault(self._band_key(signature, band), set()).add(contract_id)
+        while len(self._entries) > self.max_contracts:
+            self._remove_signature(next(iter(self._entries)))
+
+    def add_chunks(self, organization_id: str, contract_id: str, chunks: list[tuple[str, str]]) -> None:
+        """
+        Record stored chunks for embedding reuse
+
+        Args:
+            organization_id: Owning organization
+            contract_id: Contract the chunks belong to
+            chunks: (fingerprint, vector_id) pairs
+        """
+        fingerprints = self._chunks.setdefault(organization_id, {})
+        owned = self._contract_chunks.setdefault(contract_id, [])
+        for fingerprint, vector_id in chunks:
+            fingerprints[fingerprint] = (contract_id, vector_id)
+            owned.append((organization_id, fingerprint))
+
+    def chunk_donors(self, organization_id: str, fingerprints: list[str]) -> list[Optional[tuple[str, str]]]:
+        """
+        Existing vectors with the same chunk text
+
+        Returns:
+            (contract_id, vector_id) or None per fingerprint
+        """
+        known = self._chunks.get(organization_id) or {}
+        return [known.get(fingerprint) for fingerprint in fingerprints]
+
+    def remove(self, contract_id: str) -> None:
+        """Forget a deleted contract's analysis and chunks"""
+        self._remove_signature(contract_id)
+        for organization_id, fingerprint in self._contract_chunks.pop(contract_id, []):
+            fingerprints = self._chunks.get(organization_id, {})
+            if fingerprints.get(fingerprint, ("",))[0] == contract_id:
+                del fingerprints[fingerprint]
+
+    def stats(self) -> dict:
+        """Contracts and chunk fingerprints indexed"""
+        return {
+            "contracts": len(self._entries),
+            "organizations": len(self._buckets),
+            "chunk_fingerprints": sum(len(fingerprints) for fingerprints in self._chunks.values()),
+            "threshold": self.threshold,
+        }
+
+    def _hashes(self) -> tuple["np.ndarray", "np.ndarray"]:
+        """Odd multipliers and offsets of the hash functions (NumPy imported on first use)"""
+        if self._hash_params is None:
+            import numpy as np
+
+            rng = np.random.default_rng(self.seed)
+            a = rng.integers(0, 2**63, size=(self.num_perm, 1), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+            b = rng.integers(0, 2**63, size=(self.num_perm, 1), dtype=np.uint64)
+            self._hash_params = (a, b)
+        return self._hash_params
+
+    def _band_key(self, signature: "np.ndarray", band: int) -> bytes:
+        return signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def _remove_signature(self, contract_id: str) -> None:
+        entry = self._entries.pop(contract_id, None)
+        if entry is None:
+            return
+        bands = self._buckets.get(entry.organization_id, [])
+        for band, bucket in enumerate(bands):
+            key = self._band_key(entry.signature, band)
+            members = bucket.get(key)
+            if members is not None:
+                members.discard(contract_id)
+                if not members:
+                    del bucket[key]
+        if bands and not any(bands):
+            del self._buckets[entry.organization_id]
@@ -3,13 +3,53 @@ RAG Service - Retrieval-Augmented Generation for Contract Analysis
 Orchestrates vector storage, retrieval, and LLM integration for legal document understanding
 """
 
-from typing import Optional
-from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+from dataclasses import dataclass, field
 from enum import Enum
+from bisect import bisect_right
+import asyncio
+import contextvars
 import logging
+import re
+import time
+
+from app.deadlines import DeadlineExceeded, deadline, latency_window, remaining
+from app.metrics import REGISTRY
+from app.services.context_packer import ContextPacker, PackedSpan
+from app.services.near_duplicates import chunk_fingerprint
+from app.services.text_store import normalize_text
+
+if TYPE_CHECKING:
+    import numpy as np
 
 logger = logging.getLogger(__name__)
 
+_DEGRADED_SHORT = REGISTRY.counter(
+    "contractguard_rag_degraded_total", "Retrievals cut down to fit the request deadline", reason="short_budget"
+)
+_DEGRADED_TIMEOUT = REGISTRY.counter(
+    "contractguard_rag_degraded_total", "Retrievals cut down to fit the request deadline", reason="timeout"
+)
+_CLAUSES_LOCAL = REGISTRY.counter(
+    "contractguard_clause_chunks_total", "Chunks by who labelled their clause category", labeller="classifier"
+)
+_CLAUSES_LLM = REGISTRY.counter(
+    "contractguard_clause_chunks_total", "Chunks by who labelled their clause category", labeller="llm"
+)
+_EMBEDDINGS_REUSED = REGISTRY.counter(
+    "contractguard_chunk_embeddings_total", "Chunks stored, by where their embedding came from", source="reused"
+)
+_EMBEDDINGS_COMPUTED = REGISTRY.counter(
+    "contractguard_chunk_embeddings_total", "Chunks stored, by where their embedding came from", source="computed"
+)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_SENTENCE_PATTERN = re.compile(r"\S(?:.*?[.!?](?=\s)|.*\S)?", re.DOTALL)
+_HEADING_PATTERN = re.compile(
+    r"^[ \t]*(?:(?:ARTICLE|Article|SECTION|Section)\s+[\dIVXLC]+(?:\.\d+)*\b|\d+(?:\.\d+)*\.?[ \t]+[A-Z])[^\n]{0,80}$",
+    re.MULTILINE,
+)
+
 
 @dataclass
 class RetrievalContext:
@@ -18,6 +58,227 @@ class RetrievalContext:
     top_k: int = 5
     threshold: float = 0.7
     filters: Optional[dict] = None
+    rerank: bool = True
+    fetch_k: Optional[int] = None  # Candidates to over-fetch; defaults to 4 * top_k
+    mmr_lambda: float = 0.7  # 1.0 = pure relevance, 0.0 = pure diversity
+    lexical_weight: float = 0.0  # Weight of query/chunk term overlap added to relevance
+    embedding: Optional[list] = None  # Precomputed query embedding (skips embedding the query)
+
+
+def maximal_marginal_relevance(
+    query_vector,
+    candidate_vectors,
+    k: int,
+    lambda_mult: float = 0.7,
+    boosts=None,
+) -> list[int]:
+    """
+    Select k diverse candidates with Maximal Marginal Relevance
+
+    Each step picks the candidate maximising
+    lambda * relevance - (1 - lambda) * max_similarity_to_selected.
+    Similarities are computed once as a single matrix product and the
+    running max is updated incrementally, so selection is O(k * n).
+    
+    Args:
+        query_vector: Query embedding
+        candidate_vectors: Candidate embeddings, one row per candidate
+        k: Number of candidates to select
+        lambda_mult: Relevance/diversity trade-off
+        boosts: Optional per-candidate additive relevance boosts
+        
+    Returns:
+        Indices of selected candidates in selection order
+    """
+    import numpy as np
+
+    candidates = np.asarray(candidate_vectors, dtype=np.float32)
+    if candidates.ndim != 2 or candidates.shape[0] == 0 or k <= 0:
+        return []
+
+    query = np.asarray(query_vector, dtype=np.float32)
+    candidates = candidates / np.maximum(np.linalg.norm(candidates, axis=1, keepdims=True), 1e-12)
+    query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+    relevance = candidates @ query
+    if boosts is not None:
+        relevance = relevance + np.asarray(boosts, dtype=np.float32)
+    similarity = candidates @ candidates.T
+
+    count = candidates.shape[0]
+    k = min(k, count)
+    selected = [int(np.argmax(relevance))]
+    max_similarity = similarity[selected[0]].copy()
+    available = np.ones(count, dtype=bool)
+    available[selected[0]] = False
+
+    while len(selected) < k:
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_similarity
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+
+    return selected
+
+
+def lexical_overlap(query: str, texts: list[Optional[str]]) -> "np.ndarray":
+    """
+    Fraction of query terms present in each text (0-1)
+    
+    Args:
+        query: User query
+        texts: Candidate texts (None counts as no overlap)
+        
+    Returns:
+        Overlap score per text
+    """
+    import numpy as np
+
+    query_terms = set(_TOKEN_PATTERN.findall(query.lower()))
+    if not query_terms:
+        return np.zeros(len(texts), dtype=np.float32)
+    return np.array(
+        [
+            len(query_terms.intersection(_TOKEN_PATTERN.findall(text.lower()))) / len(query_terms)
+            if text else 0.0
+            for text in texts
+        ],
+        dtype=np.float32,
+    )
+
+
+def chunk_text(
+    text: str,
+    metadata: dict,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    start: int = 0,
+    first_index: int = 0,
+    scan_from: Optional[int] = None,
+    section: Optional[str] = None
+) -> list[dict]:
+    """
+    Split text into overlapping, offset-tracked chunks
+    
+    Plain function (no service state) so bulk ingestion can run it in a
+    process pool; RAGService.chunk_document delegates here.
+    
+    Resumable: when text is a growing prefix of a document (pages still
+    arriving), every chunk but the last is final. Chunking again once more
+    text has arrived, with start at the last chunk's start, scan_from at the
+    end of the chunk before it and section at the last chunk's section,
+    yields exactly the chunks a single pass over the whole document would.
+    Only the text from start's line on is scanned again.
+    
+    Args:
+        text: Contract text
+        metadata: Document metadata (contract_id, page_offsets, etc.)
+        chunk_size: Target max characters per chunk
+        chunk_overlap: Characters carried over from the previous chunk
+        start: Offset to resume from (start of the last chunk of an earlier pass)
+        first_index: chunk_index of the first chunk returned
+        scan_from: Offset the sentence scan resumes from (the end of the
+            chunk before the resumed one; defaults to start)
+        section: Section heading in force at start, when its heading line
+            lies before start's line
+        
+    Returns:
+        List of chunks with metadata
+    """
+    chunks = []
+
+    # Page boundaries are used for citations only, not stored per chunk
+    page_offsets = metadata.get("page_offsets") or []
+    base_metadata = {key: value for key, value in metadata.items() if key != "page_offsets"}
+    line_start = text.rfind("\n", 0, start) + 1
+    headings = [(match.start(), match.group(0).strip()) for match in _HEADING_PATTERN.finditer(text, line_start)]
+    heading_offsets = [offset for offset, _ in headings]
+
+    def emit(start: int, end: int) -> None:
+        index = first_index + len(chunks)
+        chunk_metadata = {
+            **base_metadata,
+            "chunk_index": index,
+            "chunk_size": end - start,
+            "start": start,
+            "end": end,
+        }
+        heading = bisect_right(heading_offsets, start) - 1
+        if heading >= 0:
+            chunk_metadata["section"] = headings[heading][1]
+        elif section:
+            chunk_metadata["section"] = section
+        if page_offsets:
+            chunk_metadata["page_number"] = max(bisect_right(page_offsets, start), 1)
+        chunks.append({
+            "id": f"{metadata.get('contract_id')}_chunk_{index}",
+            "text": text[start:end],
+            "metadata": chunk_metadata,
+        })
+
+    # Split by sentences first for semantic chunking; chunks are contiguous
+    # slices of the source text so their offsets can be merged downstream
+    chunk_start = chunk_end = None
+    # A resumed chunk keeps its start, which may lie in its predecessor's overlap
+    resumed = scan_from is not None
+    scan_from = start if scan_from is None else scan_from
+
+    for sentence_start, sentence_end in (match.span() for match in _SENTENCE_PATTERN.finditer(text, scan_from)):
+        if chunk_start is None:
+            chunk_start, chunk_end = start if resumed else sentence_start, sentence_end
+        elif sentence_end - chunk_start <= chunk_size:
+            chunk_end = sentence_end
+        else:
+            emit(chunk_start, chunk_end)
+            # Overlap for context: carry the tail of the previous chunk, word-aligned
+            overlap_start = max(chunk_end - chunk_overlap, chunk_start)
+            word_start = text.find(" ", overlap_start, chunk_end)
+            chunk_start = word_start + 1 if word_start != -1 else sentence_start
+            chunk_end = sentence_end
+
+    # Final chunk
+    if chunk_start is not None:
+        emit(chunk_start, chunk_end)
+
+    return chunks
+
+
+def prepare_document(text: str, metadata: dict) -> tuple[str, dict]:
+    """
+    Normalize contract text for storage, re-basing page_offsets
+    
+    Args:
+        text: Extracted contract text
+        metadata: Document metadata (page_offsets optional)
+        
+    Returns:
+        (normalized text, metadata with page_offsets into it)
+    """
+    page_offsets = metadata.get("page_offsets")
+    if not page_offsets:
+        return normalize_text(text), metadata
+    
+    # Normalize page by page so page boundaries survive normalization
+    bounds = list(page_offsets) + [len(text)]
+    pages = [normalize_text(text[bounds[i]:bounds[i + 1]]) for i in range(len(page_offsets))]
+    normalized_offsets, position = [], 0
+    for page in pages:
+        normalized_offsets.append(position)
+        position += len(page) + 1
+    return "\n".join(pages), {**metadata, "page_offsets": normalized_offsets}
+
+
+@dataclass
+class ContractHits:
+    """Retrieved chunks for one contract in a portfolio-wide search"""
+    contract_id: str
+    chunks: list[dict] = field(default_factory=list)
+
+    @property
+    def best_score(self) -> float:
+        return max((chunk["relevance_score"] for chunk in self.chunks), default=0.0)
 
 
 class ClauseCategory(str, Enum):
@@ -46,7 +307,16 @@ class RAGService:
     - Manage vector metadata
     """
 
-    def __init__(self, pinecone_client=None, llm_service=None, vector_service=None):
+    def __init__(
+        self,
+        pinecone_client=None,
+        llm_service=None,
+        vector_service=None,
+        text_store=None,
+        answer_cache=None,
+        clause_classifier=None,
+        near_duplicates=None
+    ):
         """
         Initialize RAG service with dependencies
         
@@ -54,13 +324,34 @@ class RAGService:
             pinecone_client: Pinecone client instance
             llm_service: LLM service for generating embeddings
             vector_service: Vector database operations service
+            text_store: DocumentTextStore holding contract text; when set, vectors
+                carry only (contract_id, start, end) and text is hydrated on retrieval
+            answer_cache: SemanticAnswerCache serving answers to similar questions
+            clause_classifier: ClauseClassifier labelling chunks' clause_category at ingest
+            near_duplicates: NearDuplicateIndex; chunks whose text an earlier contract
+                of the organization already embedded reuse that embedding
         """
         self.pinecone = pinecone_client
         self.llm_service = llm_service
         self.vector_service = vector_service
+        self.text_store = text_store
+        self.answer_cache = answer_cache
+        self.clause_classifier = clause_classifier
+        self.near_duplicates = near_duplicates
+        self._background: set[asyncio.Task] = set()
         self.index_name = "contractguard-kb"
         self.chunk_size = 1000
         self.chunk_overlap = 200
+        self.embed_batch_size = 64
+        self.context_packer = ContextPacker(token_budget=1500)
+        self.packing_candidates = 12
+        # Deadline handling: seconds kept back for answer generation (until
+        # completion latencies have been observed), and the retrieval budget
+        # below which only degraded_context_limit chunks are fetched (no
+        # over-fetch or MMR)
+        self.answer_reserve_seconds = 8.0
+        self.degraded_retrieval_seconds = 1.0
+        self.degraded_context_limit = 1
 
     async def chunk_document(self, text: str, metadata: dict) -> list[dict]:
         """
@@ -73,94 +364,303 @@ class RAGService:
         
         Args:
             text: Contract text
-            metadata: Document metadata (contract_id, page_numbers, etc.)
+            metadata: Document metadata (contract_id, page_offsets, etc.);
+                page_offsets lists the character offset where each page starts
             
         Returns:
-            List of chunks with metadata
-        """
-        chunks = []
-        
-        # Split by sentences first for semantic chunking
-        sentences = self._split_sentences(text)
-        
-        current_chunk = ""
-        chunk_index = 0
-        
-        for sentence in sentences:
-            if len(current_chunk) + len(sentence) < self.chunk_size:
-                current_chunk += " " + sentence
-            else:
-                if current_chunk:
-                    chunks.append({
-                        "id": f"{metadata.get('contract_id')}_chunk_{chunk_index}",
-                        "text": current_chunk.strip(),
-                        "metadata": {
-                            **metadata,
-                            "chunk_index": chunk_index,
-                            "chunk_size": len(current_chunk),
-                        }
-                    })
-                    chunk_index += 1
-                    # Overlap for context
-                    current_chunk = sentence[-min(self.chunk_overlap, len(sentence)):]
-                else:
-                    current_chunk = sentence
-        
-        # Final chunk
-        if current_chunk:
-            chunks.append({
-                "id": f"{metadata.get('contract_id')}_chunk_{chunk_index}",
-                "text": current_chunk.strip(),
-                "metadata": {
-                    **metadata,
-                    "chunk_index": chunk_index,
-                }
-            })
+            List of chunks with metadata, including start/end offsets,
+            section heading and page number where known
+        """
+        chunks = chunk_text(text, metadata, self.chunk_size, self.chunk_overlap)
         
         logger.info(f"Created {len(chunks)} chunks for contract {metadata.get('contract_id')}")
         return chunks
 
-    async def store_embeddings(self, contract_id: str, chunks: list[dict]) -> list[str]:
+    async def ingest_document(self, contract_id: str, text: str, metadata: dict) -> list[str]:
+        """
+        Normalize, store, chunk and embed a contract
+        
+        The normalized text is written to the text store once; chunk offsets
+        (and page_offsets) refer to that stored copy.
+        
+        Args:
+            contract_id: Contract identifier
+            text: Extracted contract text
+            metadata: Document metadata (organization_id, page_offsets, etc.)
+            
+        Returns:
+            List of stored vector IDs
+        """
+        text, metadata = prepare_document(text, metadata)
+        self._invalidate_answers(contract_id)
+        
+        if self.text_store is not None:
+            await asyncio.to_thread(self.text_store.put, contract_id, text)
+        
+        chunks = await self.chunk_document(text, {**metadata, "contract_id": contract_id})
+        vector_ids = await self.store_embeddings(contract_id, chunks)
+        # Again, for answers computed against the half-built index
+        self._invalidate_answers(contract_id)
+        return vector_ids
+
+    async def ingest_pages(
+        self,
+        contract_id: str,
+        pages: AsyncIterator[str],
+        metadata: dict
+    ) -> tuple[str, list[str]]:
+        """
+        Normalize, chunk and embed a contract as its pages are extracted
+        
+        Each arriving page is appended to the normalized text and chunking
+        resumes from the last open chunk (only text from that chunk's line
+        on is scanned again), so finished chunks are embedded while later
+        pages are still being parsed. The chunks match ingest_document on
+        the joined pages with page_offsets.
+        
+        Args:
+            contract_id: Contract identifier
+            pages: Page texts in page order
+            metadata: Document metadata (organization_id, etc.)
+            
+        Returns:
+            (normalized contract text, stored chunks) - chunk ids are the vector IDs
+        """
+        metadata = {**metadata, "contract_id": contract_id}
+        text, page_offsets = "", []
+        # Where the open (last) chunk starts, where its sentence scan starts and its section
+        resume, scan_from, section, next_index = 0, None, None, 0
+        embedding: list[asyncio.Task] = []
+        stored: list[dict] = []
+        inline_text = self.text_store is None
+        self._invalidate_answers(contract_id)
+        
+        def take_chunks(final: bool) -> list[dict]:
+            nonlocal resume, scan_from, section, next_index
+            chunks = chunk_text(
+                text, {**metadata, "page_offsets": page_offsets},
+                self.chunk_size, self.chunk_overlap, start=resume, first_index=next_index,
+                scan_from=scan_from, section=section,
+            )
+            if not final and chunks:
+                # The last chunk may still grow with the next page
+                if len(chunks) > 1:
+                    resume, scan_from = chunks[-1]["metadata"]["start"], chunks[-2]["metadata"]["end"]
+                    section = chunks[-1]["metadata"].get("section")
+                chunks = chunks[:-1]
+            next_index += len(chunks)
+            stored.extend(chunks)
+            return chunks
+        
+        try:
+            async for page in pages:
+                if page_offsets:
+                    text += "\n"
+                page_offsets.append(len(text))
+                text += normalize_text(page)
+                
+                chunks = take_chunks(final=False)
+                if chunks:
+                    embedding.append(asyncio.create_task(self.store_embeddings(contract_id, chunks, inline_text)))
+            
+            chunks = take_chunks(final=True)
+            if chunks:
+                embedding.append(asyncio.create_task(self.store_embeddings(contract_id, chunks, inline_text)))
+            
+            if self.text_store is not None:
+                await asyncio.to_thread(self.text_store.put, contract_id, text)
+            
+            batches = await asyncio.gather(*embedding)
+        except BaseException:
+            for task in embedding:
+                task.cancel()
+            raise
+        
+        self._invalidate_answers(contract_id)
+        logger.info(
+            f"Ingested {len(page_offsets)} pages of contract {contract_id} as "
+            f"{sum(len(batch) for batch in batches)} chunks"
+        )
+        return text, stored
+
+    async def store_embeddings(
+        self,
+        contract_id: str,
+        chunks: list[dict],
+        inline_text: Optional[bool] = None
+    ) -> list[str]:
         """
         Store chunks as embeddings in Pinecone
         
+        Chunk text goes into vector metadata only when the contract's text is
+        not in the text store; otherwise the start/end offsets reference it.
+        With a clause classifier, each embedded batch is labelled and the
+        chunks' metadata gains clause_category and clause_confidence.
+        Every chunk's metadata gets a text_hash; with a near-duplicate index,
+        chunks whose text was already embedded for the organization copy
+        that vector's values instead (and are marked chunk["reused"]).
+        
         Args:
             contract_id: Contract identifier
             chunks: Chunks with text and metadata
+            inline_text: Force text into (True) or out of (False) vector
+                metadata; by default decided by the text store contents
             
         Returns:
             List of stored vector IDs
         """
         vector_ids = []
+        if inline_text is None:
+            inline_text = self.text_store is None or not self.text_store.has(contract_id)
+        if self.clause_classifier is not None:
+            await self.clause_classifier.prepare(self.llm_service.embed_texts)
         
-        for chunk in chunks:
+        for batch_start in range(0, len(chunks), self.embed_batch_size):
+            batch = chunks[batch_start:batch_start + self.embed_batch_size]
+            for chunk in batch:
+                chunk["metadata"]["text_hash"] = chunk_fingerprint(chunk["text"])
+            reused = await self._reused_embeddings(batch) if self.near_duplicates is not None else {}
+            missing = [chunk for chunk in batch if chunk["id"] not in reused]
             try:
-                # Generate embedding
-                embedding = await self.llm_service.embed_text(chunk["text"])
-                
-                # Store in Pinecone
-                vector_id = await self.vector_service.upsert(
-                    vector_id=chunk["id"],
-                    values=embedding,
-                    metadata=chunk["metadata"]
+                # Generate embeddings (one request per batch, only for text not embedded before)
+                computed = iter(
+                    await self.llm_service.embed_texts([chunk["text"] for chunk in missing]) if missing else []
                 )
-                vector_ids.append(vector_id)
-                
             except Exception as e:
-                logger.error(f"Failed to embed chunk {chunk['id']}: {str(e)}")
+                logger.error(f"Failed to embed chunks {batch[0]['id']}..{batch[-1]['id']}: {str(e)}")
                 raise
+            embeddings = [reused[chunk["id"]] if chunk["id"] in reused else next(computed) for chunk in batch]
+            _EMBEDDINGS_REUSED.inc(len(reused))
+            _EMBEDDINGS_COMPUTED.inc(len(missing))
+            
+            if self.clause_classifier is not None:
+                # Labelled from the embeddings just computed: filterable without an LLM call
+                labels = self.clause_classifier.classify(
+                    [chunk["text"] for chunk in batch],
+                    embeddings,
+                    [chunk["metadata"].get("section") for chunk in batch],
+                    organization_id=batch[0]["metadata"].get("organization_id"),
+                )
+                for chunk, label in zip(batch, labels):
+                    chunk["metadata"]["clause_category"] = label.category.value
+                    chunk["metadata"]["clause_confidence"] = round(label.confidence, 3)
+            
+            for chunk, embedding in zip(batch, embeddings):
+                try:
+                    # Store in Pinecone
+                    metadata = chunk["metadata"]
+                    if inline_text:
+                        metadata = {**metadata, "text": chunk["text"]}
+                    vector_id = await self.vector_service.upsert(
+                        vector_id=chunk["id"],
+                        values=embedding,
+                        metadata=metadata
+                    )
+                    vector_ids.append(vector_id)
+                    
+                except Exception as e:
+                    logger.error(f"Failed to store chunk {chunk['id']}: {str(e)}")
+                    raise
+            
+            organization_id = batch[0]["metadata"].get("organization_id")
+            if self.near_duplicates is not None and organization_id:
+                self.near_duplicates.add_chunks(
+                    organization_id, contract_id,
+                    [(chunk["metadata"]["text_hash"], chunk["id"]) for chunk in batch],
+                )
         
         logger.info(f"Stored {len(vector_ids)} embeddings for contract {contract_id}")
         return vector_ids
 
+    async def _reused_embeddings(self, batch: list[dict]) -> dict[str, list]:
+        """
+        Embeddings of earlier chunks with the same text, by chunk ID
+        
+        A donor vector is used only while its stored text_hash still
+        matches (it may have been re-indexed or deleted since).
+        """
+        organization_id = batch[0]["metadata"].get("organization_id")
+        if not organization_id:
+            return {}
+        fingerprints = [chunk["metadata"]["text_hash"] for chunk in batch]
+        donors = self.near_duplicates.chunk_donors(organization_id, fingerprints)
+        by_contract: dict[str, list[str]] = {}
+        for donor in donors:
+            if donor is not None:
+                by_contract.setdefault(donor[0], []).append(donor[1])
+        
+        stored = {}
+        for donor_contract, vector_ids in by_contract.items():
+            stored.update(await self.vector_service.fetch(vector_ids, contract_id=donor_contract))
+        
+        reused = {}
+        for chunk, fingerprint, donor in zip(batch, fingerprints, donors):
+            vector = stored.get(donor[1]) if donor else None
+            if vector is not None and vector.values is not None and vector.metadata.get("text_hash") == fingerprint:
+                reused[chunk["id"]] = vector.values
+                chunk["reused"] = True
+        return reused
+
+    async def extract_clauses(self, chunks: list[dict], text: Optional[str] = None) -> list[dict]:
+        """
+        Key clauses of an ingested contract, asking the LLM only about uncertain chunks
+        
+        Chunks the classifier labelled confidently become clauses directly
+        (boilerplate labelled "other" is dropped); the remaining chunks'
+        text is sent to LLMService.extract_clauses. Without a classifier
+        the whole text goes to the LLM as before.
+        
+        Args:
+            chunks: Chunks as returned by ingest_pages (labelled metadata)
+            text: Full contract text (used when there is no classifier)
+            
+        Returns:
+            Clauses in the LLMService.extract_clauses format, plus source
+            ("classifier" or "llm") and, for local labels, confidence
+        """
+        if self.clause_classifier is None:
+            _CLAUSES_LLM.inc(len(chunks))
+            clauses = await self.llm_service.extract_clauses(text or "\n".join(chunk["text"] for chunk in chunks))
+            return [{**clause, "source": "llm"} for clause in clauses]
+        
+        threshold = self.clause_classifier.min_confidence
+        confident = [chunk for chunk in chunks if chunk["metadata"].get("clause_confidence", 0.0) >= threshold]
+        uncertain = [chunk for chunk in chunks if chunk["metadata"].get("clause_confidence", 0.0) < threshold]
+        _CLAUSES_LOCAL.inc(len(confident))
+        _CLAUSES_LLM.inc(len(uncertain))
+        
+        clauses = [
+            {
+                "category": chunk["metadata"]["clause_category"],
+                "quote": " ".join(chunk["text"].split()[:100]),
+                "explanation": "",
+                "risk_level": None,
+                "implications": "",
+                "section": chunk["metadata"].get("section"),
+                "page_number": chunk["metadata"].get("page_number"),
+                "confidence": chunk["metadata"]["clause_confidence"],
+                "source": "classifier",
+            }
+            for chunk in confident
+            if chunk["metadata"]["clause_category"] != ClauseCategory.OTHER.value
+        ]
+        if uncertain:
+            llm_clauses = await self.llm_service.extract_clauses("\n\n".join(chunk["text"] for chunk in uncertain))
+            clauses.extend({**clause, "source": "llm"} for clause in llm_clauses)
+        
+        logger.info(
+            f"Clauses: {len(confident)} chunks labelled locally, {len(uncertain)} sent to the LLM"
+        )
+        return clauses
+
     async def retrieve_context(self, context: RetrievalContext) -> list[dict]:
         """
         Retrieve relevant chunks from Pinecone for a query
         
         RAG Retrieval Strategy:
         1. Embed user query
-        2. Search Pinecone with similarity threshold
-        3. Re-rank results by relevance
+        2. Search Pinecone with similarity threshold (over-fetching when reranking)
+        3. Re-rank candidates with MMR so overlapping neighbours don't crowd out distinct clauses
         4. Return top-k with metadata
         
         Args:
@@ -170,68 +670,365 @@ class RAGService:
             List of relevant chunks with scores
         """
         # Embed the query
-        query_embedding = await self.llm_service.embed_text(context.query)
+        query_embedding = context.embedding
+        if query_embedding is None:
+            query_embedding = await self.llm_service.embed_text(context.query)
         
         # Search Pinecone
+        fetch_k = context.top_k
+        if context.rerank:
+            fetch_k = max(context.fetch_k or 4 * context.top_k, context.top_k)
+        
         results = await self.vector_service.search(
             vector=query_embedding,
-            top_k=context.top_k,
+            top_k=fetch_k,
             filters=context.filters,
-            threshold=context.threshold
+            threshold=context.threshold,
+            include_values=context.rerank
         )
         
-        # Format results with metadata
-        retrieved = [
-            {
-                "text": result["metadata"].get("text"),
-                "relevance_score": result["score"],
-                "metadata": result["metadata"],
-                "source_chunk": result["id"]
-            }
-            for result in results
-        ]
+        if context.rerank:
+            results = self._rerank(query_embedding, results, context)
+        else:
+            results = results[:context.top_k]
+        
+        # Format results with metadata, reading text only for the final top-k
+        retrieved = [self._format_result(result) for result in results]
+        self._hydrate(retrieved)
         
         logger.debug(f"Retrieved {len(retrieved)} relevant chunks for query: {context.query[:50]}...")
         return retrieved
 
-    async def augment_llm_prompt(self, question: str, contract_id: str, context_limit: int = 3) -> str:
+    def _rerank(self, query_embedding: list[float], results: list, context: RetrievalContext) -> list:
+        """
+        Diversify over-fetched candidates with MMR
+        
+        Args:
+            query_embedding: Query vector
+            results: Candidate search results (with values)
+            context: Retrieval parameters
+            
+        Returns:
+            Up to top_k results in MMR selection order
+        """
+        if len(results) <= 1 or any(result.values is None for result in results):
+            return results[:context.top_k]
+        
+        started = time.perf_counter()
+        boosts = None
+        if context.lexical_weight:
+            candidates = [self._format_result(result) for result in results]
+            self._hydrate(candidates)
+            texts = [candidate["text"] for candidate in candidates]
+            boosts = context.lexical_weight * lexical_overlap(context.query, texts)
+        
+        order = maximal_marginal_relevance(
+            query_embedding,
+            [result.values for result in results],
+            k=context.top_k,
+            lambda_mult=context.mmr_lambda,
+            boosts=boosts,
+        )
+        
+        logger.debug(
+            f"MMR reranked {len(results)} candidates to {len(order)} "
+            f"in {(time.perf_counter() - started) * 1000:.2f}ms"
+        )
+        return [results[i] for i in order]
+
+    async def augment_llm_prompt(
+        self,
+        question: str,
+        contract_id: str,
+        context_limit: int = 3,
+        token_budget: Optional[int] = None
+    ) -> str:
         """
         Create an augmented prompt for LLM using retrieved context
         
+        Retrieved chunks are merged by offset (dropping the text neighbouring
+        chunks share) and packed into a token budget by relevance, each span
+        citing its section and page.
+        
         Args:
             question: User question
             contract_id: Contract to search
-            context_limit: Max context chunks
+            context_limit: Chunks to retrieve when no explicit budget is given
+            token_budget: Context token budget; when set, extra candidates are
+                retrieved so leftover budget can be used
             
         Returns:
             Augmented prompt with context
         """
-        # Retrieve relevant context
+        spans, _ = await self._packed_context(question, contract_id, context_limit, token_budget)
+        context_text = self.context_packer.render(spans)
+        
+        augmented_prompt = f"""You are a legal AI assistant specializing in contract analysis.
+
+CONTEXT FROM CONTRACT:
+{context_text}
+
+QUESTION:
+{question}
+
+Provide a clear, professional answer based on the context above. If the information is not in the context, say so. Cite the source section and page you relied on."""
+        
+        return augmented_prompt
+
+    async def answer_question(
+        self,
+        question: str,
+        contract_id: str,
+        context_limit: int = 3,
+        token_budget: Optional[int] = None
+    ) -> dict:
+        """
+        Answer a question about one contract (the /clarify chat path)
+        
+        Under a request deadline, retrieval leaves the recent p95 completion
+        latency (answer_reserve_seconds before any were seen) for generation,
+        and falls back to fewer chunks when time is short.
+        
+        With an answer cache, the question is embedded first and an answer
+        to a similar earlier question about the same contract is returned
+        without retrieval or a GPT call.
+        
+        Args:
+            question: User question
+            contract_id: Contract to search
+            context_limit: Chunks to retrieve when no explicit budget is given
+            token_budget: Context token budget
+            
+        Returns:
+            Dict with the answer, the citations of the context it was given,
+            whether retrieval was degraded to meet the deadline, and whether
+            the answer came from the cache
+        """
+        reserve = latency_window("llm.completion").estimate() or self.answer_reserve_seconds
+        cache = self.answer_cache
+        embedding = generation = None
+        if cache is not None:
+            try:
+                with deadline(self._retrieval_budget(reserve)):
+                    embedding = await self.llm_service.embed_text(question)
+            except DeadlineExceeded:
+                logger.warning(f"No time to embed question for contract {contract_id}; skipping answer cache")
+        if embedding is not None:
+            cached = cache.lookup(contract_id, embedding)
+            if cached is not None:
+                if cache.should_sample():
+                    self._check_cached_answer(question, contract_id, cached, context_limit, token_budget)
+                return {**cached.answer, "cached": True}
+            generation = cache.generation(contract_id)
+        
+        spans, degraded = await self._packed_context(
+            question, contract_id, context_limit, token_budget, reserve=reserve, query_embedding=embedding
+        )
+        answer = await self.llm_service.answer_question(question, self.context_packer.render(spans))
+        result = {
+            "answer": answer,
+            "citations": [span.citation for span in spans],
+            "degraded": degraded,
+        }
+        if embedding is not None and not degraded:
+            cache.store(contract_id, question, embedding, result, generation)
+        return {**result, "cached": False}
+
+    async def _packed_context(
+        self,
+        question: str,
+        contract_id: str,
+        context_limit: int,
+        token_budget: Optional[int],
+        reserve: float = 0.0,
+        query_embedding: Optional[list] = None
+    ) -> tuple[list[PackedSpan], bool]:
+        """
+        Retrieve a contract's chunks for a question and pack them into the budget
+        
+        Args:
+            reserve: Seconds of the request deadline to leave for the caller
+            query_embedding: The question's embedding, if already computed
+            
+        Returns:
+            (spans, degraded) - degraded when fewer chunks were used to meet the deadline
+        """
+        top_k = context_limit if token_budget is None else max(context_limit, self.packing_candidates)
+        rerank, degraded = True, False
+        retrieval_budget = self._retrieval_budget(reserve)
+        if retrieval_budget is not None and retrieval_budget < self.degraded_retrieval_seconds:
+            # Short on time: fewer chunks, no over-fetch, and a shorter prompt to answer from
+            top_k, rerank, degraded = min(top_k, self.degraded_context_limit), False, True
+            _DEGRADED_SHORT.inc()
         retrieval = RetrievalContext(
             query=question,
-            top_k=context_limit,
-            filters={"contract_id": contract_id}
+            top_k=top_k,
+            filters={"contract_id": contract_id},
+            rerank=rerank,
+            embedding=query_embedding
         )
         
-        retrieved_chunks = await self.retrieve_context(retrieval)
+        try:
+            with deadline(retrieval_budget):
+                retrieved_chunks = await self.retrieve_context(retrieval)
+        except DeadlineExceeded:
+            logger.warning(f"Retrieval for contract {contract_id} ran out of time; answering without context")
+            _DEGRADED_TIMEOUT.inc()
+            retrieved_chunks, degraded = [], True
+        return self.context_packer.pack(retrieved_chunks, token_budget=token_budget), degraded
+
+    @staticmethod
+    def _retrieval_budget(reserve: float) -> Optional[float]:
+        """Seconds of the request deadline left for retrieval (None when unbounded)"""
+        left = remaining()
+        return None if left is None else left - reserve
+
+    def _check_cached_answer(
+        self,
+        question: str,
+        contract_id: str,
+        cached,
+        context_limit: int,
+        token_budget: Optional[int]
+    ) -> None:
+        """Re-run retrieval for a sampled cache hit in the background and compare citations"""
+        async def check() -> None:
+            try:
+                spans, _ = await self._packed_context(question, contract_id, context_limit, token_budget)
+                fresh = {"citations": [span.citation for span in spans]}
+                self.answer_cache.record_sample(contract_id, question, cached, fresh)
+            except Exception as e:
+                logger.error(f"Answer cache sample check failed for contract {contract_id}: {str(e)}")
+        
+        # A fresh context: the check must not inherit (or be cut off by) the request's deadline
+        task = asyncio.create_task(check(), context=contextvars.Context())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _invalidate_answers(self, contract_id: str) -> None:
+        if self.answer_cache is not None:
+            self.answer_cache.invalidate(contract_id)
+
+    async def stream_portfolio(
+        self,
+        question: str,
+        organization_id: str,
+        per_contract_limit: int = 3,
+        contract_limit: int = 10,
+        threshold: float = 0.7
+    ) -> AsyncIterator[ContractHits]:
+        """
+        Search every contract of an organization, streaming hits per contract
         
-        # Build augmented prompt
-        context_text = "\n\n".join([
-            f"[Chunk {i+1}]\n{chunk['text']}"
-            for i, chunk in enumerate(retrieved_chunks)
-        ])
+        The query is embedded once and fanned out to the organization's
+        index partitions concurrently. A contract's chunks live in a single partition, so each
+        contract's group is complete as soon as its partition answers and is
+        yielded immediately. Partitions group their matches by contract, so
+        a contract with many matching chunks cannot crowd out the others.
         
-        augmented_prompt = f"""You are a legal AI assistant specializing in contract analysis.
+        Args:
+            question: User question
+            organization_id: Organization whose contracts are searched
+            per_contract_limit: Max chunks kept per contract
+            contract_limit: Max contracts a single partition contributes (its
+                best ones, up to this many where that many match)
+            threshold: Minimum similarity score
+            
+        Yields:
+            ContractHits per contract, in partition completion order
+        """
+        query_embedding = await self.llm_service.embed_text(question)
+        
+        async for partition, results in self.vector_service.search_partitions(
+            vector=query_embedding,
+            top_k=contract_limit,
+            filters={"organization_id": organization_id},
+            threshold=threshold,
+            per_contract=per_contract_limit
+        ):
+            grouped: dict[str, ContractHits] = {}
+            for result in results:
+                contract_id = result.metadata.get("contract_id")
+                grouped.setdefault(contract_id, ContractHits(contract_id=contract_id)).chunks.append(
+                    self._format_result(result)
+                )
+            
+            logger.debug(f"Partition {partition} returned {len(grouped)} contracts for {organization_id}")
+            for hits in sorted(grouped.values(), key=lambda hits: hits.best_score, reverse=True):
+                self._hydrate(hits.chunks)
+                yield hits
 
-CONTEXT FROM CONTRACT:
+    async def retrieve_portfolio(
+        self,
+        question: str,
+        organization_id: str,
+        per_contract_limit: int = 3,
+        contract_limit: int = 10,
+        threshold: float = 0.7
+    ) -> list[ContractHits]:
+        """
+        Global top contracts for a portfolio-wide question
+        
+        Args:
+            question: User question
+            organization_id: Organization whose contracts are searched
+            per_contract_limit: Max chunks kept per contract
+            contract_limit: Contracts to return
+            threshold: Minimum similarity score
+            
+        Returns:
+            Contracts ordered by their best chunk's relevance
+        """
+        collected = [
+            hits
+            async for hits in self.stream_portfolio(
+                question, organization_id, per_contract_limit, contract_limit, threshold
+            )
+        ]
+        collected.sort(key=lambda hits: hits.best_score, reverse=True)
+        return collected[:contract_limit]
+
+    async def augment_portfolio_prompt(
+        self,
+        question: str,
+        organization_id: str,
+        per_contract_limit: int = 2,
+        contract_limit: int = 10,
+        token_budget: Optional[int] = None
+    ) -> str:
+        """
+        Create an augmented prompt spanning an organization's contracts
+        
+        Args:
+            question: Portfolio question (e.g. "which vendor contracts auto-renew in Q1?")
+            organization_id: Organization whose contracts are searched
+            per_contract_limit: Max chunks per contract
+            contract_limit: Max contracts in the context
+            token_budget: Context token budget (defaults to the packer's)
+            
+        Returns:
+            Augmented prompt with per-contract context
+        """
+        portfolio = await self.retrieve_portfolio(question, organization_id, per_contract_limit, contract_limit)
+        
+        spans = self.context_packer.pack(
+            [chunk for hits in portfolio for chunk in hits.chunks],
+            token_budget=token_budget
+        )
+        context_text = "\n\n".join(
+            f"[Contract {span.contract_id} | {span.citation}]\n{span.text.strip()}"
+            for span in spans
+        )
+        
+        return f"""You are a legal AI assistant specializing in contract portfolio analysis.
+
+CONTEXT FROM {len(portfolio)} CONTRACTS:
 {context_text}
 
 QUESTION:
 {question}
 
-Provide a clear, professional answer based on the context above. If the information is not in the context, say so."""
-        
-        return augmented_prompt
+Answer across all contracts above, naming each contract you rely on with its section and page. If the information is not in the context, say so."""
 
     async def cleanup_contract(self, contract_id: str) -> bool:
         """
@@ -247,27 +1044,35 @@ Provide a clear, professional answer based on the context above. If the informat
             await self.vector_service.delete_by_metadata({
                 "contract_id": contract_id
             })
+            self._invalidate_answers(contract_id)
+            if self.near_duplicates is not None:
+                self.near_duplicates.remove(contract_id)
+            if self.text_store is not None:
+                await asyncio.to_thread(self.text_store.delete, contract_id)
             logger.info(f"Cleaned up embeddings for contract {contract_id}")
             return True
         except Exception as e:
             logger.error(f"Failed to cleanup contract {contract_id}: {str(e)}")
             return False
 
+    def _hydrate(self, chunks: list[dict]) -> None:
+        """Fill in chunk text from the text store by (contract_id, start, end)"""
+        if self.text_store is None:
+            return
+        for chunk in chunks:
+            metadata = chunk["metadata"]
+            if chunk["text"] is None and metadata.get("start") is not None:
+                chunk["text"] = self.text_store.get(metadata.get("contract_id"), metadata["start"], metadata["end"])
+
     @staticmethod
-    def _split_sentences(text: str) -> list[str]:
-        """
-        Simple sentence splitter (in production, use spaCy)
-        
-        Args:
-            text: Text to split
-            
-        Returns:
-            List of sentences
-        """
-        import re
-        # Simple regex-based sentence splitting
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        return [s.strip() for s in sentences if s.strip()]
+    def _format_result(result) -> dict:
+        """Shape a VectorSearchResult as a retrieved chunk"""
+        return {
+            "text": result.text or result.metadata.get("text"),
+            "relevance_score": result.score,
+            "metadata": result.metadata,
+            "source_chunk": result.id
+        }
 
 
 # Prompt Templates for RAG-based Analysis
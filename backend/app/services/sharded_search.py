@@ -0,0 +1,147 @@
+"""
+Sharded Search - Scatter-gather scoring of large vector partitions
+A partition's rows are split into contiguous shards scored in parallel by a
+thread pool; the per-shard top-k lists are merged into the global top-k
+"""
+
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional
+import heapq
+import itertools
+import logging
+import os
+
+from app.metrics import REGISTRY
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_SHARDED_QUERIES = REGISTRY.counter("contractguard_sharded_queries_total", "Vector queries scored in shards")
+
+
+def top_k_rows(
+    matrix: "np.ndarray",
+    start: int,
+    end: int,
+    query: "np.ndarray",
+    k: int,
+    mask: Optional["np.ndarray"] = None
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    Best k rows of matrix[start:end] by dot product with query
+
+    The slice is a view, so workers share the matrix rather than copying it.
+
+    Args:
+        matrix: Normalised row vectors
+        start: First row
+        end: Row after the last
+        query: Normalised query vector
+        k: Rows wanted
+        mask: Rows allowed, over the whole matrix (None allows all)
+
+    Returns:
+        (positions, scores), best first; rows excluded by the mask are left out
+    """
+    import numpy as np
+
+    scores = matrix[start:end] @ query
+    if mask is not None:
+        scores = np.where(mask[start:end], scores, -np.inf)
+    k = min(k, end - start)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    top = top[np.isfinite(scores[top])]
+    return top + start, scores[top]
+
+
+class ShardedScorer:
+    """
+    Scatter-gather top-k over one matrix
+
+    - Scatter: rows [0, count) are cut into up to `workers` shards of at
+      least shard_rows rows each; every shard is a view of the same
+      matrix, so no worker holds a copy of the vectors
+    - Score: each shard's matrix product and partial sort run in a pool
+      thread; NumPy releases the GIL for both, so shards use separate cores
+    - Gather: the shards' sorted top-k lists are heap-merged into the
+      global top-k
+    The pool is sized to the cores and shared by all concurrent queries,
+    so heavy traffic queues for cores instead of oversubscribing them.
+    Partitions below two shards are scored inline, as before.
+    """
+
+    def __init__(self, workers: Optional[int] = None, shard_rows: int = 4096, executor: Optional[Executor] = None):
+        """
+        Initialize scorer
+
+        Args:
+            workers: Shards per query and pool threads (default: all cores)
+            shard_rows: Fewest rows worth a shard of their own
+            executor: Executor to use instead of a private thread pool
+        """
+        self.workers = max(workers or os.cpu_count() or 1, 1)
+        self.shard_rows = max(shard_rows, 1)
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    @property
+    def executor(self) -> Executor:
+        # Created on the first sharded query so small deployments never start threads
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="vector-shard")
+        return self._executor
+
+    def shards(self, count: int) -> list[tuple[int, int]]:
+        """Row ranges a count-row matrix is split into"""
+        shard_count = min(self.workers, count // self.shard_rows) or 1
+        bounds = [count * shard // shard_count for shard in range(shard_count + 1)]
+        return list(zip(bounds, bounds[1:]))
+
+    def top_k(
+        self,
+        matrix: "np.ndarray",
+        count: int,
+        query: "np.ndarray",
+        k: int,
+        mask: Optional["np.ndarray"] = None
+    ) -> tuple["np.ndarray", "np.ndarray"]:
+        """
+        Best k of the first count rows, scoring shards in parallel
+
+        Returns:
+            (positions, scores), best first
+        """
+        shards = self.shards(count)
+        if len(shards) == 1:
+            return top_k_rows(matrix, 0, count, query, k, mask)
+
+        import numpy as np
+
+        _SHARDED_QUERIES.inc()
+        futures = [self.executor.submit(top_k_rows, matrix, start, end, query, k, mask) for start, end in shards]
+        parts = [future.result() for future in futures]
+        merged = list(itertools.islice(
+            heapq.merge(
+                *(zip(scores.tolist(), positions.tolist()) for positions, scores in parts),
+                key=lambda item: item[0],
+                reverse=True,
+            ),
+            k,
+        ))
+        return (
+            np.fromiter((position for _, position in merged), dtype=np.intp, count=len(merged)),
+            np.fromiter((score for score, _ in merged), dtype=np.float32, count=len(merged)),
+        )
+
+    def stats(self) -> dict:
+        return {"workers": self.workers, "shard_rows": self.shard_rows, "started": self._executor is not None}
+
+    def close(self) -> None:
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,246 @@
+"""
+Document Storage - Original contract files on local disk or S3-compatible object storage
+Uploads are streamed chunk by chunk (hashed on the way) and never held whole in memory
+"""
+
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StoredDocument:
+    """An uploaded file as written to storage"""
+    key: str
+    size: int
+    sha256: str
+    content_type: Optional[str] = None
+
+
+class UploadTooLarge(ValueError):
+    """Upload exceeded the configured size limit"""
+
+
+class _Digest:
+    """Running size and SHA-256 of a stream, enforcing a size limit"""
+
+    def __init__(self, max_bytes: Optional[int]):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._hash = hashlib.sha256()
+
+    def update(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            raise UploadTooLarge(f"Upload exceeds {self.max_bytes} bytes")
+        self._hash.update(chunk)
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+class LocalDocumentStorage:
+    """Files under a local directory (development, single instance)"""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    async def save(
+        self,
+        key: str,
+        chunks: AsyncIterator[bytes],
+        content_type: Optional[str] = None,
+        max_bytes: Optional[int] = None
+    ) -> StoredDocument:
+        """
+        Stream chunks to a file, atomically replacing any existing one
+
+        Args:
+            key: Storage key (relative path)
+            chunks: File content
+            content_type: MIME type reported by the client
+            max_bytes: Size limit; exceeding it discards the partial file
+
+        Returns:
+            Stored document with size and SHA-256
+        """
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.part"
+        digest = _Digest(max_bytes)
+
+        handle = await asyncio.to_thread(open, temp_path, "wb")
+        try:
+            async for chunk in chunks:
+                digest.update(chunk)
+                await asyncio.to_thread(handle.write, chunk)
+            await asyncio.to_thread(handle.close)
+            os.replace(temp_path, path)
+        except BaseException:
+            handle.close()
+            os.remove(temp_path)
+            self._prune(path)
+            raise
+
+        logger.info(f"Stored upload {key} ({digest.size} bytes)")
+        return StoredDocument(key=key, size=digest.size, sha256=digest.hexdigest(), content_type=content_type)
+
+    @asynccontextmanager
+    async def local_copy(self, key: str) -> AsyncIterator[str]:
+        """Path of the stored file (already local)"""
+        yield self.path(key)
+
+    async def delete(self, key: str) -> bool:
+        path = self.path(key)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return False
+        self._prune(path)
+        return True
+
+    def _prune(self, path: str) -> None:
+        """Remove directories left empty under root"""
+        root = os.path.normpath(self.root)
+        directory = os.path.dirname(path)
+        while directory != root:
+            try:
+                os.rmdir(directory)
+            except OSError:
+                return
+            directory = os.path.dirname(directory)
+
+    def path(self, key: str) -> str:
+        path = os.path.normpath(os.path.join(self.root, key))
+        if not path.startswith(os.path.normpath(self.root) + os.sep):
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+
+class S3DocumentStorage:
+    """
+    Objects in an S3 (or S3-compatible, e.g. MinIO) bucket
+
+    Uploads use multipart upload: chunks are buffered only up to one part
+    (part_size bytes) before being sent, so memory use is bounded per upload.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        part_size: int = 8 * 1024 * 1024,
+        client=None
+    ):
+        """
+        Initialize S3 storage
+
+        Args:
+            bucket: Bucket name
+            prefix: Key prefix for every object
+            endpoint_url: Custom endpoint for S3-compatible stores
+            part_size: Multipart part size (S3 minimum is 5 MiB)
+            client: boto3 S3 client (created on first use when omitted)
+        """
+        self.bucket = bucket
+        self.prefix = prefix
+        self.endpoint_url = endpoint_url
+        self.part_size = max(part_size, 5 * 1024 * 1024)
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            import boto3
+            self._client = boto3.client("s3", endpoint_url=self.endpoint_url or None)
+        return self._client
+
+    async def save(
+        self,
+        key: str,
+        chunks: AsyncIterator[bytes],
+        content_type: Optional[str] = None,
+        max_bytes: Optional[int] = None
+    ) -> StoredDocument:
+        """
+        Stream chunks to an object via multipart upload
+
+        Args:
+            key: Object key (prefix is added)
+            chunks: File content
+            content_type: MIME type stored on the object
+            max_bytes: Size limit; exceeding it aborts the upload
+
+        Returns:
+            Stored document with size and SHA-256
+        """
+        object_key = f"{self.prefix}{key}"
+        extra = {"ContentType": content_type} if content_type else {}
+        upload = await asyncio.to_thread(
+            self.client.create_multipart_upload, Bucket=self.bucket, Key=object_key, **extra
+        )
+        upload_id = upload["UploadId"]
+        digest = _Digest(max_bytes)
+        parts: list[dict] = []
+        buffer = bytearray()
+
+        async def send_part() -> None:
+            number = len(parts) + 1
+            response = await asyncio.to_thread(
+                self.client.upload_part, Bucket=self.bucket, Key=object_key,
+                UploadId=upload_id, PartNumber=number, Body=bytes(buffer)
+            )
+            parts.append({"ETag": response["ETag"], "PartNumber": number})
+            buffer.clear()
+
+        try:
+            async for chunk in chunks:
+                digest.update(chunk)
+                buffer.extend(chunk)
+                if len(buffer) >= self.part_size:
+                    await send_part()
+            if buffer or not parts:
+                await send_part()
+            await asyncio.to_thread(
+                self.client.complete_multipart_upload, Bucket=self.bucket, Key=object_key,
+                UploadId=upload_id, MultipartUpload={"Parts": parts}
+            )
+        except BaseException:
+            await asyncio.to_thread(
+                self.client.abort_multipart_upload, Bucket=self.bucket, Key=object_key, UploadId=upload_id
+            )
+            raise
+
+        logger.info(f"Stored upload s3://{self.bucket}/{object_key} ({digest.size} bytes, {len(parts)} parts)")
+        return StoredDocument(key=key, size=digest.size, sha256=digest.hexdigest(), content_type=content_type)
+
+    @asynccontextmanager
+    async def local_copy(self, key: str) -> AsyncIterator[str]:
+        """Download the object to a temporary file for page-level parsing"""
+        handle, path = tempfile.mkstemp(prefix="contractguard-", suffix=os.path.splitext(key)[1])
+        os.close(handle)
+        try:
+            await asyncio.to_thread(self.client.download_file, self.bucket, f"{self.prefix}{key}", path)
+            yield path
+        finally:
+            os.remove(path)
+
+    async def delete(self, key: str) -> bool:
+        try:
+            await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=f"{self.prefix}{key}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete s3://{self.bucket}/{self.prefix}{key}: {str(e)}")
+            return False
+
+
+DocumentStorage = LocalDocumentStorage | S3DocumentStorage
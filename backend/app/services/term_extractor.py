@@ -0,0 +1,364 @@
+"""
+Term Extractor - Deterministic contract dates and renewal terms
+One precompiled pattern finds effective/expiry dates, term lengths, automatic
+renewal and notice periods in a single pass; relative deadlines are resolved
+against today's date
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Optional
+import calendar
+import re
+
+_NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8,
+    "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "fifteen": 15, "eighteen": 18, "twenty": 20,
+    "twenty-four": 24, "thirty": 30, "thirty-six": 36, "forty-five": 45, "sixty": 60, "ninety": 90,
+    "one hundred twenty": 120, "one hundred eighty": 180,
+}
+_MONTHS = {name.lower(): i for i, name in enumerate(calendar.month_name) if name}
+_MONTHS.update({name.lower(): i for i, name in enumerate(calendar.month_abbr) if name})
+
+_NUMBER = (
+    r"(?:\d{1,3}|" + "|".join(sorted((re.escape(word) for word in _NUMBER_WORDS), key=len, reverse=True)) + r")"
+    r"(?:\s*\(\d{1,3}\))?"
+)
+_MONTH_NAME = r"(?:" + "|".join(sorted(_MONTHS, key=len, reverse=True)) + r")\.?"
+_DATE = (
+    r"(?:\d{4}-\d{1,2}-\d{1,2}"
+    r"|\d{1,2}/\d{1,2}/\d{4}"
+    rf"|{_MONTH_NAME}\s+\d{{1,2}}(?:st|nd|rd|th)?,?\s+\d{{4}}"
+    rf"|\d{{1,2}}(?:st|nd|rd|th)?\s+(?:day\s+of\s+)?{_MONTH_NAME},?\s+\d{{4}})"
+)
+_UNIT = r"(?:business\s+)?(?:day|month|year)s?"
+
+# Rule name -> pattern; {n}, {unit} and {date} become rule-specific named groups
+_RULES = {
+    "effective": r"(?:commenc\w*|effective|begin\w*|start\w*)(?:\s+(?:as\s+of|on|from))?\s+{date}",
+    "expiry": r"(?:expir\w*|end\w*|continu\w*\s+until|through)\s+(?:on\s+)?{date}",
+    "initial_term": r"(?:initial|original)\s+term\s+of\s+{n}\s*[- ]?{unit}|for\s+a\s+(?:term|period)\s+of\s+{n}\s*[- ]?{unit}",
+    "auto_renew": (
+        r"(?:automatic(?:ally)?\s+(?:be\s+)?renew\w*|renew\w*\s+automatically|auto-renew\w*)"
+        r"(?:\s+for\s+(?:an?\s+)?(?:successive|additional|consecutive|subsequent|further)?\s*"
+        r"(?:(?:renewal\s+)?(?:periods?|terms?)\s+of\s+)?(?:{n}\s*[- ]?{unit})?)?"
+    ),
+    "notice": (
+        r"{n}\s*{unit}(?:'|’)?\s+(?:(?:prior\s+)?(?:written\s+)?notice\s+)?"
+        r"(?:prior\s+to|before|in\s+advance\s+of)\s+(?:the\s+)?(?:end|expiration|expiry|renewal|termination)"
+    ),
+    "convenience": (
+        r"terminat\w*\s+(?:this\s+agreement\s+)?for\s+convenience\s+(?:on|upon|with|by\s+giving)\s+"
+        r"(?:at\s+least\s+)?{n}\s*{unit}"
+    ),
+    "payment": r"(?:pa(?:y|id|yable)|due)\s+[^.]{{0,40}}?within\s+{n}\s*{unit}",
+    "date": r"{date}",
+}
+
+
+def _compile_rules() -> re.Pattern:
+    alternatives = []
+    for rule, template in _RULES.items():
+        counter = {"n": 0, "unit": 0}
+
+        def group(kind: str, body: str) -> str:
+            counter[kind] = counter.get(kind, 0) + 1
+            return f"(?P<{rule}__{kind}{counter[kind]}>{body})"
+
+        pattern = template.replace("{{", "\x00").replace("}}", "\x01")
+        for kind, body in (("n", _NUMBER), ("unit", _UNIT), ("date", _DATE)):
+            while "{" + kind + "}" in pattern:
+                pattern = pattern.replace("{" + kind + "}", group(kind, body), 1)
+        pattern = pattern.replace("\x00", "{").replace("\x01", "}")
+        alternatives.append(f"(?P<{rule}>{pattern})")
+    return re.compile(r"\b(?:" + "|".join(alternatives) + r")", re.IGNORECASE)
+
+
+_PATTERN = _compile_rules()
+
+
+@dataclass
+class KeyDate:
+    """A dated event in a contract (types match the frontend's DateType)"""
+    type: str  # renewal, termination, notice_required, payment_due, audit, other
+    date: date
+    description: str
+    priority: str = "medium"  # low, medium, high
+
+    def to_dict(self, today: Optional[date] = None) -> dict:
+        return {
+            "type": self.type,
+            "date": self.date.isoformat(),
+            "description": self.description,
+            "priority": self.priority,
+            "days_until": (self.date - (today or date.today())).days,
+        }
+
+
+@dataclass
+class ContractTerms:
+    """Dates and renewal terms found in a contract"""
+    effective_date: Optional[date] = None
+    expiration_date: Optional[date] = None  # End of the initial term
+    initial_term: Optional[tuple[int, str]] = None  # (count, "day"|"business_day"|"month"|"year")
+    auto_renews: bool = False
+    renewal_term: Optional[tuple[int, str]] = None
+    renewal_date: Optional[date] = None  # Next renewal (or expiry) on or after today
+    notice: Optional[tuple[int, str]] = None  # Non-renewal notice period
+    notice_deadline: Optional[date] = None  # Last day to give non-renewal notice
+    notice_for: Optional[date] = None  # Renewal/expiry the notice deadline applies to
+    termination_notice: Optional[tuple[int, str]] = None  # Termination for convenience
+    payment_days: Optional[int] = None
+    key_dates: list[KeyDate] = field(default_factory=list)
+
+    def to_dict(self, today: Optional[date] = None) -> dict:
+        def iso(value: Optional[date]) -> Optional[str]:
+            return value.isoformat() if value else None
+
+        return {
+            "effective_date": iso(self.effective_date),
+            "expiration_date": iso(self.expiration_date),
+            "initial_term": describe_period(self.initial_term),
+            "auto_renews": self.auto_renews,
+            "renewal_term": describe_period(self.renewal_term),
+            "renewal_date": iso(self.renewal_date),
+            "notice_period": describe_period(self.notice),
+            "notice_deadline": iso(self.notice_deadline),
+            "notice_for": iso(self.notice_for),
+            "termination_notice": describe_period(self.termination_notice),
+            "payment_days": self.payment_days,
+            "key_dates": [key_date.to_dict(today) for key_date in self.key_dates],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ContractTerms":
+        """Terms from to_dict() output (key dates are recomputed by as_of)"""
+        def day(value: Optional[str]) -> Optional[date]:
+            return date.fromisoformat(value) if value else None
+
+        return cls(
+            effective_date=day(data.get("effective_date")),
+            expiration_date=day(data.get("expiration_date")),
+            initial_term=parse_period(data.get("initial_term")),
+            auto_renews=bool(data.get("auto_renews")),
+            renewal_term=parse_period(data.get("renewal_term")),
+            renewal_date=day(data.get("renewal_date")),
+            notice=parse_period(data.get("notice_period")),
+            notice_deadline=day(data.get("notice_deadline")),
+            notice_for=day(data.get("notice_for")),
+            termination_notice=parse_period(data.get("termination_notice")),
+            payment_days=data.get("payment_days"),
+        )
+
+    def as_of(self, today: date) -> "ContractTerms":
+        """
+        The same terms with renewal and notice deadlines resolved for a later date
+
+        An auto-renewing contract whose renewal (or notice deadline) has
+        passed moves on to the next renewal.
+        """
+        terms = ContractTerms(
+            effective_date=self.effective_date,
+            expiration_date=self.expiration_date,
+            initial_term=self.initial_term,
+            auto_renews=self.auto_renews,
+            renewal_term=self.renewal_term,
+            notice=self.notice,
+            termination_notice=self.termination_notice,
+            payment_days=self.payment_days,
+        )
+        _resolve(terms, today)
+        return terms
+
+
+def extract_terms(text: str, today: Optional[date] = None) -> ContractTerms:
+    """
+    Find a contract's dates and renewal terms and resolve its deadlines
+
+    The first match of each kind wins (definitions come before later
+    references). Relative deadlines are resolved as:
+    - expiration = expiry date, else effective date + initial term (or
+      renewal term, for evergreen contracts without an initial term)
+    - renewal_date = expiration, rolled forward by the renewal term (the
+      initial term when none is given) until it is on or after today
+    - notice_deadline = renewal_date - notice period; when that has passed
+      for an auto-renewing contract, the deadline for the renewal after it
+
+    Args:
+        text: Contract text
+        today: Reference date (defaults to today)
+
+    Returns:
+        Extracted terms with key dates sorted by date
+    """
+    today = today or date.today()
+    terms = ContractTerms()
+    other_dates: list[date] = []
+
+    for match in _PATTERN.finditer(text):
+        rule = match.lastgroup
+        groups = {name.split("__", 1)[1]: value for name, value in match.groupdict().items()
+                  if value is not None and name.startswith(f"{rule}__")}
+        if rule == "effective" and terms.effective_date is None:
+            terms.effective_date = _parse_date(groups["date1"])
+        elif rule == "expiry" and terms.expiration_date is None:
+            terms.expiration_date = _parse_date(groups["date1"])
+        elif rule == "initial_term" and terms.initial_term is None:
+            terms.initial_term = _period(groups, 1) or _period(groups, 2)
+        elif rule == "auto_renew":
+            terms.auto_renews = True
+            terms.renewal_term = terms.renewal_term or _period(groups, 1)
+        elif rule == "notice" and terms.notice is None:
+            terms.notice = _period(groups, 1)
+        elif rule == "convenience" and terms.termination_notice is None:
+            terms.termination_notice = _period(groups, 1)
+        elif rule == "payment" and terms.payment_days is None:
+            period = _period(groups, 1)
+            terms.payment_days = _days(period) if period else None
+        elif rule == "date":
+            parsed = _parse_date(groups["date1"])
+            if parsed:
+                other_dates.append(parsed)
+
+    _resolve(terms, today)
+    known = {terms.effective_date, terms.expiration_date}
+    terms.key_dates.extend(
+        KeyDate("other", value, "Date referenced in contract", "low")
+        for value in sorted(set(other_dates) - known)
+    )
+    terms.key_dates.sort(key=lambda key_date: key_date.date)
+    return terms
+
+
+def _resolve(terms: ContractTerms, today: date) -> None:
+    term = terms.initial_term or (terms.renewal_term if terms.auto_renews else None)
+    if terms.expiration_date is None and terms.effective_date and term:
+        terms.expiration_date = _shifted(terms.effective_date, *term)
+    if terms.effective_date:
+        terms.key_dates.append(KeyDate("other", terms.effective_date, "Effective date", "low"))
+    if terms.expiration_date is None:
+        return
+
+    renewal = terms.expiration_date
+    if terms.auto_renews:
+        step = terms.renewal_term or terms.initial_term or (1, "year")
+        terms.renewal_term = step
+        # A period that does not move the date forward would never reach today
+        while step[0] > 0 and renewal < today:
+            following = _shifted(renewal, *step)
+            if following is None:
+                break
+            renewal = following
+        terms.key_dates.append(KeyDate("renewal", renewal, f"Automatic renewal for {describe_period(step)}", "medium"))
+    else:
+        terms.key_dates.append(KeyDate("termination", renewal, "Contract expires", "medium"))
+    terms.renewal_date = renewal
+
+    if terms.notice:
+        deadline = _shifted(renewal, -terms.notice[0], terms.notice[1])
+        if deadline and terms.auto_renews and deadline < today:
+            # Too late to stop this renewal; the next one is still avoidable
+            following = _shifted(renewal, *terms.renewal_term)
+            if following and following > renewal:
+                renewal = following
+                deadline = _shifted(renewal, -terms.notice[0], terms.notice[1])
+        if deadline is None:
+            return
+        terms.notice_deadline = deadline
+        terms.notice_for = renewal
+        action = "prevent automatic renewal" if terms.auto_renews else "give notice before expiry"
+        terms.key_dates.append(
+            KeyDate("notice_required", deadline, f"Last day to {action} on {renewal.isoformat()}", "high")
+        )
+
+
+def _shifted(start: date, count: int, unit: str) -> Optional[date]:
+    """shift(), or None when the result falls outside the dates Python can represent"""
+    try:
+        return shift(start, count, unit)
+    except (ValueError, OverflowError):
+        return None
+
+
+def shift(start: date, count: int, unit: str) -> date:
+    """
+    Move a date by a number of days, business days, months or years (month ends clamp)
+
+    Business days skip weekends (holidays are not known).
+
+    Args:
+        start: Date to move
+        count: Amount (negative moves back)
+        unit: "day", "business_day", "month" or "year"
+    """
+    if unit == "day":
+        return date.fromordinal(start.toordinal() + count)
+    if unit == "business_day":
+        ordinal, step = start.toordinal(), 1 if count >= 0 else -1
+        for _ in range(abs(count)):
+            ordinal += step
+            while date.fromordinal(ordinal).weekday() >= 5:
+                ordinal += step
+        return date.fromordinal(ordinal)
+    months = count * 12 if unit == "year" else count
+    month_index = start.year * 12 + start.month - 1 + months
+    year, month = divmod(month_index, 12)
+    day = min(start.day, calendar.monthrange(year, month + 1)[1])
+    return date(year, month + 1, day)
+
+
+def describe_period(period: Optional[tuple[int, str]]) -> Optional[str]:
+    if not period:
+        return None
+    count, unit = period
+    return f"{count} {unit.replace('_', ' ')}{'s' if count != 1 else ''}"
+
+
+def parse_period(text: Optional[str]) -> Optional[tuple[int, str]]:
+    """Inverse of describe_period ("10 business days" -> (10, "business_day"))"""
+    if not text:
+        return None
+    count, _, unit = text.partition(" ")
+    unit = unit.rstrip("s").replace(" ", "_")
+    if not count.isdigit() or int(count) <= 0 or unit not in ("day", "business_day", "month", "year"):
+        return None
+    return int(count), unit
+
+
+def _period(groups: dict, index: int) -> Optional[tuple[int, str]]:
+    number, unit = groups.get(f"n{index}"), groups.get(f"unit{index}")
+    if not number or not unit:
+        return None
+    number = number.split("(")[0].strip().lower()
+    count = int(number) if number.isdigit() else _NUMBER_WORDS.get(number)
+    if count is None or count <= 0:
+        return None  # "0 months" is no period at all
+    unit = unit.lower()
+    if "day" in unit:
+        return count, "business_day" if unit.startswith("business") else "day"
+    return count, "month" if "month" in unit else "year"
+
+
+def _days(period: tuple[int, str]) -> int:
+    """Approximate calendar days of a period"""
+    count, unit = period
+    if unit == "business_day":
+        return -(-count * 7 // 5)
+    return count if unit == "day" else count * 30 if unit == "month" else count * 365
+
+
+def _parse_date(value: str) -> Optional[date]:
+    value = value.strip().rstrip(",")
+    try:
+        if re.fullmatch(r"\d{4}-\d{1,2}-\d{1,2}", value):
+            year, month, day = (int(part) for part in value.split("-"))
+        elif re.fullmatch(r"\d{1,2}/\d{1,2}/\d{4}", value):
+            month, day, year = (int(part) for part in value.split("/"))
+        else:
+            words = re.findall(r"[A-Za-z]+|\d+", value)
+            numbers = [int(word) for word in words if word.isdigit()]
+            month = next(_MONTHS[word.lower()] for word in words if word.lower() in _MONTHS)
+            day, year = (numbers[0], numbers[1]) if numbers[0] <= 31 else (numbers[1], numbers[0])
+        return date(year, month, day)
+    except (ValueError, StopIteration, IndexError):
+        return None
@@ -0,0 +1,250 @@
+"""
+Document Text Store - Single copy of each contract's normalized text
+Block-compressed, memory-mapped storage that chunks reference by (contract_id, start, end)
+"""
+
+from typing import Optional
+from collections import OrderedDict
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import unicodedata
+import zlib
+
+from app.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+_CACHE_HITS = REGISTRY.counter("contractguard_cache_requests_total", "Cache lookups", cache="text_store_blocks", result="hit")
+_CACHE_MISSES = REGISTRY.counter("contractguard_cache_requests_total", "Cache lookups", cache="text_store_blocks", result="miss")
+
+_MAGIC = b"CGTS"
+_HEADER = struct.Struct("<4sIQI")  # magic, block size (chars), text length (chars), block count
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]")
+_INLINE_SPACE = re.compile(r"[ \t\f\v]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Canonical form stored for a contract (offsets are relative to this)
+
+    - Unicode NFKC (ligatures, full-width characters)
+    - Unix newlines, runs of spaces/tabs collapsed to one space
+    - Trailing whitespace per line removed, at most one blank line in a row
+
+    Args:
+        text: Extracted contract text
+
+    Returns:
+        Normalized text
+    """
+    text = unicodedata.normalize("NFKC", text).replace("\r\n", "\n").replace("\r", "\n")
+    lines = [_INLINE_SPACE.sub(" ", line).strip() for line in text.split("\n")]
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+class DocumentTextStore:
+    """
+    Stores each contract's text once on local disk
+
+    File layout per contract:
+    - Header (magic, block size, length, block count)
+    - Offset table of block_count + 1 little-endian uint64 byte offsets
+    - zlib-compressed blocks of block_size characters each
+
+    Files are memory-mapped on first read and a slice decompresses only
+    the blocks it overlaps, so hydrating a chunk costs one or two block
+    inflates regardless of contract size.
+    """
+
+    def __init__(self, root: str, block_size: int = 16384, cache_blocks: int = 256, max_open_files: int = 64):
+        """
+        Initialize text store
+
+        Args:
+            root: Directory holding one file per contract
+            block_size: Characters per compressed block
+            cache_blocks: Decompressed blocks kept in the LRU cache
+            max_open_files: Memory maps kept open at once
+        """
+        self.root = root
+        self.block_size = block_size
+        self.cache_blocks = cache_blocks
+        self.max_open_files = max_open_files
+        self._maps: OrderedDict[str, tuple] = OrderedDict()
+        self._blocks: OrderedDict[tuple[str, int], str] = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def put(self, contract_id: str, text: str) -> int:
+        """
+        Store (or replace) a contract's text
+
+        Args:
+            contract_id: Contract identifier
+            text: Normalized contract text
+
+        Returns:
+            Compressed size in bytes
+        """
+        blocks = [
+            zlib.compress(text[i:i + self.block_size].encode("utf-8"), 6)
+            for i in range(0, len(text), self.block_size)
+        ]
+        offsets = [0]
+        for block in blocks:
+            offsets.append(offsets[-1] + len(block))
+
+        path = self._path(contract_id)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as handle:
+            handle.write(_HEADER.pack(_MAGIC, self.block_size, len(text), len(blocks)))
+            handle.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+            for block in blocks:
+                handle.write(block)
+
+        with self._lock:
+            self._evict(contract_id)
+            os.replace(temp_path, path)
+
+        logger.debug(f"Stored {len(text)} chars for contract {contract_id} in {offsets[-1]} bytes")
+        return offsets[-1]
+
+    def get(self, contract_id: str, start: int = 0, end: Optional[int] = None) -> Optional[str]:
+        """
+        Read a slice of a contract's text
+
+        Args:
+            contract_id: Contract identifier
+            start: Start character offset
+            end: End character offset (defaults to end of text)
+
+        Returns:
+            Text slice, or None if the contract is not stored
+        """
+        with self._lock:
+            opened = self._open(contract_id)
+            if opened is None:
+                return None
+            _, view, block_size, length, offsets_at, data_at = opened
+
+            end = length if end is None else min(end, length)
+            start = max(start, 0)
+            if start >= end:
+                return ""
+
+            first, last = start // block_size, (end - 1) // block_size
+            text = "".join(
+                self._block(contract_id, view, i, offsets_at, data_at)
+                for i in range(first, last + 1)
+            )
+        return text[start - first * block_size:end - first * block_size]
+
+    def get_many(self, spans: list[tuple[str, int, int]]) -> list[Optional[str]]:
+        """
+        Read several slices (e.g. the final top-k of a search)
+
+        Args:
+            spans: (contract_id, start, end) tuples
+
+        Returns:
+            Text per span, in order
+        """
+        return [self.get(contract_id, start, end) for contract_id, start, end in spans]
+
+    def has(self, contract_id: str) -> bool:
+        """Whether a contract's text is stored"""
+        return os.path.exists(self._path(contract_id))
+
+    def delete(self, contract_id: str) -> bool:
+        """
+        Remove a contract's text
+
+        Args:
+            contract_id: Contract identifier
+
+        Returns:
+            True if a file was removed
+        """
+        with self._lock:
+            self._evict(contract_id)
+            try:
+                os.remove(self._path(contract_id))
+                return True
+            except FileNotFoundError:
+                return False
+
+    def close(self) -> None:
+        """Release all memory maps"""
+        with self._lock:
+            for contract_id in list(self._maps):
+                self._evict(contract_id)
+
+    def stats(self) -> dict:
+        """Open maps and cache occupancy"""
+        return {
+            "open_files": len(self._maps),
+            "cached_blocks": len(self._blocks),
+            "cache_capacity": self.cache_blocks,
+        }
+
+    def _path(self, contract_id: str) -> str:
+        name = _SAFE_NAME.sub("_", contract_id)
+        if name != contract_id:
+            # Sanitizing can map distinct ids to one name (a/b, a_b): tell them apart by hash
+            name = f"{name}-{zlib.crc32(contract_id.encode('utf-8')):08x}"
+        return os.path.join(self.root, f"{name}.cgts")
+
+    def _open(self, contract_id: str) -> Optional[tuple]:
+        opened = self._maps.get(contract_id)
+        if opened is not None:
+            self._maps.move_to_end(contract_id)
+            return opened
+
+        try:
+            handle = open(self._path(contract_id), "rb")
+        except FileNotFoundError:
+            return None
+        view = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, block_size, length, block_count = _HEADER.unpack_from(view, 0)
+        if magic != _MAGIC:
+            view.close()
+            handle.close()
+            raise ValueError(f"Corrupt text store file for contract {contract_id}")
+
+        offsets_at = _HEADER.size
+        data_at = offsets_at + 8 * (block_count + 1)
+        opened = (handle, view, block_size, length, offsets_at, data_at)
+        self._maps[contract_id] = opened
+        while len(self._maps) > self.max_open_files:
+            self._evict(next(iter(self._maps)))
+        return opened
+
+    def _block(self, contract_id: str, view: mmap.mmap, index: int, offsets_at: int, data_at: int) -> str:
+        key = (contract_id, index)
+        block = self._blocks.get(key)
+        if block is not None:
+            self._blocks.move_to_end(key)
+            _CACHE_HITS.inc()
+            return block
+        _CACHE_MISSES.inc()
+
+        begin, finish = struct.unpack_from("<2Q", view, offsets_at + 8 * index)
+        block = zlib.decompress(view[data_at + begin:data_at + finish]).decode("utf-8")
+        self._blocks[key] = block
+        if len(self._blocks) > self.cache_blocks:
+            self._blocks.popitem(last=False)
+        return block
+
+    def _evict(self, contract_id: str) -> None:
+        opened = self._maps.pop(contract_id, None)
+        if opened is not None:
+            handle, view = opened[0], opened[1]
+            view.close()
+            handle.close()
+        for key in [key for key in self._blocks if key[0] == contract_id]:
+            del self._blocks[key]
@@ -3,12 +3,48 @@ Vector Database Service - Pinecone Integration
 Manages vector embeddings, similarity search, and metadata operations for RAG
 """
 
+import asyncio
+import json
 import logging
-from typing import Optional, List
+import os
+import re
+import tempfile
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import TYPE_CHECKING, AsyncIterator, Optional, List, Union
 from dataclasses import dataclass
 
+from app.deadlines import DeadlineExceeded, bounded, hedged
+from app.metrics import REGISTRY
+from app.services.sharded_search import ShardedScorer, top_k_rows
+
+if TYPE_CHECKING:
+    import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Failures search() and search_partitions() absorb (they degrade to empty
+# results), counted into the same series instrument() records raised errors in
+_SEARCH_ERRORS = REGISTRY.counter(
+    "contractguard_service_errors_total", "Service calls that raised", service="vector", method="search"
+)
+_PARTITION_SEARCH_ERRORS = REGISTRY.counter(
+    "contractguard_service_errors_total", "Service calls that raised", service="vector", method="search_partitions"
+)
+_VECTORS_SCANNED = REGISTRY.counter("contractguard_vectors_scanned_total", "Vectors scored by in-process search")
+_PARTITION_LOADS = REGISTRY.counter("contractguard_vector_partition_loads_total", "Spilled partitions loaded back")
+_UNLOADS_BUDGET = REGISTRY.counter(
+    "contractguard_vector_partition_unloads_total", "Partitions spilled to disk", reason="budget"
+)
+_UNLOADS_IDLE = REGISTRY.counter(
+    "contractguard_vector_partition_unloads_total", "Partitions spilled to disk", reason="idle"
+)
+
+SHARED_TENANT = "_shared"  # Vectors stored without an organization_id
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]")
+
 
 @dataclass
 class VectorSearchResult:
@@ -17,6 +53,256 @@ class VectorSearchResult:
     score: float
     metadata: dict
     text: Optional[str] = None
+    values: Optional[List[float]] = None
+
+
+class InMemoryIndex:
+    """
+    In-process cosine index used when no Pinecone index is configured
+
+    Rows are L2-normalised on insert so a search is a single
+    matrix-vector product followed by a partial sort, split into shards
+    across cores when a ShardedScorer is passed. Each row's contract is
+    also kept as an integer code, so contract_id filters are a vectorised
+    comparison rather than a metadata check per row. NumPy is imported on
+    first insert, keeping it off the cold-start path.
+    """
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self._matrix = None
+        self._contracts = None  # Contract code per row
+        self._contract_codes: dict[Optional[str], int] = {}
+        self._ids: list[str] = []
+        self._metadata: list[dict] = []
+        self._positions: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the vector matrix (allocated rows, not just live ones)"""
+        return 0 if self._matrix is None else self._matrix.nbytes
+
+    def upsert(self, vector_id: str, values: List[float], metadata: dict) -> None:
+        import numpy as np
+
+        row = np.asarray(values, dtype=np.float32)
+        norm = np.linalg.norm(row)
+        if norm > 0:
+            row = row / norm
+
+        position = self._positions.get(vector_id)
+        if position is None:
+            position = len(self._ids)
+            if self._matrix is None or position == self._matrix.shape[0]:
+                # Grow geometrically so bulk upserts stay amortised O(1)
+                grown = np.zeros((max(16, 2 * position), self.dimension), dtype=np.float32)
+                contracts = np.zeros(grown.shape[0], dtype=np.int32)
+                if position:
+                    grown[:position] = self._matrix[:position]
+                    contracts[:position] = self._contracts[:position]
+                self._matrix, self._contracts = grown, contracts
+            self._ids.append(vector_id)
+            self._metadata.append(metadata)
+            self._positions[vector_id] = position
+        else:
+            self._metadata[position] = metadata
+        self._matrix[position] = row
+        self._contracts[position] = self._contract_code(metadata.get("contract_id"))
+
+    def delete(self, vector_id: str) -> bool:
+        position = self._positions.pop(vector_id, None)
+        if position is None:
+            return False
+
+        # Swap-remove keeps the live rows contiguous
+        last = len(self._ids) - 1
+        if position != last:
+            moved_id = self._ids[last]
+            self._matrix[position] = self._matrix[last]
+            self._contracts[position] = self._contracts[last]
+            self._ids[position] = moved_id
+            self._metadata[position] = self._metadata[last]
+            self._positions[moved_id] = position
+        self._ids.pop()
+        self._metadata.pop()
+        return True
+
+    def fetch(self, vector_id: str) -> Optional[VectorSearchResult]:
+        position = self._positions.get(vector_id)
+        if position is None:
+            return None
+        return VectorSearchResult(
+            id=vector_id, score=1.0, metadata=self._metadata[position], values=self._matrix[position].tolist()
+        )
+
+    def save(self, path: str) -> None:
+        """Write the live rows (path.npy) and their ids and metadata (path.json)"""
+        import numpy as np
+
+        matrix = self._matrix[:len(self._ids)] if self._matrix is not None else np.zeros((0, self.dimension), np.float32)
+        with open(f"{path}.npy.tmp", "wb") as handle:
+            np.save(handle, matrix)
+        with open(f"{path}.json.tmp", "w") as handle:
+            json.dump({"ids": self._ids, "metadata": self._metadata}, handle)
+        os.replace(f"{path}.npy.tmp", f"{path}.npy")
+        os.replace(f"{path}.json.tmp", f"{path}.json")
+
+    @classmethod
+    def load(cls, path: str, dimension: int) -> "InMemoryIndex":
+        """Read an index written by save() (rows are already normalised)"""
+        import numpy as np
+
+        index = cls(dimension)
+        with open(f"{path}.json") as handle:
+            stored = json.load(handle)
+        index._matrix = np.load(f"{path}.npy")
+        index._ids = stored["ids"]
+        index._metadata = stored["metadata"]
+        index._positions = {vector_id: position for position, vector_id in enumerate(index._ids)}
+        index._contracts = np.fromiter(
+            (index._contract_code(metadata.get("contract_id")) for metadata in index._metadata),
+            dtype=np.int32,
+            count=len(index._metadata),
+        )
+        return index
+
+    def matching_ids(self, filters: Optional[dict]) -> list[str]:
+        return [
+            vector_id
+            for vector_id, metadata in zip(self._ids, self._metadata)
+            if _matches(metadata, filters)
+        ]
+
+    def query(
+        self,
+        vector: List[float],
+        top_k: int,
+        filters: Optional[dict] = None,
+        include_values: bool = False,
+        scorer: Optional[ShardedScorer] = None,
+    ) -> list[VectorSearchResult]:
+        count = len(self._ids)
+        if count == 0 or top_k <= 0:
+            return []
+
+        import numpy as np
+
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        matrix, ids, metadata = self._matrix, self._ids, self._metadata
+        mask = self._mask(filters, count) if filters else None
+
+        if scorer is None:
+            top, scores = top_k_rows(matrix, 0, count, query, top_k, mask)
+        else:
+            top, scores = scorer.top_k(matrix, count, query, top_k, mask)
+
+        return [
+            VectorSearchResult(
+                id=ids[i],
+                score=float(score),
+                metadata=metadata[i],
+                values=matrix[i].tolist() if include_values else None,
+            )
+            for i, score in zip(top.tolist(), scores.tolist())
+        ]
+
+    def _contract_code(self, contract_id: Optional[str]) -> int:
+        return self._contract_codes.setdefault(contract_id, len(self._contract_codes))
+
+    def _mask(self, filters: dict, count: int) -> "np.ndarray":
+        """Rows matching a filter; a contract_id condition narrows the rows checked per metadata"""
+        import numpy as np
+
+        metadata = self._metadata
+        contract_ids = _equality(filters, "contract_id")
+        if contract_ids is None:
+            return np.fromiter((_matches(row, filters) for row in metadata[:count]), dtype=bool, count=count)
+
+        codes = [self._contract_codes[contract_id] for contract_id in contract_ids if contract_id in self._contract_codes]
+        mask = np.isin(self._contracts[:count], codes)
+        condition = filters["contract_id"]
+        if len(filters) > 1 or (isinstance(condition, dict) and len(condition) > 1):
+            for position in np.flatnonzero(mask).tolist():
+                mask[position] = _matches(metadata[position], filters)
+        return mask
+
+
+def _matches(metadata: dict, filters: Optional[dict]) -> bool:
+    """Evaluate a Pinecone-style metadata filter ($eq / $in / $ne or bare values)"""
+    if not filters:
+        return True
+    for key, condition in filters.items():
+        value = metadata.get(key)
+        if isinstance(condition, dict):
+            if "$eq" in condition and value != condition["$eq"]:
+                return False
+            if "$ne" in condition and value == condition["$ne"]:
+                return False
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+def _limit_per_contract(
+    results: List[VectorSearchResult], contracts: int, per_contract: int
+) -> List[VectorSearchResult]:
+    """Results (best first) of the first `contracts` contracts seen, at most per_contract each"""
+    kept, counts = [], {}
+    for result in results:
+        contract_id = result.metadata.get("contract_id")
+        if contract_id not in counts:
+            if len(counts) == contracts:
+                continue
+            counts[contract_id] = 0
+        if counts[contract_id] < per_contract:
+            counts[contract_id] += 1
+            kept.append(result)
+    return kept
+
+
+def _equality(filters: Optional[dict], key: str) -> Optional[list]:
+    """Values a filter pins key to ($eq, $in or a bare value), or None if unconstrained"""
+    condition = (filters or {}).get(key)
+    if isinstance(condition, dict):
+        if "$eq" in condition:
+            condition = condition["$eq"]
+        elif "$in" in condition:
+            return list(condition["$in"])
+        else:
+            return None
+    if condition is None or isinstance(condition, (list, dict)):
+        return None
+    return [condition]
+
+
+class _Partition:
+    """
+    One namespace of a tenant: a resident InMemoryIndex, or a spill file
+    
+    index is None while spilled; dirty marks changes not yet written, so
+    unloading a partition that was only searched costs no I/O.
+    """
+
+    def __init__(self, tenant: str, slot: int, namespace: str, dimension: int):
+        self.tenant = tenant
+        self.slot = slot
+        self.namespace = namespace
+        self.index: Optional[InMemoryIndex] = InMemoryIndex(dimension)
+        self.vectors = 0
+        self.dirty = True
+        self.spill_path: Optional[str] = None
+        self.dropped = False  # Emptied and removed from the service
+        self.last_used = time.monotonic()
+        self.lock = threading.RLock()  # Serialises loads, spills, writes and queries
 
 
 class VectorService:
@@ -30,13 +316,39 @@ class VectorService:
     - Metadata management
     - Index statistics
     
+    Tenancy:
+    - Each organization has its own namespaces (partition_count slots,
+      chosen by contract_id), so a search filtered by organization or
+      contract touches only that tenant's vectors
+    - A tenant's resident vectors are capped by tenant_memory_bytes; past
+      it, the tenant's least recently used partitions are spilled to disk
+      (never another tenant's). Partitions idle for idle_unload_seconds
+      are spilled too, and spilled partitions load on first use
+    - Partitions of at least two shard_rows shards are scored across
+      search_workers cores (scatter-gather), so a large tenant's query
+      latency falls with the cores available
+    
     Performance Targets:
     - Search latency: < 100ms
     - Upsert throughput: 1000+ vectors/second
     - Availability: 99.95% uptime
     """
 
-    def __init__(self, api_key: str, environment: str = "prod", index_name: str = "contractguard"):
+    def __init__(
+        self,
+        api_key: str,
+        environment: str = "prod",
+        index_name: str = "contractguard",
+        partition_count: int = 4,
+        http_client=None,
+        request_timeout: Optional[float] = 10.0,
+        hedge_searches: bool = True,
+        tenant_memory_bytes: Optional[int] = None,
+        idle_unload_seconds: Optional[float] = None,
+        spill_dir: Optional[str] = None,
+        search_workers: Optional[int] = None,
+        shard_rows: int = 4096
+    ):
         """
         Initialize Pinecone service
         
@@ -44,17 +356,54 @@ class VectorService:
             api_key: Pinecone API key
             environment: Pinecone environment (prod, staging)
             index_name: Index name for contract embeddings
+            partition_count: Namespaces per tenant, chosen by contract_id; a
+                contract's chunks always land in the same partition
+            http_client: Shared pooled httpx.AsyncClient (owned by the caller)
+            request_timeout: Longest a single partition query may take (the
+                request deadline, when shorter, wins)
+            hedge_searches: Send a backup query when a partition runs past
+                its recent p95 latency (queries are idempotent). Applies to
+                queries sent to Pinecone only: an in-process partition is
+                scored under its lock, so a backup would just queue behind
+                the first attempt
+            tenant_memory_bytes: Most vector memory one tenant keeps resident
+                (None for no limit)
+            idle_unload_seconds: Spill partitions unused for this long (None
+                to keep them resident)
+            spill_dir: Directory for spilled partitions (a private temporary
+                directory when None)
+            search_workers: Cores a single partition query is sharded over
+                (default: all cores; 1 scores every partition inline)
+            shard_rows: Fewest rows worth a shard of their own
         """
         self.api_key = api_key
         self.environment = environment
         self.index_name = index_name
         self.dimension = 1536  # OpenAI embedding dimension
         self.metric = "cosine"
+        self.partition_count = max(partition_count, 1)
+        self.http_client = http_client
+        self.request_timeout = request_timeout
+        self.hedge_searches = hedge_searches
+        self.tenant_memory_bytes = tenant_memory_bytes
+        self.idle_unload_seconds = idle_unload_seconds
+        self.spill_dir = spill_dir
+        self._scorer = ShardedScorer(search_workers, shard_rows)
         
         # In production:
         # import pinecone
         # pinecone.init(api_key=api_key, environment=environment)
         # self.index = pinecone.Index(index_name)
+        # self.remote = True
+        
+        # For demo: in-process partitions with the same query semantics,
+        # tenant -> slot -> partition, created on first upsert
+        self._tenants: dict[str, dict[int, _Partition]] = {}
+        self._contract_tenants: dict[str, str] = {}  # Routes contract-only filters
+        self._counters: dict[str, Counter] = {}  # Per-tenant searches, loads and unloads
+        self._lock = threading.Lock()  # Guards the maps above (not partition contents)
+        self._last_sweep = time.monotonic()
+        self.remote = False  # Queries go over the network (only those are worth hedging)
 
     async def init_index(self) -> bool:
         """
@@ -94,12 +443,14 @@ class VectorService:
         Upsert (insert or update) a vector with metadata
         
         Metadata stored:
-        - contract_id: For filtering by contract
+        - contract_id: For filtering by contract (also selects the partition)
+        - organization_id: For portfolio-wide search (also selects the tenant)
         - chunk_index: Position within contract
         - clause_category: Type of clause
         - risk_level: Extracted risk level
         - page_number: Source page
-        - text: Original chunk text for retrieval
+        - start/end: Offsets into the contract text store
+        - text: Original chunk text (only when no text store is configured)
         
         Args:
             vector_id: Unique identifier for vector
@@ -110,14 +461,21 @@ class VectorService:
             Vector ID if successful
         """
         try:
+            tenant = metadata.get("organization_id") or SHARED_TENANT
+            contract_id = metadata.get("contract_id")
+            
             # In production:
             # self.index.upsert(
             #     vectors=[
             #         (vector_id, values, metadata)
             #     ],
-            #     namespace="" if self.environment == "prod" else "staging"
+            #     namespace=self._namespace(tenant, self._partition_for(contract_id))
             # )
             
+            # Loading a spilled partition and spilling over budget are disk I/O: off the event loop
+            await asyncio.to_thread(self._upsert_partition, tenant, contract_id, vector_id, values, metadata)
+            if contract_id is not None:
+                self._contract_tenants[contract_id] = tenant
             logger.debug(f"Upserted vector: {vector_id}")
             return vector_id
         except Exception as e:
@@ -130,13 +488,15 @@ class VectorService:
         top_k: int = 5,
         filters: Optional[dict] = None,
         threshold: float = 0.7,
-        include_metadata: bool = True
+        include_metadata: bool = True,
+        include_values: bool = False
     ) -> List[VectorSearchResult]:
         """
         Search for similar vectors (semantic similarity search)
         
         Strategy:
-        1. Use cosine similarity in vector space
+        1. Use cosine similarity in vector space, over the namespaces the
+           filter's organization_id / contract_id route to
         2. Optional metadata filtering (contract_id, risk_level)
         3. Threshold-based filtering
         4. Return top-k results with relevance scores
@@ -147,44 +507,255 @@ class VectorService:
             filters: Metadata filters (e.g., {"contract_id": "123"})
             threshold: Minimum similarity score (0-1)
             include_metadata: Whether to include metadata in results
+            include_values: Whether to return the stored vectors (needed for reranking)
             
         Returns:
             List of search results with scores
         """
         try:
-            # In production:
-            # results = self.index.query(
-            #     vector=vector,
-            #     top_k=top_k,
-            #     filter=filters,
-            #     include_metadata=include_metadata,
-            #     namespace="" if self.environment == "prod" else "staging"
-            # )
-            
-            # Parse results
-            # search_results = [
-            #     VectorSearchResult(
-            #         id=match["id"],
-            #         score=match["score"],
-            #         metadata=match.get("metadata", {}),
-            #     )
-            #     for match in results["matches"]
-            #     if match["score"] >= threshold
-            # ]
-            
-            # For demo
-            search_results = []
+            partitions = self._partitions_for(filters)
+            if not partitions:
+                search_results = []
+            elif len(partitions) == 1:
+                search_results = await self._query_partition(
+                    partitions[0], vector, top_k, filters, threshold, include_metadata, include_values
+                )
+            else:
+                if len(partitions) > self.partition_count:
+                    # Spans tenants: keep the fan-out at partition_count worker tasks
+                    partitions = [partitions[i::self.partition_count] for i in range(self.partition_count)]
+                per_partition = await asyncio.gather(*[
+                    self._query_partition(
+                        partition, vector, top_k, filters, threshold, include_metadata, include_values
+                    )
+                    for partition in partitions
+                ])
+                search_results = sorted(
+                    (result for results in per_partition for result in results),
+                    key=lambda result: result.score,
+                    reverse=True
+                )[:top_k]
             
             logger.debug(f"Searched with top_k={top_k}, filters={filters}, found {len(search_results)} results")
             return search_results
+        except DeadlineExceeded:
+            # Callers decide how to degrade; an empty result would look like "no matches"
+            raise
         except Exception as e:
+            _SEARCH_ERRORS.inc()
             logger.error(f"Search failed: {str(e)}")
             return []
 
+    async def search_partitions(
+        self,
+        vector: List[float],
+        top_k: int = 5,
+        filters: Optional[dict] = None,
+        threshold: float = 0.7,
+        include_values: bool = False,
+        per_contract: Optional[int] = None
+    ) -> AsyncIterator[tuple[str, List[VectorSearchResult]]]:
+        """
+        Fan a search out to every partition the filter routes to, concurrently
+        
+        Yields each partition's top-k as soon as it completes, so callers
+        can stream results instead of waiting for the slowest partition.
+        
+        Args:
+            vector: Query embedding vector
+            top_k: Results per partition (contracts, with per_contract)
+            filters: Metadata filters (e.g., {"organization_id": "org-1"})
+            threshold: Minimum similarity score (0-1)
+            include_values: Whether to return the stored vectors
+            per_contract: Keep at most this many results per contract; each
+                partition then returns its top_k best contracts, however
+                many chunks the best of them match
+            
+        Yields:
+            (namespace, results) tuples in completion order
+        """
+        async def run(partition: _Partition) -> tuple[str, List[VectorSearchResult]]:
+            try:
+                results = await self._query_partition(
+                    partition, vector, top_k, filters, threshold, True, include_values, per_contract
+                )
+            except DeadlineExceeded:
+                # Out of budget: the caller keeps whatever partitions already answered
+                logger.warning(f"Search on partition {partition.namespace} cut off by the request deadline")
+                results = []
+            except Exception as e:
+                _PARTITION_SEARCH_ERRORS.inc()
+                logger.error(f"Search failed on partition {partition.namespace}: {str(e)}")
+                results = []
+            return partition.namespace, results
+        
+        for completed in asyncio.as_completed([run(partition) for partition in self._partitions_for(filters)]):
+            yield await completed
+
+    async def _query_partition(
+        self,
+        partition: Union[_Partition, list[_Partition]],
+        vector: List[float],
+        top_k: int,
+        filters: Optional[dict],
+        threshold: float,
+        include_metadata: bool,
+        include_values: bool,
+        per_contract: Optional[int] = None
+    ) -> List[VectorSearchResult]:
+        """Query one partition (or a group, in turn) within the remaining request budget, hedging slow remote queries"""
+        search = self._search_group if isinstance(partition, list) else self._search_partition
+        return await hedged(
+            lambda: bounded(
+                lambda timeout: asyncio.to_thread(
+                    search,
+                    partition, vector, top_k, filters, threshold, include_metadata, include_values, per_contract
+                ),
+                "vector.search",
+                cap=self.request_timeout,
+            ),
+            "vector.search",
+            enabled=self.hedge_searches and self.remote,
+        )
+
+    def _search_partition(
+        self,
+        partition: _Partition,
+        vector: List[float],
+        top_k: int,
+        filters: Optional[dict],
+        threshold: float,
+        include_metadata: bool,
+        include_values: bool,
+        per_contract: Optional[int] = None
+    ) -> List[VectorSearchResult]:
+        """Query a single partition (blocking; runs in worker threads)"""
+        # In production:
+        # results = self.index.query(
+        #     vector=vector,
+        #     top_k=top_k,
+        #     filter=filters,
+        #     include_metadata=include_metadata,
+        #     include_values=include_values,
+        #     namespace=partition.namespace
+        # )
+        
+        # Parse results
+        # search_results = [
+        #     VectorSearchResult(
+        #         id=match["id"],
+        #         score=match["score"],
+        #         metadata=match.get("metadata", {}),
+        #         values=match.get("values"),
+        #     )
+        #     for match in results["matches"]
+        #     if match["score"] >= threshold
+        # ]
+        # Pinecone cannot group by contract: with per_contract, re-query with a
+        # growing top_k as _query_contracts does
+        
+        # For demo
+        if _equality(filters, "organization_id") == [partition.tenant]:
+            # Every row of a tenant's partition matches its organization: skip the per-row check
+            filters = {key: condition for key, condition in filters.items() if key != "organization_id"}
+        with partition.lock:
+            # Writers swap-remove rows in place; hold them off while scoring
+            index = self._resident(partition)
+            if per_contract is None:
+                _VECTORS_SCANNED.inc(len(index))
+                matches = index.query(vector, top_k, filters, include_values, scorer=self._scorer)
+            else:
+                matches = self._query_contracts(index, vector, top_k, per_contract, filters, threshold, include_values)
+        self._count(partition.tenant, "searches")
+        self._after_use(partition)
+        search_results = [result for result in matches if result.score >= threshold]
+        if not include_metadata:
+            for result in search_results:
+                result.metadata = {}
+        return search_results
+
+    def _search_group(
+        self,
+        partitions: list[_Partition],
+        vector: List[float],
+        top_k: int,
+        filters: Optional[dict],
+        threshold: float,
+        include_metadata: bool,
+        include_values: bool,
+        per_contract: Optional[int] = None
+    ) -> List[VectorSearchResult]:
+        """Query several partitions one after another (blocking; runs in worker threads)"""
+        results = sorted(
+            (
+                result
+                for partition in partitions
+                for result in self._search_partition(
+                    partition, vector, top_k, filters, threshold, include_metadata, include_values, per_contract
+                )
+            ),
+            key=lambda result: result.score,
+            reverse=True
+        )
+        return results[:top_k] if per_contract is None else _limit_per_contract(results, top_k, per_contract)
+
+    def _query_contracts(
+        self,
+        index: InMemoryIndex,
+        vector: List[float],
+        contracts: int,
+        per_contract: int,
+        filters: Optional[dict],
+        threshold: float,
+        include_values: bool
+    ) -> List[VectorSearchResult]:
+        """
+        Best chunks of a partition's best contracts, at most per_contract each
+
+        A top-k of chunks can be filled by one contract's chunks, so the
+        query over-fetches, growing k until enough contracts appear, the
+        partition runs out of rows or the scores fall below the threshold.
+        """
+        fetch = contracts * per_contract
+        while True:
+            _VECTORS_SCANNED.inc(len(index))
+            matches = index.query(vector, fetch, filters, include_values, scorer=self._scorer)
+            found = {result.metadata.get("contract_id") for result in matches}
+            if len(found) >= contracts or len(matches) < fetch or matches[-1].score < threshold:
+                return _limit_per_contract(matches, contracts, per_contract)
+            fetch *= 4
+
+    async def fetch(self, vector_ids: List[str], contract_id: Optional[str] = None) -> dict[str, VectorSearchResult]:
+        """
+        Fetch stored vectors (values and metadata) by ID
+        
+        Args:
+            vector_ids: Vector identifiers
+            contract_id: Contract the vectors belong to (pins the partition)
+            
+        Returns:
+            Found vectors by ID (missing IDs are left out)
+        """
+        try:
+            partitions = self._partitions_for({"contract_id": contract_id} if contract_id else None)
+            
+            # In production:
+            # response = self.index.fetch(ids=vector_ids, namespace=partitions[0].namespace)
+            # return {vector_id: VectorSearchResult(id=vector_id, score=1.0, metadata=v.get("metadata", {}),
+            #         values=v["values"]) for vector_id, v in response["vectors"].items()}
+            
+            return await asyncio.to_thread(self._fetch_partitions, partitions, vector_ids)
+        except Exception as e:
+            logger.error(f"Failed to fetch {len(vector_ids)} vectors: {str(e)}")
+            return {}
+
     async def delete(self, vector_id: str) -> bool:
         """
         Delete a single vector
         
+        Without a contract to route by, every partition is checked (spilled
+        ones are loaded); prefer delete_by_metadata.
+        
         Args:
             vector_id: Vector identifier
             
@@ -193,8 +764,9 @@ class VectorService:
         """
         try:
             # In production:
-            # self.index.delete(ids=[vector_id])
+            # self.index.delete(ids=[vector_id], namespace=...)
             
+            await asyncio.to_thread(self._delete_matching, self._partitions_for(None), None, vector_id)
             logger.debug(f"Deleted vector: {vector_id}")
             return True
         except Exception as e:
@@ -217,7 +789,9 @@ class VectorService:
             # List matching vectors first
             # self.index.delete(filter=filters)
             
-            deleted_count = 0  # Would be actual count from API
+            deleted_count = await asyncio.to_thread(self._delete_matching, self._partitions_for(filters), filters)
+            for contract_id in _equality(filters, "contract_id") or []:
+                self._contract_tenants.pop(contract_id, None)
             logger.info(f"Deleted {deleted_count} vectors matching {filters}")
             return deleted_count
         except Exception as e:
@@ -229,14 +803,43 @@ class VectorService:
         Get index statistics
         
         Returns:
-            Index stats (total vectors, dimension, etc.)
+            Index stats (total vectors, dimension, etc.), vectors per
+            namespace, and per tenant: vectors, partitions (resident and
+            spilled), resident bytes, searches, loads and unloads
         """
         try:
             # In production:
             # stats = self.index.describe_index_stats()
             
+            with self._lock:
+                tenants = {tenant: list(slots.values()) for tenant, slots in self._tenants.items()}
+                counters = {tenant: dict(counter) for tenant, counter in self._counters.items()}
+            tenant_stats = {}
+            for tenant, partitions in sorted(tenants.items()):
+                resident = [partition.index for partition in partitions if partition.index is not None]
+                tenant_stats[tenant] = {
+                    "vectors": sum(partition.vectors for partition in partitions),
+                    "partitions": len(partitions),
+                    "resident_partitions": len(resident),
+                    "resident_bytes": sum(index.nbytes for index in resident),
+                    "searches": counters.get(tenant, {}).get("searches", 0),
+                    "loads": counters.get(tenant, {}).get("loads", 0),
+                    "unloads": counters.get(tenant, {}).get("unloads", 0),
+                }
+            
             stats = {
-                "total_vectors": 0,
+                "total_vectors": sum(tenant["vectors"] for tenant in tenant_stats.values()),
+                "partitions": {
+                    partition.namespace: partition.vectors
+                    for partitions in tenants.values() for partition in partitions
+                },
+                "tenants": tenant_stats,
+                "sharding": self._scorer.stats(),
+                "memory": {
+                    "resident_bytes": sum(tenant["resident_bytes"] for tenant in tenant_stats.values()),
+                    "tenant_budget_bytes": self.tenant_memory_bytes,
+                    "idle_unload_seconds": self.idle_unload_seconds,
+                },
                 "dimension": self.dimension,
                 "metric": self.metric,
                 "index_name": self.index_name,
@@ -248,6 +851,10 @@ class VectorService:
             logger.error(f"Failed to get stats: {str(e)}")
             return {"error": str(e)}
 
+    def close(self) -> None:
+        """Stop the shard scoring threads"""
+        self._scorer.close()
+
     async def hybrid_search(
         self,
         vector: List[float],
@@ -281,13 +888,236 @@ class VectorService:
         
         return semantic_results[:top_k]
 
+    def _namespace(self, tenant: str, slot: int) -> str:
+        """Namespace holding one of a tenant's partitions"""
+        base = "" if self.environment == "prod" else "staging"
+        parts = [base, tenant, f"p{slot}" if self.partition_count > 1 else ""]
+        return "-".join(part for part in parts if part)
+
+    def _partition_for(self, contract_id: Optional[str]) -> int:
+        """Stable partition slot for a contract (crc32, so it survives restarts)"""
+        if self.partition_count == 1 or contract_id is None:
+            return 0
+        return zlib.crc32(str(contract_id).encode("utf-8")) % self.partition_count
+
+    def _partitions_for(self, filters: Optional[dict]) -> list[_Partition]:
+        """
+        Partitions a filter can match
+        
+        An organization_id equality filter selects that tenant's partitions
+        and a contract_id equality filter pins one slot (its tenant is
+        remembered from upsert when the filter names no organization).
+        Anything else spans every tenant.
+        """
+        tenants = _equality(filters, "organization_id")
+        contract_ids = _equality(filters, "contract_id")
+        if contract_ids is not None:
+            partitions = []
+            for contract_id in contract_ids:
+                for tenant in tenants or [self._contract_tenants.get(contract_id)]:
+                    partition = self._partition(tenant, self._partition_for(contract_id)) if tenant else None
+                    if partition is not None and partition not in partitions:
+                        partitions.append(partition)
+            return partitions
+        with self._lock:
+            return [
+                partition
+                for tenant, slots in self._tenants.items()
+                if tenants is None or tenant in tenants
+                for partition in slots.values()
+            ]
+
+    def _partition(self, tenant: str, slot: int, create: bool = False) -> Optional[_Partition]:
+        with self._lock:
+            slots = self._tenants.get(tenant)
+            partition = slots.get(slot) if slots else None
+            if partition is None and create:
+                partition = _Partition(tenant, slot, self._namespace(tenant, slot), self.dimension)
+                self._tenants.setdefault(tenant, {})[slot] = partition
+            return partition
+
+    def unload_idle(self, idle_seconds: Optional[float] = None) -> int:
+        """
+        Spill partitions that have not been used recently
+        
+        Args:
+            idle_seconds: Unused for at least this long (defaults to
+                idle_unload_seconds)
+            
+        Returns:
+            Number of partitions unloaded
+        """
+        idle = self.idle_unload_seconds if idle_seconds is None else idle_seconds
+        if idle is None:
+            return 0
+        cutoff = time.monotonic() - idle
+        with self._lock:
+            partitions = [partition for slots in self._tenants.values() for partition in slots.values()]
+        unloaded = 0
+        for partition in partitions:
+            if partition.index is not None and partition.last_used <= cutoff:
+                unloaded += self._unload(partition, _UNLOADS_IDLE) > 0
+        if unloaded:
+            logger.info(f"Unloaded {unloaded} idle vector partitions")
+        return unloaded
+
+    def _upsert_partition(
+        self,
+        tenant: str,
+        contract_id: Optional[str],
+        vector_id: str,
+        values: List[float],
+        metadata: dict
+    ) -> None:
+        """Write one vector into its partition (blocking; runs in worker threads)"""
+        while True:
+            partition = self._partition(tenant, self._partition_for(contract_id), create=True)
+            with partition.lock:
+                if partition.dropped:
+                    continue  # Emptied and removed meanwhile: write to its replacement
+                self._resident(partition).upsert(vector_id, values, metadata)
+                self._written(partition)
+                break
+        self._after_use(partition)
+
+    def _fetch_partitions(self, partitions: list[_Partition], vector_ids: List[str]) -> dict[str, VectorSearchResult]:
+        """Look vectors up partition by partition (blocking; runs in worker threads)"""
+        found = {}
+        for partition in partitions:
+            with partition.lock:
+                index = self._resident(partition)
+                for vector_id in vector_ids:
+                    if vector_id not in found:
+                        result = index.fetch(vector_id)
+                        if result is not None:
+                            found[vector_id] = result
+            self._after_use(partition)
+            if len(found) == len(vector_ids):
+                break
+        return found
+
+    def _delete_matching(
+        self,
+        partitions: list[_Partition],
+        filters: Optional[dict],
+        vector_id: Optional[str] = None
+    ) -> int:
+        """Delete one vector, or every vector matching filters (blocking; runs in worker threads)"""
+        deleted_count = 0
+        for partition in partitions:
+            with partition.lock:
+                if partition.dropped:
+                    continue
+                index = self._resident(partition)
+                vector_ids = [vector_id] if vector_id is not None else index.matching_ids(filters)
+                deleted = sum(index.delete(matching_id) for matching_id in vector_ids)
+                if deleted:
+                    self._written(partition)
+            self._after_use(partition)
+            deleted_count += deleted
+            if vector_id is not None and deleted:
+                break
+        return deleted_count
+
+    def _resident(self, partition: _Partition) -> InMemoryIndex:
+        """A partition's index, loading it from its spill file if needed"""
+        index = partition.index
+        if index is None:
+            with partition.lock:
+                if partition.index is None:
+                    started = time.perf_counter()
+                    partition.index = InMemoryIndex.load(partition.spill_path, self.dimension)
+                    partition.dirty = False
+                    self._count(partition.tenant, "loads")
+                    _PARTITION_LOADS.inc()
+                    logger.debug(
+                        f"Loaded partition {partition.namespace} ({partition.vectors} vectors) "
+                        f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+                    )
+                index = partition.index
+        partition.last_used = time.monotonic()
+        return index
+
+    def _written(self, partition: _Partition) -> None:
+        """Record a change to a resident partition (caller holds its lock); drop it once empty"""
+        partition.vectors = len(partition.index)
+        partition.dirty = True
+        if partition.vectors:
+            return
+        partition.dropped = True
+        with self._lock:
+            slots = self._tenants.get(partition.tenant, {})
+            if slots.get(partition.slot) is partition:
+                del slots[partition.slot]
+                if not slots:
+                    del self._tenants[partition.tenant]
+        if partition.spill_path:
+            for suffix in (".npy", ".json"):
+                try:
+                    os.remove(f"{partition.spill_path}{suffix}")
+                except FileNotFoundError:
+                    pass
+
+    def _after_use(self, partition: _Partition) -> None:
+        """Hold the partition's tenant to its memory budget; spill idle partitions now and then"""
+        partition.last_used = time.monotonic()
+        if self.tenant_memory_bytes is not None:
+            with self._lock:
+                partitions = list(self._tenants.get(partition.tenant, {}).values())
+            resident = [(other, other.index) for other in partitions if other.index is not None]
+            total = sum(index.nbytes for _, index in resident)
+            # Least recently used first; the partition in use stays even if alone over budget
+            for victim, _ in sorted(resident, key=lambda item: item[0].last_used):
+                if total <= self.tenant_memory_bytes:
+                    break
+                if victim is not partition:
+                    total -= self._unload(victim, _UNLOADS_BUDGET)
+        if self.idle_unload_seconds is not None:
+            now = time.monotonic()
+            if now - self._last_sweep >= min(self.idle_unload_seconds, 60.0):
+                self._last_sweep = now
+                self.unload_idle()
+
+    def _unload(self, partition: _Partition, counter) -> int:
+        """Spill a partition to disk (written only if changed since loaded); returns bytes freed"""
+        with partition.lock:
+            index = partition.index
+            if index is None or partition.dropped:
+                return 0
+            if partition.dirty or partition.spill_path is None:
+                path = partition.spill_path or self._spill_path(partition)
+                index.save(path)
+                partition.spill_path, partition.dirty = path, False
+            partition.index = None
+        self._count(partition.tenant, "unloads")
+        counter.inc()
+        logger.debug(f"Unloaded partition {partition.namespace} ({partition.vectors} vectors)")
+        return index.nbytes
+
+    def _spill_path(self, partition: _Partition) -> str:
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix="contractguard-vectors-")
+        os.makedirs(self.spill_dir, exist_ok=True)
+        name = _SAFE_NAME.sub("_", partition.namespace)
+        return os.path.join(self.spill_dir, f"{name}-{zlib.crc32(partition.namespace.encode('utf-8')):08x}")
+
+    def _count(self, tenant: str, event: str) -> None:
+        with self._lock:
+            self._counters.setdefault(tenant, Counter())[event] += 1
+
     @staticmethod
-    def _build_filter(contract_id: str = None, risk_level: str = None, clause_category: str = None) -> dict:
+    def _build_filter(
+        contract_id: str = None,
+        risk_level: str = None,
+        clause_category: str = None,
+        organization_id: str = None
+    ) -> dict:
         """
         Helper to build metadata filters for search
         
         Args:
             contract_id: Filter by contract
+            organization_id: Filter by owning organization (portfolio search)
             risk_level: Filter by risk level
             clause_category: Filter by clause type
             
@@ -295,6 +1125,8 @@ class VectorService:
             Filter dict for Pinecone
         """
         filters = {}
+        if organization_id:
+            filters["organization_id"] = {"$eq": organization_id}
         if contract_id:
             filters["contract_id"] = {"$eq": contract_id}
         if risk_level:
@@ -0,0 +1,144 @@
+"""
+Startup Profiling - Where cold-start time goes
+Reports per-module import time for app.main and the time from process spawn
+to the first healthy /health response under uvicorn
+
+Usage:
+    python -m app.startup_profile --runs 5
+    python -m app.startup_profile --json startup.json
+"""
+
+from typing import Optional
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_profile(module: str = "app.main") -> list[dict]:
+    """
+    Import a module in a fresh interpreter with -X importtime
+
+    Args:
+        module: Module to import
+
+    Returns:
+        One record per imported module: name, self_ms, cumulative_ms, depth
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({
+                "module": name,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": len(indent) // 2,
+            })
+    return modules
+
+
+def by_package(modules: list[dict]) -> dict[str, float]:
+    """Self import time summed per top-level package (app modules kept separate)"""
+    totals: dict[str, float] = {}
+    for record in modules:
+        parts = record["module"].split(".")
+        package = ".".join(parts[:2]) if parts[0] == "app" else parts[0]
+        totals[package] = totals.get(package, 0.0) + record["self_ms"]
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_healthy(timeout: float = 60.0) -> dict:
+    """
+    Spawn uvicorn with app.main:app and poll /health until it returns 200
+
+    Returns:
+        Milliseconds to the first HTTP response, to the first healthy
+        response, and the warmup time the app reported
+    """
+    port = _free_port()
+    env = {**os.environ, "OTLP_ENDPOINT": ""}
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    first_response_ms = None
+    try:
+        while time.perf_counter() - started < timeout:
+            request = urllib.request.Request(f"http://127.0.0.1:{port}/health", headers={"Host": "localhost"})
+            try:
+                with urllib.request.urlopen(request, timeout=1.0) as response:
+                    body = json.loads(response.read())
+                    elapsed = (time.perf_counter() - started) * 1000
+                    return {
+                        "first_response_ms": first_response_ms or elapsed,
+                        "healthy_ms": elapsed,
+                        "warmup_ms": body.get("warmup_ms"),
+                    }
+            except urllib.error.HTTPError:
+                first_response_ms = first_response_ms or (time.perf_counter() - started) * 1000
+            except (urllib.error.URLError, ConnectionError, TimeoutError):
+                pass
+            time.sleep(0.005)
+        raise TimeoutError(f"app not healthy after {timeout:.0f}s")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Profile ContractGuard API cold start")
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts to measure (median reported)")
+    parser.add_argument("--top", type=int, default=15, help="Slowest packages to list")
+    parser.add_argument("--json", default=None, help="Write the full report here")
+    args = parser.parse_args(argv)
+
+    modules = import_profile()
+    total_ms = next((m["cumulative_ms"] for m in modules if m["module"] == "app.main"), 0.0)
+    packages = by_package(modules)
+    print(f"import app.main: {total_ms:.1f}ms across {len(modules)} modules")
+    for package, self_ms in list(packages.items())[:args.top]:
+        print(f"  {package:<40} {self_ms:8.1f}ms")
+
+    runs = [time_to_healthy() for _ in range(args.runs)]
+    healthy = statistics.median(run["healthy_ms"] for run in runs)
+    first = statistics.median(run["first_response_ms"] for run in runs)
+    print(f"\nspawn -> first response: {first:.0f}ms, -> healthy: {healthy:.0f}ms (median of {len(runs)})")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "import_ms": total_ms,
+                "packages_ms": packages,
+                "modules": modules,
+                "runs": runs,
+                "healthy_ms": healthy,
+            }, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
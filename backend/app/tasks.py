@@ -0,0 +1,592 @@
+"""
+Background Jobs - Prioritized in-process job queue for contract analysis
+Replaces the Celery worker: jobs run on an async worker pool inside the API process
+
+Scheduling:
+- Strict priority between levels (interactive uploads before bulk backfills)
+- Round-robin between tenants within a level, so one organization's
+  backfill cannot starve another's uploads
+- Identical submissions (same dedup key) share one job
+- Failed attempts are retried with exponential backoff
+"""
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field, asdict
+from enum import Enum, IntEnum
+from typing import Any, Awaitable, Callable, Optional
+import asyncio
+import json
+import logging
+import time
+import uuid
+
+from app.deadlines import deadline
+from app.services.dashboard_store import ContractSummary
+from app.services.llm_service import RiskLevel
+from app.services.term_extractor import extract_terms
+
+logger = logging.getLogger(__name__)
+
+
+class JobPriority(IntEnum):
+    """Lower value runs first"""
+    INTERACTIVE = 0
+    DEFAULT = 5
+    BULK = 10
+
+
+class JobStatus(str, Enum):
+    """Job lifecycle states"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    RETRYING = "retrying"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """A unit of background work and its observable progress"""
+    id: str
+    kind: str
+    tenant_id: str
+    priority: JobPriority
+    payload: dict
+    dedup_key: Optional[str] = None
+    status: JobStatus = JobStatus.QUEUED
+    progress: float = 0.0
+    stage: Optional[str] = None
+    attempts: int = 0
+    max_attempts: int = 3
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    def report(self, progress: float, stage: Optional[str] = None) -> None:
+        """Record handler progress (0-1) and the current stage name"""
+        self.progress = max(self.progress, min(progress, 1.0))
+        if stage:
+            self.stage = stage
+
+    def to_dict(self, include_payload: bool = False) -> dict:
+        data = asdict(self)
+        data["priority"] = self.priority.name.lower()
+        data["status"] = self.status.value
+        if not include_payload:
+            data.pop("payload")
+        return data
+
+
+JobHandler = Callable[[Job, Any], Awaitable[Any]]
+
+
+class InMemoryJobStore:
+    """Job records and dedup keys held in process memory"""
+
+    shared = False  # Whether other processes read the records (progress must be written through)
+
+    def __init__(self, max_finished: int = 10000):
+        self.max_finished = max_finished
+        self._jobs: dict[str, Job] = {}
+        self._dedup: dict[str, str] = {}
+        self._contracts: dict[str, str] = {}  # contract_id -> id of the job that claimed a dedup key for it
+        self._finished: OrderedDict[str, None] = OrderedDict()
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        job = self._jobs.get(job_id)
+        return job.to_dict() if job else None
+
+    async def claim(self, job: Job) -> Optional[str]:
+        """Register a job; returns the id of an existing job with the same dedup key"""
+        if job.dedup_key:
+            existing = self._dedup.get(job.dedup_key)
+            if existing and existing in self._jobs and self._jobs[existing].status != JobStatus.FAILED:
+                return existing
+            self._dedup[job.dedup_key] = job.id
+            if job.payload.get("contract_id"):
+                self._contracts[job.payload["contract_id"]] = job.id
+        self._jobs[job.id] = job
+        return None
+
+    async def forget_contract(self, contract_id: str) -> bool:
+        """Drop the dedup key of the job that analysed a contract, so its content can be submitted again"""
+        job = self._jobs.get(self._contracts.pop(contract_id, ""))
+        if job is None or self._dedup.get(job.dedup_key) != job.id:
+            return False
+        del self._dedup[job.dedup_key]
+        return True
+
+    async def save(self, job: Job) -> None:
+        if job.done:
+            self._finished[job.id] = None
+            while len(self._finished) > self.max_finished:
+                evicted, _ = self._finished.popitem(last=False)
+                stale = self._jobs.pop(evicted, None)
+                if stale and stale.dedup_key and self._dedup.get(stale.dedup_key) == evicted:
+                    del self._dedup[stale.dedup_key]
+                if stale and self._contracts.get(stale.payload.get("contract_id")) == evicted:
+                    del self._contracts[stale.payload["contract_id"]]
+
+    def local(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+
+class RedisJobStore(InMemoryJobStore):
+    """
+    Job records mirrored to Redis so any API process can answer status polls
+
+    Dedup keys are claimed with SET NX, so identical submissions landing
+    on different processes still collapse into one job. Jobs running in
+    this process are answered from memory (their progress is ahead of the
+    mirrored record); the queue writes progress through while they run.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, ttl_seconds: int = 86400, max_finished: int = 10000):
+        super().__init__(max_finished=max_finished)
+        import redis.asyncio as redis
+        self.redis = redis.from_url(url, decode_responses=True)
+        self.ttl_seconds = ttl_seconds
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        job = self.local(job_id)
+        if job is not None and not job.done:
+            return job.to_dict()
+        raw = await self.redis.get(f"job:{job_id}")
+        return json.loads(raw) if raw else await super().get(job_id)
+
+    async def claim(self, job: Job) -> Optional[str]:
+        if job.dedup_key:
+            key = f"job-dedup:{job.dedup_key}"
+            if not await self.redis.set(key, job.id, nx=True, ex=self.ttl_seconds):
+                existing = await self.redis.get(key)
+                record = await self.get(existing) if existing else None
+                if record and record["status"] != JobStatus.FAILED.value:
+                    return existing
+                await self.redis.set(key, job.id, ex=self.ttl_seconds)
+            if job.payload.get("contract_id"):
+                await self.redis.set(f"job-contract:{job.payload['contract_id']}", job.id, ex=self.ttl_seconds)
+        await super().claim(job)
+        await self.save(job)
+        return None
+
+    async def forget_contract(self, contract_id: str) -> bool:
+        await super().forget_contract(contract_id)
+        contract_key = f"job-contract:{contract_id}"
+        job_id = await self.redis.get(contract_key)
+        await self.redis.delete(contract_key)
+        record = await self.get(job_id) if job_id else None
+        if not record or not record.get("dedup_key"):
+            return False
+        key = f"job-dedup:{record['dedup_key']}"
+        # Only while the key still names this contract's job (a later upload may have claimed it)
+        if await self.redis.get(key) != job_id:
+            return False
+        await self.redis.delete(key)
+        return True
+
+    async def save(self, job: Job) -> None:
+        await super().save(job)
+        await self.redis.set(f"job:{job.id}", json.dumps(job.to_dict()), ex=self.ttl_seconds)
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+class JobQueue:
+    """
+    Async worker pool with priorities, per-tenant fairness and retries
+
+    Responsibilities:
+    - Accept submissions and deduplicate identical ones
+    - Dispatch jobs by priority, round-robin across tenants
+    - Retry failures with exponential backoff
+    - Expose job status and progress
+    """
+
+    def __init__(
+        self,
+        handlers: dict[str, JobHandler],
+        context: Any = None,
+        concurrency: int = 4,
+        store: Optional[InMemoryJobStore] = None,
+        retry_backoff: float = 2.0,
+        attempt_timeout: Optional[float] = None,
+        progress_interval: float = 1.0
+    ):
+        """
+        Initialize job queue
+
+        Args:
+            handlers: Job kind -> async handler(job, context)
+            context: Object passed to every handler (the service container)
+            concurrency: Worker tasks
+            store: Job record store (in-memory by default)
+            retry_backoff: Base delay in seconds before the first retry
+            attempt_timeout: Deadline for each attempt; outbound calls made by
+                the handler are bounded by what is left of it
+            progress_interval: Seconds between progress writes to a shared
+                store while a job runs (at most one write per interval)
+        """
+        self.handlers = handlers
+        self.context = context
+        self.concurrency = concurrency
+        self.store = store or InMemoryJobStore()
+        self.retry_backoff = retry_backoff
+        self.attempt_timeout = attempt_timeout
+        self.progress_interval = progress_interval
+        # priority -> tenant -> jobs; tenant order rotates for fairness
+        self._pending: dict[int, dict[str, deque]] = {}
+        self._tenant_order: dict[int, deque] = {}
+        self._wakeup = asyncio.Event()
+        self._workers: list[asyncio.Task] = []
+        self._retries: dict[str, asyncio.TimerHandle] = {}
+        self._running = 0
+
+    async def submit(
+        self,
+        kind: str,
+        payload: dict,
+        tenant_id: str,
+        priority: JobPriority = JobPriority.DEFAULT,
+        dedup_key: Optional[str] = None,
+        max_attempts: int = 3
+    ) -> dict:
+        """
+        Enqueue a job (or return the existing job for the same dedup key)
+
+        Args:
+            kind: Registered handler name
+            payload: Handler input
+            tenant_id: Organization the job belongs to
+            priority: Scheduling priority
+            dedup_key: Identity of the work; identical keys share a job
+            max_attempts: Attempts before the job is marked failed
+
+        Returns:
+            Job record ("deduplicated": True when an existing job was returned)
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        job = Job(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            tenant_id=tenant_id,
+            priority=JobPriority(priority),
+            payload=payload,
+            dedup_key=f"{kind}:{dedup_key}" if dedup_key else None,
+            max_attempts=max_attempts,
+        )
+        existing = await self.store.claim(job)
+        if existing:
+            logger.info(f"Deduplicated {kind} job for tenant {tenant_id} onto {existing}")
+            return {**await self.store.get(existing), "deduplicated": True}
+
+        self._enqueue(job)
+        logger.info(f"Queued {kind} job {job.id} for tenant {tenant_id} at {job.priority.name}")
+        return job.to_dict()
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        """Current status/progress of a job"""
+        return await self.store.get(job_id)
+
+    async def forget_contract(self, contract_id: str) -> bool:
+        """
+        Stop deduplicating against the job that analysed a deleted contract
+
+        Without this, re-uploading the same content after a DELETE would
+        return the old job, whose contract no longer exists.
+        """
+        return await self.store.forget_contract(contract_id)
+
+    def start(self) -> None:
+        """Start worker tasks (call from within the running event loop)"""
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        """Cancel workers and pending retries; queued jobs are dropped with the process"""
+        for handle in self._retries.values():
+            handle.cancel()
+        self._retries.clear()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if isinstance(self.store, RedisJobStore):
+            await self.store.close()
+
+    def stats(self) -> dict:
+        """Queue depth per priority and busy workers"""
+        return {
+            "workers": self.concurrency,
+            "running": self._running,
+            "queued": {
+                JobPriority(priority).name.lower(): sum(len(jobs) for jobs in tenants.values())
+                for priority, tenants in self._pending.items()
+            },
+        }
+
+    def _enqueue(self, job: Job) -> None:
+        tenants = self._pending.setdefault(job.priority, {})
+        order = self._tenant_order.setdefault(job.priority, deque())
+        if job.tenant_id not in tenants:
+            tenants[job.tenant_id] = deque()
+            order.append(job.tenant_id)
+        tenants[job.tenant_id].append(job)
+        self._wakeup.set()
+
+    def _next(self) -> Optional[Job]:
+        for priority in sorted(self._pending):
+            tenants, order = self._pending[priority], self._tenant_order[priority]
+            if not order:
+                continue
+            tenant_id = order.popleft()
+            jobs = tenants[tenant_id]
+            job = jobs.popleft()
+            if jobs:
+                order.append(tenant_id)
+            else:
+                del tenants[tenant_id]
+            return job
+        return None
+
+    async def _worker(self, number: int) -> None:
+        while True:
+            job = self._next()
+            if job is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Job) -> None:
+        job.status = JobStatus.RUNNING
+        job.attempts += 1
+        job.started_at = job.started_at or time.time()
+        await self.store.save(job)
+        self._running += 1
+        reporter = None
+        if self.store.shared:
+            reporter = asyncio.create_task(self._write_progress(job, (job.progress, job.stage)))
+        try:
+            with deadline(self.attempt_timeout):
+                job.result = await self.handlers[job.kind](job, self.context)
+            job.status = JobStatus.SUCCEEDED
+            job.progress = 1.0
+            job.error = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.error = str(e)
+            if job.attempts < job.max_attempts:
+                delay = self.retry_backoff * 2 ** (job.attempts - 1)
+                job.status = JobStatus.RETRYING
+                logger.warning(f"Job {job.id} attempt {job.attempts} failed ({e}); retrying in {delay:.1f}s")
+                self._retries[job.id] = asyncio.get_running_loop().call_later(delay, self._retry, job)
+            else:
+                job.status = JobStatus.FAILED
+                logger.error(f"Job {job.id} failed after {job.attempts} attempts: {str(e)}")
+        finally:
+            self._running -= 1
+            if reporter:
+                reporter.cancel()
+        if job.done:
+            job.finished_at = time.time()
+        await self.store.save(job)
+
+    def _retry(self, job: Job) -> None:
+        self._retries.pop(job.id, None)
+        self._enqueue(job)
+
+    async def _write_progress(self, job: Job, written: tuple) -> None:
+        """Mirror a running job's progress to the shared store when it changes from what was written"""
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            if (job.progress, job.stage) != written:
+                written = (job.progress, job.stage)
+                try:
+                    await self.store.save(job)
+                except Exception as e:
+                    logger.warning(f"Failed to record progress of job {job.id}: {str(e)}")
+
+
+# Job Handlers
+
+
+async def _cancel_pending(*tasks: asyncio.Future) -> None:
+    """Cancel tasks that are still running and wait until they have stopped"""
+    pending = [task for task in tasks if not task.done()]
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _gather_or_cancel(*aws: Awaitable) -> list:
+    """asyncio.gather, except that the first failure cancels the others and waits for them"""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        await _cancel_pending(*tasks)
+        raise
+
+
+async def analyze_contract(job: Job, services) -> dict:
+    """
+    Full contract analysis: extraction streams into embedding, LLM prompts
+    start as soon as the last page is extracted, and clause extraction
+    follows embedding (chunks the local classifier is sure of skip the LLM).
+    Dates and renewal terms are extracted deterministically and scheduled
+    as alerts; the result is folded into the organization's dashboard.
+    A near-duplicate of an analysed contract reuses that contract's
+    embeddings and clauses, sending only changed chunks to the LLM (and
+    above judgement_threshold, for the same vendor, its summary and scores).
+
+    Payload:
+        contract_id, organization_id, document_key (stored upload) or
+        text (already extracted), content_type, vendor (optional)
+    """
+    payload = job.payload
+    llm, rag = services.llm_service, services.rag_service
+    page_texts: list[str] = []
+    extracted = asyncio.Event()
+
+    async def pages():
+        if "text" in payload:
+            page_texts.append(payload["text"])
+            yield payload["text"]
+        else:
+            async for page in services.ocr_service.extract_pages(payload["document_key"], payload.get("content_type")):
+                page_texts.append(page.text)
+                job.report(0.3 * page.number / page.total, "extracting")
+                yield page.text
+        extracted.set()
+
+    job.report(0.0, "extracting")
+    ingest = asyncio.create_task(rag.ingest_pages(
+        payload["contract_id"], pages(), {"organization_id": payload["organization_id"]}
+    ))
+    extraction_done = asyncio.create_task(extracted.wait())
+    try:
+        await asyncio.wait({ingest, extraction_done}, return_when=asyncio.FIRST_COMPLETED)
+        if not extracted.is_set():
+            await ingest  # raises the extraction/ingest error
+            raise RuntimeError("Page stream ended without completing extraction")
+
+        text = "\n".join(page_texts)
+        terms = extract_terms(text)
+        services.alert_scheduler.schedule_contract(
+            payload["contract_id"], payload["organization_id"], terms, vendor=payload.get("vendor")
+        )
+        stages = {"summary": 0.1, "risk": 0.1, "clauses": 0.15, "obligations": 0.15, "embedding": 0.2}
+
+        # A near-duplicate the organization already analysed (templated paper)
+        # lends its analysis: only chunks it did not contain go to the LLM
+        dedup, signature, duplicate = rag.near_duplicates, None, None
+        if dedup is not None:
+            signature = await asyncio.to_thread(dedup.signature, text)
+            duplicate = dedup.nearest(payload["organization_id"], signature, exclude=payload["contract_id"])
+        judged = (
+            duplicate is not None
+            and duplicate.similarity >= dedup.judgement_threshold
+            and duplicate.vendor == payload.get("vendor")
+        )
+
+        async def stage(name: str, work: Awaitable) -> Any:
+            result = await work
+            job.report(job.progress + stages[name], name)
+            return result
+
+        async def summarize() -> str:
+            if judged:
+                return duplicate.result["summary"]
+            return await llm.summarize_contract(text, payload.get("vendor"))
+
+        async def risk() -> tuple[RiskLevel, int, int]:
+            if judged:
+                prior = duplicate.result
+                return RiskLevel(prior["risk_level"]), prior["risk_score"], prior.get("compliance_score")
+            return await llm.analyze_risk(text)
+
+        async def clauses() -> list[dict]:
+            # Chunks are labelled as they are embedded; only uncertain ones go to the LLM
+            _, chunks = await ingest
+            if duplicate is None:
+                return await rag.extract_clauses(chunks, text)
+            # The near-duplicate's clauses whose quote is still in the text are kept
+            flat = " ".join(text.lower().split())
+            kept = [
+                {**clause, "source": "reused"}
+                for clause in duplicate.result["key_clauses"]
+                if clause.get("quote") and " ".join(clause["quote"].lower().split()) in flat
+            ]
+            changed = [chunk for chunk in chunks if not chunk.get("reused")]
+            quotes = {clause["quote"] for clause in kept}
+            fresh = await rag.extract_clauses(changed) if changed else []
+            return kept + [clause for clause in fresh if clause.get("quote") not in quotes]
+
+        async def obligations() -> list[dict]:
+            if duplicate is None:
+                return await llm.identify_obligations(text)
+            _, chunks = await ingest
+            changed = "\n\n".join(chunk["text"] for chunk in chunks if not chunk.get("reused"))
+            fresh = await llm.identify_obligations(changed) if changed else []
+            # Obligations carry no position, so the near-duplicate's are kept; new ones win on equal descriptions
+            merged = {
+                (obligation.get("description") or "").lower(): obligation
+                for obligation in duplicate.result["obligations"] + fresh
+            }
+            return list(merged.values())
+
+        stage_results = await _gather_or_cancel(
+            stage("summary", summarize()),
+            stage("risk", risk()),
+            stage("clauses", clauses()),
+            stage("obligations", obligations()),
+            stage("embedding", ingest),
+        )
+    finally:
+        # A failed stage must not leave ingest running: a retry would embed the contract a second time
+        await _cancel_pending(ingest, extraction_done)
+    summary, (risk_level, risk_score, compliance_score), key_clauses, obligations, (_, chunks) = stage_results
+
+    result = {
+        "contract_id": payload["contract_id"],
+        "pages": len(page_texts),
+        "summary": summary,
+        "risk_level": risk_level.value,
+        "risk_score": risk_score,
+        "compliance_score": compliance_score,
+        "key_clauses": key_clauses,
+        "obligations": obligations,
+        "renewal_date": terms.renewal_date.isoformat() if terms.renewal_date else None,
+        "auto_renews": terms.auto_renews,
+        "terms": terms.to_dict(),
+        "vectors": len(chunks),
+        "near_duplicate": {
+            "contract_id": duplicate.contract_id,
+            "similarity": round(duplicate.similarity, 3),
+            "reused_embeddings": sum(1 for chunk in chunks if chunk.get("reused")),
+            "reused_judgements": judged,
+        } if duplicate else None,
+    }
+    if dedup is not None:
+        dedup.add(payload["contract_id"], payload["organization_id"], signature, result, payload.get("vendor"))
+    await asyncio.to_thread(
+        services.dashboard_store.record,
+        ContractSummary.from_analysis(payload["organization_id"], result, payload.get("vendor")),
+    )
+    return result
+
+
+HANDLERS: dict[str, JobHandler] = {
+    "analyze_contract": analyze_contract,
+}
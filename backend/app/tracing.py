@@ -0,0 +1,338 @@
+"""
+Tracing - Per-request spans across RAG, LLM and vector calls
+contextvars-based, summarised in a Server-Timing header, optionally exported over OTLP/HTTP
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+import asyncio
+import functools
+import inspect
+import logging
+import os
+import time
+
+from app.metrics import is_callable_member
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: Optional[int] = None
+    attributes: dict = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+
+@dataclass
+class Trace:
+    """All spans recorded while handling one request"""
+    trace_id: str
+    spans: list[Span] = field(default_factory=list)
+
+    def stage_timings(self) -> dict[str, float]:
+        """Total milliseconds per span name (repeated calls are summed)"""
+        timings: dict[str, float] = {}
+        for span in self.spans:
+            if span.end_ns is not None and span.parent_id is not None:
+                timings[span.name] = timings.get(span.name, 0.0) + span.duration_ms
+        return timings
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("contractguard_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("contractguard_span", default=None)
+
+
+def current_trace_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.trace_id if trace else None
+
+
+@contextmanager
+def start_trace(name: str, trace_id: Optional[str] = None, **attributes):
+    """
+    Open a trace with a root span (one per request or background job)
+
+    Args:
+        name: Root span name
+        trace_id: 32-hex trace id to continue (e.g. from traceparent)
+        **attributes: Root span attributes
+
+    Yields:
+        The Trace collecting spans
+    """
+    trace = Trace(trace_id=trace_id or os.urandom(16).hex())
+    root = Span(name, trace.trace_id, os.urandom(8).hex(), None, time.time_ns(), attributes=attributes)
+    trace.spans.append(root)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(root)
+    try:
+        yield trace
+    except BaseException as e:
+        root.error = repr(e)
+        raise
+    finally:
+        root.end_ns = time.time_ns()
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+
+
+@contextmanager
+def span(name: str, activate: bool = True, **attributes):
+    """
+    Record a nested span under the current one (no-op outside a trace)
+
+    Works in sync and async code; asyncio tasks and to_thread workers
+    inherit the current span through contextvars.
+
+    Args:
+        name: Span name, e.g. "vector.search"
+        activate: Make this the parent of spans opened inside it; async
+            generators pass False since their body runs in the consumer's context
+        **attributes: Span attributes
+
+    Yields:
+        The Span, or None when no trace is active
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    current = Span(
+        name, trace.trace_id, os.urandom(8).hex(),
+        parent.span_id if parent else None, time.time_ns(), attributes=attributes
+    )
+    trace.spans.append(current)
+    token = _current_span.set(current) if activate else None
+    try:
+        yield current
+    except BaseException as e:
+        current.error = repr(e)
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        if token is not None:
+            _current_span.reset(token)
+
+
+def trace_service(service, name: str, private: tuple = ()):
+    """
+    Record a span for every public async method of a service instance
+
+    Args:
+        service: Service instance
+        name: Span name prefix ("llm", "vector", "rag")
+        private: Underscore methods to trace as well (e.g. "_call_gpt")
+
+    Returns:
+        The same service instance
+    """
+    for method_name, method in inspect.getmembers(service, predicate=is_callable_member):
+        if method_name.startswith("_") and method_name not in private:
+            continue
+        span_name = f"{name}.{method_name.lstrip('_')}"
+        if inspect.iscoroutinefunction(method):
+            setattr(service, method_name, _traced_coroutine(method, span_name))
+        elif inspect.isasyncgenfunction(method):
+            setattr(service, method_name, _traced_async_generator(method, span_name))
+        elif method_name in private:
+            setattr(service, method_name, _traced_function(method, span_name))
+    return service
+
+
+def _call_attributes(kwargs: dict) -> dict:
+    """Scalar keyword arguments (top_k, contract_id, ...) as span attributes"""
+    return {
+        key: value
+        for key, value in kwargs.items()
+        if isinstance(value, (bool, int, float)) or (isinstance(value, str) and len(value) <= 64)
+    }
+
+
+def _traced_coroutine(method, span_name: str):
+    @functools.wraps(method)
+    async def traced(*args, **kwargs):
+        if _current_trace.get() is None:
+            return await method(*args, **kwargs)
+        with span(span_name, **_call_attributes(kwargs)):
+            return await method(*args, **kwargs)
+    return traced
+
+
+def _traced_async_generator(method, span_name: str):
+    @functools.wraps(method)
+    async def traced(*args, **kwargs):
+        with span(span_name, activate=False, **_call_attributes(kwargs)):
+            async for item in method(*args, **kwargs):
+                yield item
+    return traced
+
+
+def _traced_function(method, span_name: str):
+    @functools.wraps(method)
+    def traced(*args, **kwargs):
+        if _current_trace.get() is None:
+            return method(*args, **kwargs)
+        with span(span_name, **_call_attributes(kwargs)):
+            return method(*args, **kwargs)
+    return traced
+
+
+def server_timing(trace: Trace, total_ms: float) -> str:
+    """Server-Timing header value: one metric per stage plus the total"""
+    metrics = [
+        f"{name.replace('.', '-')};dur={duration:.1f}"
+        for name, duration in sorted(trace.stage_timings().items(), key=lambda item: -item[1])
+    ]
+    metrics.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(metrics)
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening a trace per HTTP request
+
+    Continues the trace id of an incoming W3C traceparent header, adds
+    Server-Timing and X-Trace-Id response headers and hands the finished
+    trace to app.state.trace_exporter, if one is configured.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        parent = headers.get(b"traceparent", b"").decode("latin-1").split("-")
+        trace_id = parent[1] if len(parent) == 4 and len(parent[1]) == 32 else None
+        started = time.perf_counter()
+
+        with start_trace(f"{scope['method']} {scope['path']}", trace_id, route=scope["path"]) as trace:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    total_ms = (time.perf_counter() - started) * 1000
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [
+                        (b"server-timing", server_timing(trace, total_ms).encode("latin-1")),
+                        (b"x-trace-id", trace.trace_id.encode("latin-1")),
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+        exporter = getattr(scope["app"].state, "trace_exporter", None) if "app" in scope else None
+        if exporter is not None:
+            exporter.submit(trace)
+
+
+class OTLPExporter:
+    """
+    Batches finished traces to an OTLP/HTTP JSON collector
+
+    Export is best-effort: a bounded queue drops traces under pressure
+    rather than slowing requests down.
+    """
+
+    def __init__(self, endpoint: str, http_client, service_name: str = "contractguard-api",
+                 batch_size: int = 64, flush_interval: float = 2.0, max_queue: int = 2048):
+        """
+        Initialize exporter
+
+        Args:
+            endpoint: Collector traces URL (e.g. http://localhost:4318/v1/traces)
+            http_client: Pooled httpx.AsyncClient
+            service_name: service.name resource attribute
+            batch_size: Traces per export request
+            flush_interval: Seconds between flushes
+            max_queue: Traces buffered before new ones are dropped
+        """
+        self.endpoint = endpoint
+        self.http_client = http_client
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+    def submit(self, trace: Trace) -> None:
+        try:
+            self._queue.put_nowait(trace)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        await self._flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self._flush()
+
+    async def _flush(self) -> None:
+        while not self._queue.empty():
+            batch = []
+            while not self._queue.empty() and len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+            try:
+                await self.http_client.post(self.endpoint, json=self._payload(batch), timeout=5.0)
+            except Exception as e:
+                logger.warning(f"OTLP export of {len(batch)} traces failed: {str(e)}")
+
+    def _payload(self, traces: list[Trace]) -> dict:
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "contractguard.tracing"},
+                    "spans": [
+                        {
+                            "traceId": span.trace_id,
+                            "spanId": span.span_id,
+                            **({"parentSpanId": span.parent_id} if span.parent_id else {}),
+                            "name": span.name,
+                            "kind": 2 if span.parent_id is None else 1,
+                            "startTimeUnixNano": str(span.start_ns),
+                            "endTimeUnixNano": str(span.end_ns or span.start_ns),
+                            "attributes": [_attribute(key, value) for key, value in span.attributes.items()],
+                            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+                        }
+                        for trace in traces
+                        for span in trace.spans
+                    ],
+                }],
+            }]
+        }
+
+
+def _attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
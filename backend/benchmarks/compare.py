@@ -0,0 +1,84 @@
+"""
+Benchmark Comparison - Flag latency and throughput regressions between two result files
+
+Usage:
+    python -m benchmarks.compare benchmarks/results/baseline.json benchmarks/results/latest.json
+"""
+
+from typing import Optional
+import argparse
+import json
+import sys
+
+# Metrics compared per case, and whether higher is better
+COMPARED_METRICS = {"p50_ms": False, "p95_ms": False, "throughput": True}
+
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline: dict, current: dict, tolerance: float = 0.15) -> list[dict]:
+    """
+    Compare every case present in both runs
+
+    Args:
+        baseline: Earlier results document
+        current: New results document
+        tolerance: Relative change tolerated before a metric counts as regressed
+
+    Returns:
+        One row per (case, metric) with the relative change and a regression flag
+    """
+    previous = {result["case"]: result for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        before = previous.get(result["case"])
+        if before is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            rows.append({
+                "case": result["case"],
+                "metric": metric,
+                "baseline": old,
+                "current": new,
+                "change": change,
+                "regression": worse > tolerance,
+            })
+    return rows
+
+
+def format_rows(rows: list[dict]) -> str:
+    width = max((len(row["case"]) for row in rows), default=10)
+    lines = [f"{'case':<{width}}  {'metric':<10} {'baseline':>12} {'current':>12} {'change':>8}"]
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        lines.append(
+            f"{row['case']:<{width}}  {row['metric']:<10} {row['baseline']:>12.3f} "
+            f"{row['current']:>12.3f} {row['change']:>+7.1%}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline", help="Earlier results JSON")
+    parser.add_argument("current", help="New results JSON")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Relative slowdown tolerated (default: 0.15)")
+    args = parser.parse_args(argv)
+
+    rows = compare(load(args.baseline), load(args.current), args.tolerance)
+    print(format_rows(rows))
+    regressions = [row for row in rows if row["regression"]]
+    print(f"\n{len(regressions)} regression(s) across {len({row['case'] for row in rows})} case(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Synthetic Contract Corpus - Deterministic contracts for benchmarks and load tests
+"""
+
+import random
+
+COUNTERPARTIES = ["Acme Corp", "Globex", "Initech", "Umbrella Ltd", "Hooli", "Stark Industries", "Wayne Enterprises", "Soylent"]
+
+SECTIONS = {
+    "Term and Renewal": [
+        "This Agreement commences on {date} and continues for an initial term of {months} months.",
+        "This Agreement shall automatically renew for successive {renew}-month periods unless either party gives notice.",
+        "Either party may prevent renewal by written notice at least {notice} days prior to the end of the then-current term.",
+    ],
+    "Payment Terms": [
+        "Customer shall pay all invoices within {net} days of receipt.",
+        "Fees are ${fee} per month, payable in advance.",
+        "Late payments accrue interest at {interest}% per month or the maximum rate permitted by law.",
+    ],
+    "Limitation of Liability": [
+        "Neither party's aggregate liability shall exceed the fees paid in the {cap} months preceding the claim.",
+        "In no event shall either party be liable for indirect, incidental or consequential damages.",
+        "The foregoing limitations do not apply to breaches of confidentiality or indemnification obligations.",
+    ],
+    "Confidentiality": [
+        "Each party shall protect the other's Confidential Information with at least reasonable care.",
+        "Confidentiality obligations survive for {years} years after termination.",
+        "Confidential Information excludes information that is publicly available through no fault of the recipient.",
+    ],
+    "Termination": [
+        "Either party may terminate this Agreement for material breach not cured within {cure} days of notice.",
+        "{party} may terminate for convenience on {notice} days written notice.",
+        "Upon termination Customer shall pay all fees accrued through the termination date.",
+    ],
+    "Indemnification": [
+        "{party} shall indemnify Customer against third-party claims alleging infringement of intellectual property.",
+        "The indemnified party shall give prompt notice of any claim and reasonable cooperation.",
+    ],
+    "Warranties": [
+        "{party} warrants that the services will be performed in a professional and workmanlike manner.",
+        "Except as expressly stated, all warranties, express or implied, are disclaimed.",
+    ],
+    "Data Protection and Compliance": [
+        "{party} shall comply with all applicable data protection laws including GDPR.",
+        "{party} shall notify Customer of any personal data breach within {breach} hours.",
+        "Customer may audit compliance once per year on {notice} days notice.",
+    ],
+}
+
+
+def generate_contract(index: int, seed: int = 7) -> str:
+    """
+    Build one synthetic contract
+
+    Args:
+        index: Contract number (also varies the content)
+        seed: Corpus seed
+
+    Returns:
+        Contract text with numbered section headings
+    """
+    rng = random.Random(seed * 1_000_003 + index)
+    party = COUNTERPARTIES[index % len(COUNTERPARTIES)]
+    values = {
+        "party": party,
+        "date": f"20{rng.randint(20, 26)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "months": rng.choice([12, 24, 36]),
+        "renew": rng.choice([12, 24]),
+        "notice": rng.choice([30, 60, 90]),
+        "net": rng.choice([15, 30, 45, 60]),
+        "fee": rng.randint(500, 50000),
+        "interest": rng.choice([1, 1.5, 2]),
+        "cap": rng.choice([6, 12, 24]),
+        "years": rng.choice([2, 3, 5]),
+        "cure": rng.choice([15, 30]),
+        "breach": rng.choice([24, 48, 72]),
+    }
+
+    titles = list(SECTIONS)
+    rng.shuffle(titles)
+    lines = [f"MASTER SERVICES AGREEMENT between {party} and Customer (Contract {index})", ""]
+    for number, title in enumerate(titles[:rng.randint(5, len(titles))], start=1):
+        lines.append(f"{number}. {title}")
+        sentences = SECTIONS[title]
+        lines.append(" ".join(sentence.format(**values) for sentence in rng.sample(sentences, k=len(sentences))))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def generate_corpus(size: int, organizations: int = 10, seed: int = 7) -> list[dict]:
+    """
+    Build a corpus of contracts spread round-robin over organizations
+
+    Args:
+        size: Number of contracts
+        organizations: Distinct organization_ids
+        seed: Corpus seed
+
+    Returns:
+        Dicts with contract_id, organization_id and text
+    """
+    return [
+        {
+            "contract_id": f"contract-{i:05d}",
+            "organization_id": f"org-{i % organizations:03d}",
+            "text": generate_contract(i, seed),
+        }
+        for i in range(size)
+    ]
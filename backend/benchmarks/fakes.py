@@ -0,0 +1,104 @@
+"""
+Fake Backends - Deterministic, optionally slow stand-ins for OpenAI and Pinecone
+Used by the benchmark suite and the load-test harness
+"""
+
+import asyncio
+import json
+import re
+import time
+import zlib
+
+import numpy as np
+
+from app.services.llm_service import LLMService
+from app.services.vector_service import VectorService
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and any are as at be by do does each for from how in is it its of on or per "
+    "shall that the then this to what when which who with".split()
+)
+
+CANNED_RESPONSE = json.dumps({
+    "risk_level": "Medium",
+    "risk_score": 42,
+    "compliance_score": 71,
+    "primary_risks": ["auto-renewal", "uncapped liability"],
+    "reasoning": "Synthetic benchmark response",
+    "clauses": [{"category": "renewal", "quote": "renews automatically", "explanation": "", "risk_level": "Medium", "implications": ""}],
+    "obligations": [{"description": "Pay invoices within 30 days", "party": "Customer", "due_date": None, "consequence": "", "priority": "Medium"}],
+    "key_dates": [],
+})
+
+
+def hash_embedding(text: str, dimension: int = 1536, shared: float = 0.65) -> np.ndarray:
+    """
+    Feature-hashed bag-of-words embedding
+
+    Deterministic and cheap. Texts sharing words score as similar, and a
+    component common to every text gives unrelated texts a cosine of about
+    0.65, as in real embedding spaces, so the 0.7 retrieval threshold
+    separates related chunks from the rest.
+
+    Args:
+        text: Text to embed
+        dimension: Embedding dimension
+        shared: Squared weight of the common component
+
+    Returns:
+        Unit-length float32 vector
+    """
+    words = np.zeros(dimension, dtype=np.float32)
+    tokens = [token for token in _WORD.findall(text.lower()) if token not in _STOPWORDS]
+    if tokens:
+        buckets = np.fromiter((zlib.crc32(token.encode()) % (dimension - 1) + 1 for token in tokens), dtype=np.int64, count=len(tokens))
+        np.add.at(words, buckets, 1.0)
+        words *= np.sqrt(1.0 - shared) / np.linalg.norm(words)
+    words[0] = np.sqrt(shared)
+    return words / np.linalg.norm(words)
+
+
+class FakeLLMService(LLMService):
+    """LLMService with hashed embeddings and canned completions (deadlines and hedging still apply)"""
+
+    def __init__(self, completion_latency: float = 0.0, embed_latency: float = 0.0, dimension: int = 1536):
+        """
+        Args:
+            completion_latency: Seconds each GPT call takes
+            embed_latency: Seconds each embeddings request takes
+            dimension: Embedding dimension
+        """
+        super().__init__(api_key="fake")
+        self.completion_latency = completion_latency
+        self.embed_latency = embed_latency
+        self.dimension = dimension
+
+    async def _embed(self, texts: list[str], timeout=None) -> list:
+        if self.embed_latency:
+            await asyncio.sleep(self.embed_latency)
+        return [hash_embedding(text, self.dimension) for text in texts]
+
+    async def _complete(self, prompt: str, timeout=None) -> str:
+        if self.completion_latency:
+            await asyncio.sleep(self.completion_latency)
+        return CANNED_RESPONSE
+
+
+class FakeVectorService(VectorService):
+    """VectorService whose partition queries take a fixed extra network-like delay"""
+
+    def __init__(self, search_latency: float = 0.0, partition_count: int = 4, **kwargs):
+        """
+        Args:
+            search_latency: Seconds added to each partition query
+            partition_count: Index partitions per organization
+            **kwargs: Other VectorService options (memory budget, spilling)
+        """
+        super().__init__(api_key="fake", partition_count=partition_count, **kwargs)
+        self.search_latency = search_latency
+
+    def _search_partition(self, *args, **kwargs):
+        if self.search_latency:
+            time.sleep(self.search_latency)  # runs in a worker thread, like a blocking client call
+        return super()._search_partition(*args, **kwargs)
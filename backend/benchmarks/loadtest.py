@@ -0,0 +1,340 @@
+"""
+Load Test - Open-loop upload/analyze and chat traffic against the API over real HTTP
+Starts create_app() under uvicorn with fake LLM and vector backends (or targets
+a running server) and reports throughput, latency percentiles and error rate per route
+
+Usage:
+    python -m benchmarks.loadtest --duration 60 --upload-rate 1 --chat-rate 20 \\
+        --workers 2 --job-workers 8 --llm-latency 2.0 --search-latency 0.03
+    python -m benchmarks.loadtest --target http://localhost:8000 --chat-rate 50
+
+Arrivals are Poisson and open-loop: requests start on schedule whether or not
+earlier ones have finished, and latency is measured from the scheduled start,
+so a saturated server shows up as growing latency instead of a slower client.
+With --workers > 1, set REDIS_URL so job status polls resolve on any worker.
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import numpy as np
+
+from app.config import Settings
+from app.dependencies import ServiceContainer
+from app.main import create_app
+from benchmarks.corpus import generate_contract, generate_corpus
+from benchmarks.fakes import FakeLLMService, FakeVectorService
+from benchmarks.run import QUESTIONS
+
+# Fake backend settings, passed to uvicorn workers through the environment
+ENV_PREFIX = "LOADTEST_"
+
+
+class LoadTestContainer(ServiceContainer):
+    """Service container that seeds a synthetic corpus during warmup"""
+
+    seed_contracts: int = 0
+
+    async def warmup(self) -> bool:
+        ready = await super().warmup()
+        await asyncio.gather(*(
+            self.rag_service.ingest_document(doc["contract_id"], doc["text"], {"organization_id": doc["organization_id"]})
+            for doc in generate_corpus(self.seed_contracts)
+        ))
+        return ready
+
+
+def fake_app():
+    """
+    uvicorn app factory: the real app wired to fake backends
+
+    Reads LOADTEST_LLM_LATENCY, LOADTEST_EMBED_LATENCY, LOADTEST_SEARCH_LATENCY
+    (seconds) and LOADTEST_SEED_CONTRACTS from the environment.
+    """
+    def option(name: str, default: float) -> float:
+        return float(os.environ.get(f"{ENV_PREFIX}{name}", default))
+
+    def services(settings: Settings) -> ServiceContainer:
+        container = LoadTestContainer.from_settings(
+            settings,
+            llm_service=FakeLLMService(
+                completion_latency=option("LLM_LATENCY", 2.0),
+                embed_latency=option("EMBED_LATENCY", 0.1),
+            ),
+            vector_service=FakeVectorService(
+                search_latency=option("SEARCH_LATENCY", 0.02),
+                partition_count=settings.vector_partitions,
+                tenant_memory_bytes=settings.vector_tenant_memory_mb * 1024 * 1024 or None,
+                idle_unload_seconds=settings.vector_idle_unload_seconds or None,
+                spill_dir=settings.vector_spill_dir or None,
+                search_workers=settings.vector_search_workers or None,
+                shard_rows=settings.vector_shard_rows,
+            ),
+        )
+        container.seed_contracts = int(option("SEED_CONTRACTS", 100))
+        return container
+
+    return create_app(service_factory=services)
+
+
+@dataclass
+class RouteStats:
+    """Outcomes recorded for one route"""
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: dict[int, int] = field(default_factory=dict)
+
+    def record(self, latency: float, status: Optional[int]) -> None:
+        self.latencies.append(latency)
+        self.statuses[status or 0] = self.statuses.get(status or 0, 0) + 1
+        if status is None or status >= 500 or status in (404, 422):
+            self.errors += 1
+
+    def summary(self, duration: float) -> dict:
+        samples = np.asarray(self.latencies or [0.0]) * 1000
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        count = len(self.latencies)
+        return {
+            "requests": count,
+            "throughput": count / duration if duration else 0.0,
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "error_rate": self.errors / count if count else 0.0,
+            "statuses": {str(code): n for code, n in sorted(self.statuses.items())},
+        }
+
+
+class LoadGenerator:
+    """
+    Drives a mix of scenarios at fixed arrival rates
+
+    Scenarios:
+    - upload: POST a fresh contract, then poll its job until it finishes;
+      "analyze" records upload-to-result time
+    - chat: POST a question to /analysis/{contract_id}/clarify for a seeded contract
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        upload_rate: float,
+        chat_rate: float,
+        seed_contracts: int,
+        poll_interval: float = 0.5,
+        job_timeout: float = 120.0,
+        organizations: int = 10,
+        seed: int = 7
+    ):
+        self.base_url = base_url
+        self.upload_rate = upload_rate
+        self.chat_rate = chat_rate
+        self.seed_contracts = seed_contracts
+        self.poll_interval = poll_interval
+        self.job_timeout = job_timeout
+        self.organizations = organizations
+        self.rng = random.Random(seed)
+        self.stats: dict[str, RouteStats] = {}
+        self._uploads = 0
+
+    async def run(self, duration: float) -> dict:
+        """
+        Generate load for duration seconds and wait for in-flight work
+
+        Returns:
+            Per-route summaries plus totals
+        """
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=200)
+        async with httpx.AsyncClient(
+            base_url=self.base_url, limits=limits, timeout=httpx.Timeout(60.0), headers={"host": "localhost"}
+        ) as client:
+            started = time.perf_counter()
+            tasks: list[asyncio.Task] = []
+            scenarios = [
+                (rate, scenario)
+                for rate, scenario in ((self.upload_rate, self._upload), (self.chat_rate, self._chat))
+                if rate > 0
+            ]
+            await asyncio.gather(*(
+                self._schedule(client, rate, scenario, started, duration, tasks) for rate, scenario in scenarios
+            ))
+            await asyncio.gather(*tasks)
+            elapsed = time.perf_counter() - started
+
+        routes = {name: stats.summary(duration) for name, stats in sorted(self.stats.items())}
+        total = sum(route["requests"] for name, route in routes.items() if name != "analyze")
+        errors = sum(stats.errors for name, stats in self.stats.items() if name != "analyze")
+        return {
+            "duration_s": duration,
+            "elapsed_s": elapsed,
+            "offered_rates": {"upload": self.upload_rate, "chat": self.chat_rate},
+            "routes": routes,
+            "total": {"requests": total, "throughput": total / duration, "error_rate": errors / total if total else 0.0},
+        }
+
+    async def _schedule(self, client, rate: float, scenario, started: float, duration: float, tasks: list) -> None:
+        due = 0.0
+        while True:
+            due += self.rng.expovariate(rate)
+            if due >= duration:
+                return
+            delay = started + due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(scenario(client, started + due)))
+
+    async def _request(self, client, route: str, scheduled: float, method: str, url: str, **kwargs):
+        response = None
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            pass
+        self.stats.setdefault(route, RouteStats()).record(
+            time.perf_counter() - scheduled, response.status_code if response is not None else None
+        )
+        return response
+
+    async def _upload(self, client, scheduled: float) -> None:
+        self._uploads += 1
+        number = self._uploads
+        text = f"{generate_contract(self.seed_contracts + number)}\nReference LT-{os.getpid()}-{number}-{time.time_ns()}\n"
+        response = await self._request(
+            client, "POST /api/v1/contracts/upload", scheduled, "POST", "/api/v1/contracts/upload",
+            files={"file": (f"contract-{number}.txt", text.encode(), "text/plain")},
+            data={"organization_id": f"org-{number % self.organizations:03d}"},
+        )
+        if response is None or response.status_code != 202:
+            return
+
+        job_url = response.json()["status_url"]
+        deadline = scheduled + self.job_timeout
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            poll = await self._request(client, "GET /api/v1/jobs/{job_id}", time.perf_counter(), "GET", job_url)
+            if poll is None or poll.status_code != 200:
+                break
+            status = poll.json()["status"]
+            if status in ("succeeded", "failed"):
+                self.stats.setdefault("analyze", RouteStats()).record(
+                    time.perf_counter() - scheduled, 200 if status == "succeeded" else 500
+                )
+                return
+        self.stats.setdefault("analyze", RouteStats()).record(time.perf_counter() - scheduled, None)
+
+    async def _chat(self, client, scheduled: float) -> None:
+        contract_id = f"contract-{self.rng.randrange(max(self.seed_contracts, 1)):05d}"
+        await self._request(
+            client, "POST /api/v1/analysis/{contract_id}/clarify", scheduled, "POST",
+            f"/api/v1/analysis/{contract_id}/clarify", json={"question": self.rng.choice(QUESTIONS)},
+        )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args, port: int, data_dir: str) -> subprocess.Popen:
+    """Launch uvicorn with the fake-backed app factory"""
+    env = {
+        **os.environ,
+        f"{ENV_PREFIX}LLM_LATENCY": str(args.llm_latency),
+        f"{ENV_PREFIX}EMBED_LATENCY": str(args.embed_latency),
+        f"{ENV_PREFIX}SEARCH_LATENCY": str(args.search_latency),
+        f"{ENV_PREFIX}SEED_CONTRACTS": str(args.seed_contracts),
+        "JOB_WORKERS": str(args.job_workers),
+        "TEXT_STORE_DIR": os.path.join(data_dir, "text_store"),
+        "UPLOAD_DIR": os.path.join(data_dir, "uploads"),
+        "OTLP_ENDPOINT": "",
+    }
+    command = [
+        sys.executable, "-m", "uvicorn", "benchmarks.loadtest:fake_app", "--factory",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(args.workers),
+        "--log-level", "warning", "--no-access-log",
+    ]
+    return subprocess.Popen(command, env=env)
+
+
+async def wait_healthy(base_url: str, timeout: float = 60.0) -> float:
+    """Seconds until /health answers 200"""
+    started = time.perf_counter()
+    async with httpx.AsyncClient(base_url=base_url, headers={"host": "localhost"}) as client:
+        while time.perf_counter() - started < timeout:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise TimeoutError(f"{base_url} not healthy after {timeout:.0f}s")
+
+
+def format_report(report: dict) -> str:
+    lines = [f"{'route':<48} {'reqs':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}"]
+    for name, route in report["routes"].items():
+        lines.append(
+            f"{name:<48} {route['requests']:>6} {route['throughput']:>8.2f} {route['p50_ms']:>9.1f} "
+            f"{route['p95_ms']:>9.1f} {route['p99_ms']:>9.1f} {route['error_rate']:>7.1%}"
+        )
+    total = report["total"]
+    lines.append(f"{'total (HTTP)':<48} {total['requests']:>6} {total['throughput']:>8.2f} {'':>29} {total['error_rate']:>7.1%}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the ContractGuard API")
+    parser.add_argument("--target", default=None, help="Base URL of a running server (default: start one)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--upload-rate", type=float, default=0.5, help="Upload-and-analyze arrivals per second")
+    parser.add_argument("--chat-rate", type=float, default=5.0, help="Chat arrivals per second")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Seconds between job status polls")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--job-workers", type=int, default=4, help="Analysis job workers per process")
+    parser.add_argument("--llm-latency", type=float, default=2.0, help="Fake GPT call latency (s)")
+    parser.add_argument("--embed-latency", type=float, default=0.1, help="Fake embeddings request latency (s)")
+    parser.add_argument("--search-latency", type=float, default=0.02, help="Fake per-partition search latency (s)")
+    parser.add_argument("--seed-contracts", type=int, default=100, help="Contracts ingested at startup for chat")
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.target
+    with tempfile.TemporaryDirectory(prefix="contractguard-loadtest-") as data_dir:
+        if base_url is None:
+            port = _free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            server = start_server(args, port, data_dir)
+        try:
+            startup = asyncio.run(wait_healthy(base_url))
+            print(f"{base_url} healthy after {startup:.1f}s; running {args.duration:.0f}s of load", file=sys.stderr)
+            generator = LoadGenerator(
+                base_url, args.upload_rate, args.chat_rate, args.seed_contracts, poll_interval=args.poll_interval
+            )
+            report = asyncio.run(generator.run(args.duration))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+
+    report["config"] = {key: value for key, value in vars(args).items() if key != "output"}
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+"""
+Benchmark Suite - Chunking, embedding, vector search, the full RAG prompt path, near-duplicate, alert and dashboard queries
+Runs against synthetic corpora with a fake LLM, writing JSON results that
+benchmarks.compare can diff against a baseline
+
+Usage:
+    python -m benchmarks.run --sizes 10,100,1000 --output benchmarks/results/latest.json
+    python -m benchmarks.run --sizes 10000 --baseline benchmarks/results/baseline.json
+"""
+
+from typing import Awaitable, Callable, Optional
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from app.services.alert_service import AlertScheduler
+from app.services.dashboard_store import ContractSummary, DashboardStore
+from app.services.near_duplicates import NearDuplicateIndex
+from app.services.rag_service import RAGService
+from app.services.term_extractor import extract_terms
+from app.services.vector_service import VectorService
+from benchmarks.compare import compare, format_rows, load
+from benchmarks.corpus import SECTIONS, generate_corpus
+from benchmarks.fakes import FakeLLMService
+
+QUESTIONS = [
+    "When does the agreement automatically renew and what notice prevents renewal?",
+    "What is the aggregate liability cap and are consequential damages excluded?",
+    "When must invoices be paid and what interest accrues on late payments?",
+    "How long do confidentiality obligations for Confidential Information survive termination?",
+    "Can either party terminate for convenience or for material breach?",
+    "Who must indemnify against third-party intellectual property infringement claims?",
+    "How quickly must a personal data breach be notified under data protection laws?",
+    "Which warranties are given for the services and which are disclaimed?",
+]
+
+
+def summarize(case: str, name: str, params: dict, latencies: list[float], elapsed: float, units: int = 0) -> dict:
+    """
+    Latency percentiles and throughput for one benchmark case
+
+    Args:
+        case: Stable identifier used to match cases across runs
+        name: Operation benchmarked
+        params: Case parameters (corpus size, filter, ...)
+        latencies: Seconds per operation
+        elapsed: Wall-clock seconds for all operations
+        units: Items processed (chunks, vectors) when more meaningful than operations
+
+    Returns:
+        Result record
+    """
+    samples = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        "case": case,
+        "name": name,
+        "params": params,
+        "operations": len(latencies),
+        "mean_ms": float(samples.mean()),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "throughput": (units or len(latencies)) / elapsed if elapsed else 0.0,
+        "throughput_unit": "items/s" if units else "ops/s",
+    }
+
+
+async def measure(operations: list[Callable[[], Awaitable]]) -> tuple[list[float], float, list]:
+    """Run operations one after another, timing each"""
+    latencies, outputs = [], []
+    started = time.perf_counter()
+    for operation in operations:
+        begin = time.perf_counter()
+        outputs.append(await operation())
+        latencies.append(time.perf_counter() - begin)
+    return latencies, time.perf_counter() - started, outputs
+
+
+async def bench_corpus(size: int, queries: int, organizations: int, seed: int) -> list[dict]:
+    """
+    All benchmark cases for one corpus size
+
+    Args:
+        size: Contracts in the corpus
+        queries: Queries per search case
+        organizations: Organizations the corpus is spread over
+        seed: Corpus and query seed
+
+    Returns:
+        Result records
+    """
+    rng = random.Random(seed)
+    corpus = generate_corpus(size, organizations=organizations, seed=seed)
+    llm = FakeLLMService()
+    vectors = VectorService(api_key="benchmark")
+    rag = RAGService(llm_service=llm, vector_service=vectors)
+    results = []
+
+    # Chunking
+    latencies, elapsed, chunked = await measure([
+        lambda doc=doc: rag.chunk_document(
+            doc["text"], {"contract_id": doc["contract_id"], "organization_id": doc["organization_id"]}
+        )
+        for doc in corpus
+    ])
+    chunk_count = sum(len(chunks) for chunks in chunked)
+    params = {"contracts": size, "chunks": chunk_count}
+    results.append(summarize(f"chunk_document[contracts={size}]", "chunk_document", params, latencies, elapsed, chunk_count))
+
+    # Embedding + upsert (fake embeddings, real in-process index)
+    latencies, elapsed, _ = await measure([
+        lambda doc=doc, chunks=chunks: rag.store_embeddings(doc["contract_id"], chunks)
+        for doc, chunks in zip(corpus, chunked)
+    ])
+    results.append(summarize(f"store_embeddings[contracts={size}]", "store_embeddings", params, latencies, elapsed, chunk_count))
+
+    # Term extraction + alert scheduling, then "due in the next 90 days" per organization
+    scheduler = AlertScheduler()
+    latencies, elapsed, _ = await measure([
+        lambda doc=doc: _schedule(scheduler, doc)
+        for doc in corpus
+    ])
+    results.append(summarize(f"extract_terms[contracts={size}]", "extract_terms", {"contracts": size}, latencies, elapsed))
+    latencies, elapsed, _ = await measure([
+        lambda org=f"org-{rng.randrange(organizations):03d}": _due_within(scheduler, org, 90)
+        for _ in range(queries)
+    ])
+    results.append(summarize(
+        f"alerts.due_within[contracts={size},days=90]", "alerts.due_within",
+        {"contracts": size, "alerts": scheduler.stats()["scheduled"], "days": 90}, latencies, elapsed
+    ))
+
+    # Near-duplicate lookup of a lightly edited copy of an indexed contract
+    near_duplicates = NearDuplicateIndex()
+    for doc in corpus:
+        near_duplicates.add(doc["contract_id"], doc["organization_id"], near_duplicates.signature(doc["text"]), {})
+    latencies, elapsed, found = await measure([
+        lambda doc=rng.choice(corpus): _nearest(near_duplicates, doc)
+        for _ in range(queries)
+    ])
+    results.append(summarize(
+        f"near_duplicates.nearest[contracts={size}]", "near_duplicates.nearest",
+        {"contracts": size, "found": sum(found) / len(found)}, latencies, elapsed
+    ))
+
+    # Dashboard: fold each contract into the aggregates, then read one organization's dashboard
+    with tempfile.TemporaryDirectory() as root:
+        dashboard = DashboardStore(root)
+        latencies, elapsed, _ = await measure([
+            lambda doc=doc: _record(dashboard, doc, rng)
+            for doc in corpus
+        ])
+        results.append(summarize(f"dashboard.record[contracts={size}]", "dashboard.record", {"contracts": size}, latencies, elapsed))
+        latencies, elapsed, _ = await measure([
+            lambda org=f"org-{rng.randrange(organizations):03d}": _dashboard(dashboard, org)
+            for _ in range(queries)
+        ])
+        results.append(summarize(
+            f"dashboard.read[contracts={size}]", "dashboard.read",
+            {"contracts": size, "per_organization": size // organizations}, latencies, elapsed
+        ))
+
+    # Vector search at three filter selectivities
+    query_vectors = await llm.embed_texts([rng.choice(QUESTIONS) for _ in range(queries)])
+    keywords = [rng.choice(list(SECTIONS)) for _ in range(queries)]
+    filter_cases = {
+        "none": (1.0, lambda: None),
+        "organization": (1 / organizations, lambda: {"organization_id": f"org-{rng.randrange(organizations):03d}"}),
+        "contract": (1 / size, lambda: {"contract_id": rng.choice(corpus)["contract_id"]}),
+    }
+    for filter_name, (selectivity, make_filter) in filter_cases.items():
+        params = {"contracts": size, "vectors": chunk_count, "filter": filter_name, "selectivity": selectivity}
+        filters = [make_filter() for _ in range(queries)]
+        latencies, elapsed, _ = await measure([
+            lambda vector=vector, flt=flt: vectors.search(vector, top_k=10, filters=flt, threshold=0.0)
+            for vector, flt in zip(query_vectors, filters)
+        ])
+        results.append(summarize(f"vector.search[contracts={size},filter={filter_name}]", "vector.search", params, latencies, elapsed))
+
+        latencies, elapsed, _ = await measure([
+            lambda vector=vector, flt=flt, keyword=keyword: vectors.hybrid_search(vector, keyword_query=keyword, top_k=10, filters=flt)
+            for vector, flt, keyword in zip(query_vectors, filters, keywords)
+        ])
+        results.append(summarize(f"vector.hybrid_search[contracts={size},filter={filter_name}]", "vector.hybrid_search", params, latencies, elapsed))
+
+    # Full prompt path: embed question, filtered search, MMR, packing, rendering
+    for budget in (None, 1500):
+        latencies, elapsed, _ = await measure([
+            lambda question=rng.choice(QUESTIONS), doc=rng.choice(corpus): rag.augment_llm_prompt(
+                question, doc["contract_id"], token_budget=budget
+            )
+            for _ in range(queries)
+        ])
+        label = budget or "none"
+        results.append(summarize(
+            f"augment_llm_prompt[contracts={size},token_budget={label}]", "augment_llm_prompt",
+            {"contracts": size, "vectors": chunk_count, "token_budget": budget}, latencies, elapsed
+        ))
+
+    return results
+
+
+async def _schedule(scheduler: AlertScheduler, doc: dict) -> None:
+    scheduler.schedule_contract(doc["contract_id"], doc["organization_id"], extract_terms(doc["text"]))
+
+
+async def _due_within(scheduler: AlertScheduler, organization_id: str, days: int) -> list:
+    return scheduler.due_within(organization_id, days)
+
+
+async def _record(dashboard: DashboardStore, doc: dict, rng: random.Random) -> None:
+    terms = extract_terms(doc["text"])
+    result = {
+        "contract_id": doc["contract_id"],
+        "risk_level": rng.choice(["Low", "Medium", "High"]),
+        "risk_score": rng.randrange(101),
+        "compliance_score": rng.randrange(101),
+        "key_clauses": [{"category": section.lower(), "risk_level": "Medium"} for section in SECTIONS],
+        "obligations": [],
+        "terms": terms.to_dict(),
+    }
+    await asyncio.to_thread(dashboard.record, ContractSummary.from_analysis(doc["organization_id"], result))
+
+
+async def _nearest(index: NearDuplicateIndex, doc: dict) -> bool:
+    edited = doc["text"].replace(". ", ". In addition, ", 1)
+    match = index.nearest(doc["organization_id"], index.signature(edited))
+    return match is not None and match.contract_id == doc["contract_id"]
+
+
+async def _dashboard(dashboard: DashboardStore, organization_id: str) -> dict:
+    return dashboard.dashboard(organization_id)
+
+
+def environment() -> dict:
+    """Machine and revision the results were produced on"""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        revision = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "revision": revision,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+async def run(sizes: list[int], queries: int, organizations: int, seed: int) -> dict:
+    results = []
+    for size in sizes:
+        started = time.perf_counter()
+        results.extend(await bench_corpus(size, queries, organizations, seed))
+        print(f"corpus of {size} contracts benchmarked in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return {
+        "environment": environment(),
+        "config": {"sizes": sizes, "queries": queries, "organizations": organizations, "seed": seed},
+        "results": results,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the ContractGuard benchmark suite")
+    parser.add_argument("--sizes", default="10,100,1000", help="Comma-separated corpus sizes (default: 10,100,1000)")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per search case")
+    parser.add_argument("--organizations", type=int, default=10, help="Organizations the corpus is spread over")
+    parser.add_argument("--seed", type=int, default=7, help="Corpus and query seed")
+    parser.add_argument("--output", default="benchmarks/results/latest.json", help="Results file")
+    parser.add_argument("--baseline", default=None, help="Results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Relative slowdown tolerated (default: 0.15)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    sizes = [int(size) for size in args.sizes.split(",")]
+    report = asyncio.run(run(sizes, args.queries, args.organizations, args.seed))
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for result in report["results"]:
+        print(
+            f"{result['case']:<70} p50 {result['p50_ms']:8.3f}ms  p95 {result['p95_ms']:8.3f}ms  "
+            f"{result['throughput']:10.1f} {result['throughput_unit']}"
+        )
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        rows = compare(load(args.baseline), report, args.tolerance)
+        print("\n" + format_rows(rows))
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Sharded Search Scaling - Large-tenant query latency across core counts
+Scores one partition of random embeddings with ShardedScorer at each worker
+count, reporting latency and speedup over a single core. Results use the
+benchmarks.run format, so benchmarks.compare can diff two runs
+
+Usage:
+    python -m benchmarks.scaling --vectors 100000 --output benchmarks/results/scaling.json
+    python -m benchmarks.scaling --workers 1,2,4,8 --filter contract
+"""
+
+from typing import Optional
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+from app.services.sharded_search import ShardedScorer
+from app.services.vector_service import InMemoryIndex
+from benchmarks.run import environment, measure, summarize
+
+
+def build_index(vectors: int, contracts: int, dimension: int, seed: int) -> InMemoryIndex:
+    """One tenant partition of random unit vectors, contracts interleaved"""
+    rng = np.random.default_rng(seed)
+    index = InMemoryIndex(dimension)
+    for start in range(0, vectors, 4096):
+        block = rng.standard_normal((min(4096, vectors - start), dimension), dtype=np.float32)
+        for offset, row in enumerate(block):
+            position = start + offset
+            index.upsert(
+                f"v{position}", row,
+                {"contract_id": f"c{position % contracts}", "organization_id": "org-000", "chunk_index": position},
+            )
+    return index
+
+
+def worker_counts(cores: int) -> list[int]:
+    """1, 2, 4, ... up to and including the core count"""
+    counts = [1]
+    while counts[-1] * 2 < cores:
+        counts.append(counts[-1] * 2)
+    return counts + ([cores] if cores > 1 else [])
+
+
+async def run(
+    vectors: int,
+    workers: list[int],
+    queries: int,
+    top_k: int,
+    shard_rows: int,
+    filter_name: str,
+    seed: int
+) -> dict:
+    dimension = 1536
+    contracts = max(vectors // 50, 1)
+    started = time.perf_counter()
+    index = build_index(vectors, contracts, dimension, seed)
+    print(f"index of {vectors} vectors built in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    rng = np.random.default_rng(seed + 1)
+    query_vectors = rng.standard_normal((queries, dimension), dtype=np.float32)
+    filters = [
+        {"contract_id": f"c{rng.integers(contracts)}"} if filter_name == "contract" else None
+        for _ in range(queries)
+    ]
+
+    results, baseline_p50, expected = [], None, None
+    for count in workers:
+        scorer = ShardedScorer(count, shard_rows)
+        await _query(index, query_vectors[0], top_k, filters[0], scorer)  # Start the pool outside the timings
+        latencies, elapsed, outputs = await measure([
+            lambda vector=vector, flt=flt: _query(index, vector, top_k, flt, scorer)
+            for vector, flt in zip(query_vectors, filters)
+        ])
+        scorer.close()
+
+        # Sharding should not change the answer (shard products may round differently on near-ties)
+        ids = [[result.id for result in output] for output in outputs]
+        expected = expected or ids
+        mismatches = sum(got != want for got, want in zip(ids, expected))
+
+        result = summarize(
+            f"sharded_search[vectors={vectors},filter={filter_name},workers={count}]", "sharded_search",
+            {
+                "vectors": vectors, "filter": filter_name, "workers": count,
+                "shards": len(scorer.shards(vectors)), "shard_rows": shard_rows, "mismatches": mismatches,
+            },
+            latencies, elapsed,
+        )
+        baseline_p50 = baseline_p50 or result["p50_ms"]
+        result["params"]["speedup"] = round(baseline_p50 / result["p50_ms"], 2)
+        results.append(result)
+
+    return {
+        "environment": environment(),
+        "config": {
+            "vectors": vectors, "workers": workers, "queries": queries, "top_k": top_k,
+            "shard_rows": shard_rows, "filter": filter_name, "seed": seed,
+        },
+        "results": results,
+    }
+
+
+async def _query(index: InMemoryIndex, vector, top_k: int, filters: Optional[dict], scorer: ShardedScorer) -> list:
+    return index.query(vector, top_k, filters, scorer=scorer)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure sharded vector search across core counts")
+    parser.add_argument("--vectors", type=int, default=100000, help="Vectors in the tenant partition")
+    parser.add_argument("--workers", default=None, help="Comma-separated worker counts (default: 1, 2, 4, ... cores)")
+    parser.add_argument("--queries", type=int, default=50, help="Queries per worker count")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query")
+    parser.add_argument("--shard-rows", type=int, default=4096, help="Fewest rows per shard")
+    parser.add_argument("--filter", choices=("none", "contract"), default="none", help="Metadata filter applied")
+    parser.add_argument("--seed", type=int, default=7, help="Vector and query seed")
+    parser.add_argument("--output", default="benchmarks/results/scaling.json", help="Results file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    workers = (
+        [int(count) for count in args.workers.split(",")] if args.workers
+        else worker_counts(os.cpu_count() or 1)
+    )
+    report = asyncio.run(run(args.vectors, workers, args.queries, args.top_k, args.shard_rows, args.filter, args.seed))
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for result in report["results"]:
+        print(
+            f"{result['case']:<70} p50 {result['p50_ms']:8.3f}ms  p95 {result['p95_ms']:8.3f}ms  "
+            f"speedup {result['params']['speedup']:5.2f}x"
+        )
+    print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
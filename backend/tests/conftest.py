@@ -0,0 +1,17 @@
+"""
+Shared fixtures
+"""
+
+import pytest
+
+from app.config import Settings, get_settings
+
+
+@pytest.fixture
+def settings(tmp_path, monkeypatch) -> Settings:
+    """Fresh settings whose relative storage directories land in a temporary directory"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("HTTP_MAX_CONNECTIONS", "7")
+    get_settings.cache_clear()
+    yield get_settings()
+    get_settings.cache_clear()
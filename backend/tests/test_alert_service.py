@@ -0,0 +1,111 @@
+"""
+Alert Scheduler Tests - Due windows and dispatch across reschedules and restarts
+"""
+
+from datetime import date
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.services.alert_service import AlertScheduler
+from app.services.term_extractor import extract_terms
+
+AUTO_RENEWING = (
+    "This Agreement is effective as of January 15, 2025 and continues for an initial term of 12 months. "
+    "It shall automatically renew for successive 12-month periods unless either party gives written notice "
+    "of non-renewal at least 60 days prior to the end of the then-current term."
+)
+FIXED_TERM = "This Agreement expires on June 30, 2026."
+TODAY = date(2026, 3, 1)
+
+
+def test_reschedule_replaces_a_contracts_alerts():
+    scheduler = AlertScheduler()
+    scheduler.schedule_contract("c1", "org-a", extract_terms(AUTO_RENEWING, TODAY), "Acme", TODAY)
+    assert {alert.type for alert in scheduler.due_within("org-a", 365, TODAY)} == {"termination_window", "renewal"}
+
+    # Re-analysed as a fixed-term contract: only the expiry remains
+    scheduler.schedule_contract("c1", "org-a", extract_terms(FIXED_TERM, TODAY), "Acme", TODAY)
+    due = scheduler.due_within("org-a", 365, TODAY)
+    assert [(alert.type, alert.due_date) for alert in due] == [("renewal", date(2026, 6, 30))]
+    assert scheduler.due_within("org-b", 365, TODAY) == []
+
+    # Only the live alert is sent, once, from its notification day on
+    assert scheduler.pop_ready(date(2026, 5, 30)) == []
+    assert [alert.id for alert in scheduler.pop_ready(date(2026, 6, 1))] == [due[0].id]
+    assert scheduler.pop_ready(date(2026, 6, 2)) == []
+
+
+def test_reanalysis_keeps_sent_and_dismissed_alerts():
+    scheduler = AlertScheduler()
+    scheduler.schedule_contract("c1", "org-a", extract_terms(AUTO_RENEWING, TODAY), "Acme", TODAY)
+    [notice] = scheduler.pop_ready(date(2026, 10, 17))
+    assert notice.id == "c1:termination_window:2026-11-16"
+    scheduler.dismiss("c1:renewal:2027-01-15")
+
+    # Same deadlines found again: nothing is re-sent or un-dismissed
+    later = date(2026, 10, 20)
+    scheduler.schedule_contract("c1", "org-a", extract_terms(AUTO_RENEWING, later), "Acme", later)
+    summary = SimpleNamespace(
+        contract_id="c1", organization_id="org-a", vendor="Acme",
+        terms={key: value for key, value in extract_terms(AUTO_RENEWING, later).to_dict(later).items()
+               if key != "key_dates"},
+    )
+    scheduler.restore([summary], later)
+    alerts = {alert.id: alert for alert in scheduler.for_contract("c1")}
+    assert alerts[notice.id].sent and alerts["c1:renewal:2027-01-15"].dismissed
+    assert scheduler.pop_ready(date(2026, 12, 20)) == []
+
+
+def test_due_within_window_is_inclusive_and_ordered():
+    scheduler = AlertScheduler()
+    scheduler.schedule_contract("c1", "org-a", extract_terms(AUTO_RENEWING, TODAY), today=TODAY)
+    scheduler.schedule_contract("c2", "org-a", extract_terms(FIXED_TERM, TODAY), today=TODAY)
+
+    assert [alert.contract_id for alert in scheduler.due_within("org-a", 121, TODAY)] == ["c2"]
+    assert [alert.due_date for alert in scheduler.due_within("org-a", 400, TODAY)] == [
+        date(2026, 6, 30), date(2026, 11, 16), date(2027, 1, 15),
+    ]
+
+
+def test_alert_routes_list_and_dismiss(settings):
+    with TestClient(create_app(), base_url="http://localhost") as client:
+        scheduler = client.app.state.services.alert_scheduler
+        scheduler.schedule_contract("c1", "org-a", extract_terms("This Agreement expires on June 30, 2035."), "Acme")
+        alert_id = scheduler.for_contract("c1")[0].id
+        window = {"organization_id": "org-a", "days": 3660}
+
+        upcoming = client.get("/api/v1/alerts/upcoming", params=window).json()
+        assert [alert["id"] for alert in upcoming["alerts"]] == [alert_id]
+        assert client.post(f"/api/v1/alerts/{alert_id}/dismiss").status_code == 200
+        assert client.get("/api/v1/alerts/upcoming", params=window).json()["count"] == 0
+        assert client.get("/api/v1/alerts/contracts/c1").json()["count"] == 1
+        assert client.post("/api/v1/alerts/missing/dismiss").status_code == 404
+
+
+def test_passed_renewal_rolls_forward():
+    scheduler = AlertScheduler()
+    scheduler.schedule_contract("c1", "org-a", extract_terms(AUTO_RENEWING, TODAY), today=TODAY)
+    scheduler.pop_ready(date(2027, 1, 1))
+
+    ready = scheduler.pop_ready(date(2027, 1, 20))
+    assert ready == []
+    assert sorted(alert.due_date for alert in scheduler.for_contract("c1")) == [date(2027, 11, 16), date(2028, 1, 15)]
+
+
+def test_restore_rebuilds_schedule_without_resending():
+    terms = extract_terms(AUTO_RENEWING, TODAY)
+    summary = SimpleNamespace(
+        contract_id="c1", organization_id="org-a", vendor="Acme",
+        terms={key: value for key, value in terms.to_dict(TODAY).items() if key != "key_dates"},
+    )
+    scheduler = AlertScheduler()
+
+    assert scheduler.restore([summary], date(2026, 12, 20)) == 2
+    renewal, notice = sorted(scheduler.for_contract("c1"), key=lambda alert: alert.due_date)
+    # The renewal notification (due 2026-12-16) went out before the restart
+    assert (renewal.due_date, renewal.sent) == (date(2027, 1, 15), True)
+    assert (notice.due_date, notice.sent) == (date(2027, 11, 16), False)
+    assert scheduler.pop_ready(date(2026, 12, 21)) == []
+    assert [alert.id for alert in scheduler.pop_ready(date(2027, 10, 17))] == [notice.id]
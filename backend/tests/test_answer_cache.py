@@ -0,0 +1,127 @@
+"""
+Answer Cache Tests - Similar-question hits, invalidation and false-hit sampling
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services.answer_cache import CachedAnswer, SemanticAnswerCache
+from app.services.rag_service import RAGService
+from app.services.vector_service import VectorService
+
+
+def _vector(*weights: float) -> list[float]:
+    vector = np.zeros(1536, dtype=np.float32)
+    vector[:len(weights)] = weights
+    return vector.tolist()
+
+
+class _LLM:
+    """Questions mentioning renewal point one way, everything else another"""
+
+    def __init__(self):
+        self.answers = 0
+
+    async def embed_text(self, text: str) -> list[float]:
+        return _vector(1.0, 0.0) if "renew" in text.lower() else _vector(0.0, 1.0)
+
+    async def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        return [_vector(1.0, 0.0) for _ in texts]
+
+    async def answer_question(self, question: str, context: str) -> str:
+        self.answers += 1
+        return f"answer {self.answers}"
+
+
+def test_lookup_hits_similar_questions_only():
+    cache = SemanticAnswerCache(threshold=0.9)
+    assert cache.lookup("c1", _vector(1.0)) is None
+
+    assert cache.store("c1", "When does it renew?", _vector(2.0), {"answer": "yearly"}, cache.generation("c1"))
+    hit = cache.lookup("c1", _vector(1.0, 0.2))
+    assert hit.answer == {"answer": "yearly"} and hit.similarity == pytest.approx(0.98, abs=0.01)
+    assert cache.lookup("c1", _vector(1.0, 1.0)) is None
+    assert cache.lookup("c2", _vector(1.0)) is None
+    assert cache.stats()["hit_rate"] == 0.25
+
+
+def test_invalidate_drops_answers_and_rejects_stale_stores():
+    cache = SemanticAnswerCache()
+    generation = cache.generation("c1")
+    cache.store("c1", "q", _vector(1.0), {"answer": "a"}, generation)
+
+    cache.invalidate("c1")
+    assert cache.lookup("c1", _vector(1.0)) is None
+    assert not cache.store("c1", "q", _vector(1.0), {"answer": "stale"}, generation)
+    assert cache.store("c1", "q", _vector(1.0), {"answer": "fresh"}, cache.generation("c1"))
+
+
+def test_entries_and_contracts_are_bounded():
+    cache = SemanticAnswerCache(max_entries=2, max_contracts=2)
+    for index in range(3):
+        cache.store("c1", f"q{index}", _vector(*([0.0] * index + [1.0])), {"answer": index}, 0)
+    assert cache.stats()["entries"] == 2
+    assert cache.lookup("c1", _vector(1.0)) is None
+
+    cache.store("c2", "q", _vector(1.0), {}, 0)
+    cache.store("c3", "q", _vector(1.0), {}, 0)
+    assert cache.stats()["contracts"] == 2
+    assert cache.lookup("c1", _vector(0.0, 1.0)) is None
+
+
+def test_generations_are_bounded_without_accepting_stale_stores():
+    cache = SemanticAnswerCache(max_contracts=2)
+    generation = cache.generation("c1")
+    cache.invalidate("c1")
+    for index in range(100):
+        cache.invalidate(f"other-{index}")
+
+    assert len(cache._generations) == 2
+    assert not cache.store("c1", "q", _vector(1.0), {"answer": "stale"}, generation)
+    assert cache.store("c1", "q", _vector(1.0), {"answer": "fresh"}, cache.generation("c1"))
+    assert cache.lookup("c1", _vector(1.0)).answer == {"answer": "fresh"}
+
+
+def test_sample_with_disjoint_citations_is_a_false_hit():
+    cache = SemanticAnswerCache()
+    cached = CachedAnswer(question="When does it renew?", answer={"citations": ["Section 2"]}, similarity=0.95)
+
+    assert not cache.record_sample("c1", "Renewal date?", cached, {"citations": ["Section 2", "Section 9"]})
+    assert cache.record_sample("c1", "Can I terminate?", cached, {"citations": ["Section 7"]})
+    stats = cache.stats(include_samples=True)
+    assert stats["false_hit_rate"] == 0.5
+    assert stats["recent_false_hits"][0]["matched_question"] == "When does it renew?"
+
+
+@pytest.mark.asyncio
+async def test_similar_question_skips_retrieval_and_generation():
+    llm = _LLM()
+    rag = RAGService(llm_service=llm, vector_service=VectorService(api_key="test"), answer_cache=SemanticAnswerCache())
+    await rag.ingest_document("c1", "1. Term. The agreement renews every year.", {"organization_id": "org-a"})
+
+    first = await rag.answer_question("When does it renew?", "c1")
+    again = await rag.answer_question("What is the renewal date? When does it renew", "c1")
+    other = await rag.answer_question("Who pays the fees?", "c1")
+
+    assert (first["cached"], again["cached"], other["cached"]) == (False, True, False)
+    assert again["answer"] == first["answer"] == "answer 1"
+    assert llm.answers == 2
+
+    await rag.ingest_document("c1", "1. Term. The agreement renews every two years.", {"organization_id": "org-a"})
+    assert not (await rag.answer_question("When does it renew?", "c1"))["cached"]
+
+
+@pytest.mark.asyncio
+async def test_sampled_hit_is_rechecked_in_the_background():
+    cache = SemanticAnswerCache(sample_rate=1.0)
+    rag = RAGService(llm_service=_LLM(), vector_service=VectorService(api_key="test"), answer_cache=cache)
+    await rag.ingest_document("c1", "1. Term. The agreement renews every year.", {"organization_id": "org-a"})
+
+    await rag.answer_question("When does it renew?", "c1")
+    await rag.answer_question("When does it renew?", "c1")
+    await asyncio.gather(*rag._background)
+
+    assert cache.stats()["sampled"] == 1
+    assert cache.stats()["false_hit_rate"] == 0.0
@@ -0,0 +1,59 @@
+"""
+Benchmark Suite Tests - Synthetic corpus, fake backends and regression comparison
+"""
+
+import numpy as np
+import pytest
+
+from benchmarks.compare import compare
+from benchmarks.corpus import generate_contract, generate_corpus
+from benchmarks.fakes import hash_embedding
+from benchmarks.run import bench_corpus
+
+
+def test_corpus_is_deterministic_and_spread_over_organizations():
+    corpus = generate_corpus(6, organizations=3)
+
+    assert corpus == generate_corpus(6, organizations=3)
+    assert [doc["organization_id"] for doc in corpus] == ["org-000", "org-001", "org-002"] * 2
+    assert generate_contract(1) != generate_contract(1, seed=8)
+    assert corpus[0]["text"].startswith("MASTER SERVICES AGREEMENT between Acme Corp")
+
+
+def test_hash_embedding_separates_related_text():
+    renewal = hash_embedding("automatic renewal notice period")
+    related = hash_embedding("renewal notice")
+    unrelated = hash_embedding("governing law venue")
+
+    assert np.linalg.norm(renewal) == pytest.approx(1.0)
+    assert float(renewal @ related) > 0.7 > float(renewal @ unrelated)
+    assert float(renewal @ unrelated) == pytest.approx(0.65, abs=0.05)
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = {"results": [
+        {"case": "search", "p50_ms": 10.0, "p95_ms": 20.0, "throughput": 100.0},
+        {"case": "removed", "p50_ms": 1.0},
+    ]}
+    current = {"results": [
+        {"case": "search", "p50_ms": 11.0, "p95_ms": 30.0, "throughput": 80.0},
+        {"case": "new", "p50_ms": 1.0},
+    ]}
+
+    rows = {row["metric"]: row for row in compare(baseline, current, tolerance=0.15)}
+
+    assert set(rows) == {"p50_ms", "p95_ms", "throughput"}
+    assert not rows["p50_ms"]["regression"]
+    assert rows["p95_ms"]["regression"] and rows["p95_ms"]["change"] == pytest.approx(0.5)
+    assert rows["throughput"]["regression"]
+
+
+@pytest.mark.asyncio
+async def test_small_corpus_run_produces_every_case():
+    results = await bench_corpus(size=5, queries=3, organizations=2, seed=7)
+
+    cases = [result["case"] for result in results]
+    assert cases[:2] == ["chunk_document[contracts=5]", "store_embeddings[contracts=5]"]
+    assert "vector.search[contracts=5,filter=contract]" in cases
+    assert "augment_llm_prompt[contracts=5,token_budget=1500]" in cases
+    assert all(result["p50_ms"] <= result["p99_ms"] for result in results)
@@ -0,0 +1,112 @@
+"""
+Clause Classifier Tests - Keyword and centroid labels, and the LLM fallback split
+"""
+
+import numpy as np
+import pytest
+
+from app.services.clause_classifier import ClauseClassifier, KEYWORDS
+from app.services.rag_service import ClauseCategory, RAGService
+from app.services.vector_service import VectorService
+from benchmarks.fakes import hash_embedding
+
+_CLAUSES = {
+    ClauseCategory.PAYMENT: "Customer shall pay each invoice within thirty days; late payments accrue interest.",
+    ClauseCategory.TERMINATION: "Either party may terminate this agreement for material breach after the cure period.",
+    ClauseCategory.CONFIDENTIALITY: "The recipient shall keep all confidential information secret.",
+}
+
+
+class _LLM:
+    def __init__(self):
+        self.clause_requests: list[str] = []
+
+    async def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        return [hash_embedding(text).tolist() for text in texts]
+
+    async def extract_clauses(self, text: str) -> list[dict]:
+        self.clause_requests.append(text)
+        return [{"category": "other", "quote": text[:20], "explanation": "", "risk_level": "Low", "implications": ""}]
+
+
+def test_every_category_has_keywords():
+    assert set(KEYWORDS) == set(ClauseCategory)
+
+
+def test_keywords_alone_label_clear_clauses():
+    classifier = ClauseClassifier()
+    labels = classifier.classify(list(_CLAUSES.values()) + ["The sky is blue."])
+
+    assert [label.category for label in labels[:3]] == list(_CLAUSES)
+    assert labels[0].confidence >= 0.6 and labels[1].confidence >= 0.6
+    # A single keyword hit is not decisive on its own
+    assert labels[2].confidence < classifier.min_confidence
+    assert (labels[3].category, labels[3].confidence) == (ClauseCategory.OTHER, 0.0)
+
+
+def test_heading_hits_outweigh_body_hits():
+    classifier = ClauseClassifier()
+    text = "Invoices may be withheld on termination."
+
+    assert classifier.classify([text])[0].confidence < classifier.min_confidence
+    label = classifier.classify([text], headings=["7. Termination"])[0]
+    assert label.category == ClauseCategory.TERMINATION and label.confidence >= classifier.min_confidence
+
+
+@pytest.mark.asyncio
+async def test_centroids_label_chunks_without_keywords():
+    classifier = ClauseClassifier()
+    await classifier.prepare(_LLM().embed_texts)
+    assert classifier.ready
+
+    text = "Each party shall protect the other party's proprietary information from disclosure."
+    embedding = hash_embedding("Confidentiality. " + text)
+    label = classifier.classify([text], [embedding], learn=False)[0]
+    assert label.category == ClauseCategory.CONFIDENTIALITY
+
+
+@pytest.mark.asyncio
+async def test_learned_centroids_stay_with_their_organization():
+    classifier = ClauseClassifier()
+    await classifier.prepare(_LLM().embed_texts)
+    prototypes = classifier._centroids.copy()
+    text = _CLAUSES[ClauseCategory.PAYMENT]
+
+    classifier.classify([text], [hash_embedding(text)])
+    assert classifier._tenant_centroids == {}
+
+    classifier.classify([text], [hash_embedding(text)], organization_id="org-a")
+    assert list(classifier._tenant_centroids) == ["org-a"]
+    assert np.array_equal(classifier._centroids, prototypes)
+    assert not np.array_equal(classifier._tenant_centroids["org-a"], prototypes)
+
+
+@pytest.mark.asyncio
+async def test_failed_prototype_embedding_falls_back_to_keywords():
+    async def unavailable(texts: list[str]) -> list:
+        raise ConnectionError("embedding API unavailable")
+
+    classifier = ClauseClassifier()
+    await classifier.prepare(unavailable)
+    assert not classifier.ready
+    labels = classifier.classify([_CLAUSES[ClauseCategory.PAYMENT]], [np.ones(1536)])
+    assert labels[0].category == ClauseCategory.PAYMENT
+
+
+@pytest.mark.asyncio
+async def test_only_uncertain_chunks_reach_the_llm():
+    llm = _LLM()
+    vectors = VectorService(api_key="test")
+    rag = RAGService(llm_service=llm, vector_service=vectors, clause_classifier=ClauseClassifier())
+    chunks = [
+        {"id": f"c1_chunk_{index}", "text": text, "metadata": {"contract_id": "c1", "chunk_index": index}}
+        for index, text in enumerate([*_CLAUSES.values(), "The parties met on a Tuesday."])
+    ]
+
+    await rag.store_embeddings("c1", chunks)
+    categories = {chunk["metadata"]["clause_category"] for chunk in chunks[:3]}
+    assert categories == {"payment", "termination", "confidentiality"}
+
+    clauses = await rag.extract_clauses(chunks)
+    assert [clause["source"] for clause in clauses] == ["classifier"] * 3 + ["llm"]
+    assert llm.clause_requests == ["The parties met on a Tuesday."]
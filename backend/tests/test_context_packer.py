@@ -0,0 +1,85 @@
+"""
+Context Packer Tests - Offset merging, token budgets and citations
+"""
+
+import pytest
+
+from app.services.context_packer import ContextPacker
+from app.services.rag_service import RAGService
+
+TEXT = "Section 1 Fees. Customer pays monthly. Section 2 Term. The term is one year. Either party may terminate."
+
+
+def _chunk(start: int, end: int, score: float, contract_id: str = "c1", **metadata) -> dict:
+    return {
+        "text": TEXT[start:end],
+        "relevance_score": score,
+        "source_chunk": f"{contract_id}_{start}",
+        "metadata": {"contract_id": contract_id, "start": start, "end": end, **metadata},
+    }
+
+
+def _words(text: str) -> int:
+    return len(text.split())
+
+
+def test_overlapping_chunks_merge_without_repeating_text():
+    packer = ContextPacker(token_budget=100, tokenizer=_words)
+    spans = packer.pack([_chunk(40, 80, 0.8), _chunk(0, 50, 0.9, section="Section 1 Fees", page_number=1)])
+
+    assert len(spans) == 1
+    assert spans[0].text == TEXT[0:80]
+    assert (spans[0].start, spans[0].end) == (0, 80)
+    assert spans[0].relevance_score == 0.9
+    assert spans[0].source_chunks == ["c1_0", "c1_40"]
+    assert spans[0].citation == "Section 1 Fees, p. 1"
+
+
+def test_spans_of_different_contracts_stay_apart():
+    packer = ContextPacker(token_budget=100, tokenizer=_words)
+    spans = packer.pack([_chunk(0, 40, 0.7, "c1"), _chunk(30, 60, 0.9, "c2")])
+
+    assert [span.contract_id for span in spans] == ["c2", "c1"]
+
+
+def test_budget_keeps_most_relevant_spans_that_fit():
+    packer = ContextPacker(token_budget=8, tokenizer=_words)
+    spans = packer.pack([_chunk(0, 15, 0.5, "c3"), _chunk(55, 76, 0.9, "c1"), _chunk(77, 104, 0.6, "c2")])
+
+    # 5 + 4 words would not fit; the less relevant 3-word span still does
+    assert [span.contract_id for span in spans] == ["c1", "c3"]
+    assert sum(span.tokens for span in spans) == 8
+
+
+def test_best_span_is_truncated_rather_than_dropped():
+    packer = ContextPacker(token_budget=2, tokenizer=len)
+    spans = packer.pack([_chunk(0, 40, 0.9)])
+
+    assert len(spans) == 1
+    assert spans[0].text == TEXT[0:2]
+    assert spans[0].end == 2
+
+
+def test_render_numbers_sources_with_citations():
+    packer = ContextPacker(token_budget=100, tokenizer=_words)
+    rendered = packer.render(packer.pack([_chunk(0, 14, 0.9, section="Section 1 Fees")]))
+
+    assert rendered == "[Source 1 | Section 1 Fees]\nSection 1 Fees"
+
+
+@pytest.mark.asyncio
+async def test_chunks_carry_offsets_sections_and_pages():
+    text = "1. Fees\nCustomer pays monthly.\n2. Term\nThe term is one year. It renews automatically."
+    rag = RAGService()
+    rag.chunk_size, rag.chunk_overlap = 40, 10
+    chunks = await rag.chunk_document(text, {"contract_id": "c1", "page_offsets": [0, 31]})
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        metadata = chunk["metadata"]
+        assert chunk["text"] == text[metadata["start"]:metadata["end"]]
+        assert "page_offsets" not in metadata
+    assert chunks[0]["metadata"]["section"] == "1. Fees"
+    assert chunks[0]["metadata"]["page_number"] == 1
+    assert chunks[-1]["metadata"]["section"] == "2. Term"
+    assert chunks[-1]["metadata"]["page_number"] == 2
@@ -0,0 +1,115 @@
+"""
+Dashboard Store Tests - Incremental aggregates match a rebuild from disk
+"""
+
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.services.dashboard_store import ContractSummary, DashboardStore
+
+TODAY = date(2026, 3, 1)
+
+
+def _summary(
+    contract_id: str, organization_id: str, risk_level: str, risk_score: float, renewal: str
+) -> ContractSummary:
+    return ContractSummary.from_analysis(
+        organization_id,
+        {
+            "contract_id": contract_id,
+            "risk_level": risk_level,
+            "risk_score": risk_score,
+            "compliance_score": 100 - risk_score,
+            "key_clauses": [
+                {"category": "termination", "risk_level": risk_level},
+                {"category": "payment", "risk_level": "Low"},
+            ],
+            "obligations": [{"due_date": "2026-04-01", "description": "Quarterly report", "priority": "High"}],
+            "terms": {
+                "key_dates": [
+                    {"date": renewal, "type": "renewal", "description": "Automatic renewal", "priority": "medium"},
+                ],
+            },
+        },
+        vendor=f"Vendor {contract_id}",
+    )
+
+
+def _dashboards(store: DashboardStore) -> dict:
+    dashboards = {org: store.dashboard(org, today=TODAY) for org in ("org-a", "org-b")}
+    for dashboard in dashboards.values():
+        dashboard.pop("updated_at")
+    return dashboards
+
+
+def test_record_remove_matches_rebuild(tmp_path):
+    store = DashboardStore(str(tmp_path), expiring_days=30)
+    store.record(_summary("c1", "org-a", "High", 80, "2026-03-20"))
+    store.record(_summary("c2", "org-a", "Low", 20, "2026-05-01"))
+    store.record(_summary("c3", "org-b", "Medium", 50, "2026-03-10"))
+    store.record(_summary("c2", "org-a", "Medium", 40, "2026-03-25"))  # Re-analysed
+    store.record(_summary("c4", "org-a", "Low", 10, "2026-04-15"))
+    assert store.remove("c4")
+    assert not store.remove("missing")
+
+    incremental = _dashboards(store)
+    rebuilt = DashboardStore(str(tmp_path), expiring_days=30)
+    assert rebuilt.rebuild()["contracts"] == 3
+    assert _dashboards(rebuilt) == incremental
+
+    stats = incremental["org-a"]["contract_stats"]
+    assert (stats["total"], stats["high"], stats["medium"], stats["low"]) == (2, 1, 1, 0)
+    assert stats["avg_risk"] == 60.0
+    assert stats["expiring_soon"] == 2
+    assert incremental["org-a"]["clause_categories"] == {"termination": 2, "payment": 2}
+
+
+def test_removing_every_contract_empties_aggregates(tmp_path):
+    store = DashboardStore(str(tmp_path))
+    store.record(_summary("c1", "org-a", "High", 80, "2026-03-20"))
+    store.remove("c1")
+
+    dashboard = store.dashboard("org-a", today=TODAY)
+    assert dashboard["contract_stats"]["total"] == 0
+    assert dashboard["clause_categories"] == {}
+    assert dashboard["upcoming_renewals"] == []
+    assert dashboard["upcoming_obligations"] == []
+
+
+def test_delete_route_removes_dashboard_contribution(settings):
+    with TestClient(create_app(), base_url="http://localhost") as client:
+        client.app.state.services.dashboard_store.record(_summary("c1", "org-a", "High", 80, "2026-03-20"))
+        organization = {"organization_id": "org-a"}
+        assert client.get("/api/v1/dashboard", params=organization).json()["contract_stats"]["total"] == 1
+
+        deleted = client.delete("/api/v1/contracts/c1").json()
+        assert (deleted["deleted"], deleted["dashboard"]) == (True, True)
+        assert client.get("/api/v1/dashboard", params=organization).json()["contract_stats"]["total"] == 0
+        assert client.post("/api/v1/dashboard/rebuild").json()["contracts"] == 0
+
+
+def test_summaries_keep_terms_across_a_rebuild(tmp_path):
+    store = DashboardStore(str(tmp_path))
+    store.record(ContractSummary.from_analysis("org-a", {
+        "contract_id": "c1",
+        "terms": {"expiration_date": "2027-01-15", "auto_renews": True, "key_dates": []},
+    }))
+
+    rebuilt = DashboardStore(str(tmp_path))
+    rebuilt.rebuild()
+    assert [(summary.contract_id, summary.terms) for summary in rebuilt.summaries()] == [
+        ("c1", {"expiration_date": "2027-01-15", "auto_renews": True}),
+    ]
+
+
+def test_ids_that_sanitize_alike_keep_separate_files(tmp_path):
+    store = DashboardStore(str(tmp_path))
+    store.record(_summary("a/b", "org-a", "High", 80, "2026-03-20"))
+    store.record(_summary("a_b", "org-a", "Low", 20, "2026-05-01"))
+    assert store.remove("a/b")
+
+    rebuilt = DashboardStore(str(tmp_path))
+    assert rebuilt.rebuild()["contracts"] == 1
+    assert [summary.contract_id for summary in rebuilt.summaries()] == ["a_b"]
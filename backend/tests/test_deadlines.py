@@ -0,0 +1,185 @@
+"""
+Deadline Tests - Budget propagation, bounded calls, hedging and degraded answers
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.deadlines import DeadlineExceeded, DeadlineMiddleware, bounded, deadline, hedged, latency_window, remaining
+from app.main import create_app
+from app.services.rag_service import RAGService
+from app.services.vector_service import VectorService
+
+
+def _vector() -> list[float]:
+    vector = np.zeros(1536, dtype=np.float32)
+    vector[0] = 1.0
+    return vector.tolist()
+
+
+class _LLM:
+    async def embed_text(self, text: str) -> list[float]:
+        return _vector()
+
+    async def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        return [_vector() for _ in texts]
+
+    async def answer_question(self, question: str, context: str) -> str:
+        return f"answered from {len(context)} characters"
+
+
+def test_nested_deadlines_only_shorten():
+    assert remaining() is None
+    with deadline(10.0):
+        with deadline(60.0):
+            assert remaining() <= 10.0
+        with deadline(0.5):
+            assert remaining() <= 0.5
+        with deadline(None):
+            assert 0.5 < remaining() <= 10.0
+    assert remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_bounded_passes_the_remaining_budget():
+    timeouts = []
+
+    async def call(timeout):
+        timeouts.append(timeout)
+        return "ok"
+
+    assert await bounded(call, "test.bounded.pass") == "ok"
+    assert await bounded(call, "test.bounded.pass", cap=2.0) == "ok"
+    with deadline(1.0):
+        assert await bounded(call, "test.bounded.pass", cap=2.0) == "ok"
+    assert timeouts[:2] == [None, 2.0]
+    assert 0 < timeouts[2] <= 1.0
+
+
+@pytest.mark.asyncio
+async def test_bounded_raises_when_the_budget_runs_out():
+    async def slow(timeout):
+        await asyncio.sleep(1.0)
+
+    with deadline(0.02):
+        with pytest.raises(DeadlineExceeded):
+            await bounded(slow, "test.bounded.slow")
+    with deadline(0.0):
+        with pytest.raises(DeadlineExceeded, match="no time budget left"):
+            await bounded(slow, "test.bounded.slow")
+
+
+@pytest.mark.asyncio
+async def test_slow_attempt_is_hedged_and_backup_wins():
+    window = latency_window("test.hedge")
+    for _ in range(20):
+        window.observe(0.01)
+    attempts = []
+
+    async def call():
+        attempts.append(len(attempts))
+        await asyncio.sleep(1.0 if len(attempts) == 1 else 0.0)
+        return len(attempts)
+
+    assert await asyncio.wait_for(hedged(call, "test.hedge"), 0.5) == 2
+    assert len(attempts) == 2
+
+    attempts.clear()
+    assert await hedged(lambda: asyncio.sleep(0, "single"), "test.hedge", enabled=False) == "single"
+
+
+@pytest.mark.asyncio
+async def test_hedged_raises_when_every_attempt_fails():
+    async def failing():
+        raise ConnectionError("reset")
+
+    with pytest.raises(ConnectionError):
+        await hedged(failing, "test.hedge.failing")
+
+
+@pytest.mark.asyncio
+async def test_cancelled_attempt_leaves_the_backup_to_answer():
+    window = latency_window("test.hedge.cancelled")
+    for _ in range(20):
+        window.observe(0.01)
+    attempts = []
+
+    async def call():
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            await asyncio.sleep(0.05)
+            raise asyncio.CancelledError()  # e.g. its connection was torn down
+        await asyncio.sleep(0.1)
+        return "backup"
+
+    assert await asyncio.wait_for(hedged(call, "test.hedge.cancelled"), 1.0) == "backup"
+
+
+@pytest.mark.asyncio
+async def test_only_remote_vector_queries_are_hedged():
+    window = latency_window("vector.search")
+    for _ in range(256):
+        window.observe(0.001)
+    vectors = VectorService(api_key="test", partition_count=1)
+    await vectors.upsert("c1_chunk_0", _vector(), {"contract_id": "c1", "organization_id": "org-a"})
+    queries = []
+    search = vectors._search_partition
+
+    def slow(*args):
+        queries.append(args[0])
+        time.sleep(0.05)
+        return search(*args)
+
+    vectors._search_partition = slow
+    # In-process partitions are scored under their lock: a backup would only queue behind the first query
+    assert len(await vectors.search(_vector(), filters={"organization_id": "org-a"})) == 1
+    assert len(queries) == 1
+
+    queries.clear()
+    vectors.remote = True
+    assert len(await vectors.search(_vector(), filters={"organization_id": "org-a"})) == 1
+    assert len(queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_short_budget_degrades_retrieval():
+    vectors = VectorService(api_key="test")
+    rag = RAGService(llm_service=_LLM(), vector_service=vectors)
+    await rag.ingest_document("c1", "Fees are due monthly. The term is one year. " * 40, {"organization_id": "org-a"})
+
+    full = await rag.answer_question("fees", "c1", context_limit=3)
+    assert not full["degraded"] and len(full["citations"]) >= 1
+
+    rag.answer_reserve_seconds = 5.0
+    with deadline(5.5):
+        short = await rag.answer_question("fees", "c1", context_limit=3)
+    assert short["degraded"] and len(short["citations"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_middleware_caps_client_timeouts():
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(remaining())
+
+    middleware = DeadlineMiddleware(app, default_seconds=30.0)
+    timeouts = [b"2", b"600", b"x"]
+    for headers in [[]] + [[(b"x-request-timeout", value)] for value in timeouts]:
+        await middleware({"type": "http", "headers": headers}, None, None)
+
+    assert 29 < seen[0] <= 30 and 1 < seen[1] <= 2 and 29 < seen[2] <= 30 and 29 < seen[3] <= 30
+
+
+def test_exhausted_budget_maps_to_504(settings):
+    with TestClient(create_app(), base_url="http://localhost") as client:
+        response = client.post(
+            "/api/v1/analysis/c1/clarify", json={"question": "When does it renew?"}, headers={"X-Request-Timeout": "0"}
+        )
+
+    assert response.status_code == 504
+    assert response.json() == {"detail": "Request deadline exceeded"}
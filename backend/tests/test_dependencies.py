@@ -0,0 +1,63 @@
+"""
+Service Container Tests - Shared pools, warmup and the readiness probe
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.dependencies import ServiceContainer
+from app.main import create_app
+
+
+@pytest.mark.asyncio
+async def test_services_share_pooled_clients(settings):
+    services = ServiceContainer.from_settings(settings)
+
+    assert services.llm_service.http_client is services.http_clients["openai"]
+    assert services.vector_service.http_client is services.http_clients["pinecone"]
+    assert services.rag_service.llm_service is services.llm_service
+    assert services.rag_service.vector_service is services.vector_service
+    assert services.rag_service.text_store is services.text_store
+    await services.close()
+
+
+@pytest.mark.asyncio
+async def test_warmup_then_close(settings):
+    services = ServiceContainer.from_settings(settings)
+    assert not services.readiness()["ready"]
+
+    assert await services.warmup()
+    readiness = services.readiness()
+    assert readiness["ready"] and readiness["errors"] == []
+    assert readiness["warmup_ms"] >= 0
+    assert readiness["pools"]["openai"] == {"closed": False, "max_connections": 7, "max_keepalive": 20}
+
+    await services.close()
+    readiness = services.readiness()
+    assert not readiness["ready"]
+    assert all(pool["closed"] for pool in readiness["pools"].values())
+
+
+@pytest.mark.asyncio
+async def test_failed_warmup_is_not_ready(settings):
+    services = ServiceContainer.from_settings(settings)
+
+    async def unavailable() -> bool:
+        return False
+
+    services.vector_service.init_index = unavailable
+    assert not await services.warmup()
+    assert services.readiness()["errors"] == ["vector index initialization failed"]
+    await services.close()
+
+
+def test_health_reports_readiness(settings):
+    with TestClient(create_app(), base_url="http://localhost") as client:
+        response = client.get("/health")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "healthy"
+        assert set(body["pools"]) == {"openai", "pinecone"}
+
+        client.app.state.services.ready = False
+        assert client.get("/health").status_code == 503
@@ -0,0 +1,95 @@
+"""
+Bulk Ingestion Tests - Process-pool chunking and resumable manifest
+"""
+
+import os
+
+import pytest
+
+from app.ingest import MANIFEST_NAME, BulkIngestor, Manifest, contract_id_for
+from app.services.text_store import DocumentTextStore
+
+
+class _RecordingRAG:
+    """store_embeddings stand-in recording what was embedded; contracts in `failing` raise"""
+
+    chunk_size = 200
+    chunk_overlap = 20
+
+    def __init__(self, failing: frozenset = frozenset()):
+        self.failing = failing
+        self.stored: dict[str, list[dict]] = {}
+
+    async def store_embeddings(self, contract_id: str, chunks: list[dict]) -> list[str]:
+        if contract_id in self.failing:
+            raise RuntimeError("embedding API unavailable")
+        self.stored[contract_id] = chunks
+        return [chunk["id"] for chunk in chunks]
+
+
+def _corpus(root) -> None:
+    (root / "vendors").mkdir()
+    (root / "msa.txt").write_text("Master services agreement. Fees are due monthly. " * 10)
+    (root / "vendors" / "acme.txt").write_text("Acme order form. The term is one year.")
+    (root / "vendors" / "globex.txt").write_text("Globex NDA. Confidentiality survives termination.")
+    (root / "notes.md").write_text("not a contract")
+
+
+def _ingestor(root, rag, **kwargs) -> BulkIngestor:
+    return BulkIngestor(rag, root=str(root), metadata={"organization_id": "org-a"}, processes=1, **kwargs)
+
+
+def test_contract_ids_follow_relative_paths():
+    assert contract_id_for("/corpus", "/corpus/vendors/acme.txt") == "vendors-acme-c71bede7"
+    assert contract_id_for("/corpus", "/corpus/2024 MSA (signed).txt") == "2024-MSA-signed-293905ac"
+    assert contract_id_for("/corpus", "/corpus/msa.txt") == "msa"
+    assert contract_id_for("/corpus", "/corpus/a/b.txt") != contract_id_for("/corpus", "/corpus/a-b.txt")
+
+
+@pytest.mark.asyncio
+async def test_chunks_every_contract_with_shared_metadata(tmp_path):
+    _corpus(tmp_path)
+    rag = _RecordingRAG()
+    store_root = str(tmp_path / "text")
+
+    stats = await _ingestor(tmp_path, rag, text_store_root=store_root).run()
+
+    assert (stats.docs, stats.failed, stats.skipped) == (3, 0, 0)
+    assert sorted(rag.stored) == ["msa", "vendors-acme-c71bede7", "vendors-globex-3346e224"]
+    assert len(rag.stored["msa"]) > 1
+    chunk = rag.stored["vendors-acme-c71bede7"][0]
+    assert chunk["metadata"]["organization_id"] == "org-a"
+    assert chunk["metadata"]["contract_id"] == "vendors-acme-c71bede7"
+    assert DocumentTextStore(store_root).get("vendors-acme-c71bede7") == "Acme order form. The term is one year."
+
+
+@pytest.mark.asyncio
+async def test_rerun_resumes_after_failures_and_edits(tmp_path):
+    _corpus(tmp_path)
+    first = await _ingestor(tmp_path, _RecordingRAG(failing=frozenset({"vendors-globex-3346e224"}))).run()
+    assert (first.docs, first.failed) == (2, 1)
+
+    rag = _RecordingRAG()
+    second = await _ingestor(tmp_path, rag).run()
+    assert (second.docs, second.skipped) == (1, 2)
+    assert list(rag.stored) == ["vendors-globex-3346e224"]
+
+    (tmp_path / "vendors" / "acme.txt").write_text("Acme order form, amended. The term is two years.")
+    rag = _RecordingRAG()
+    third = await _ingestor(tmp_path, rag).run()
+    assert list(rag.stored) == ["vendors-acme-c71bede7"]
+    assert third.skipped == 2
+
+
+def test_manifest_ignores_a_torn_last_line(tmp_path):
+    path = str(tmp_path / MANIFEST_NAME)
+    manifest = Manifest(path)
+    manifest.record({"path": "a.txt", "size": 1, "mtime": 1.0})
+    manifest.close()
+    with open(path, "a") as handle:
+        handle.write('{"path": "b.txt", "si')
+
+    reopened = Manifest(path)
+    assert list(reopened.completed) == ["a.txt"]
+    reopened.close()
+    assert os.path.getsize(path) > 0
@@ -0,0 +1,59 @@
+"""
+Load Test Harness Tests - Fake-backed app, clarify endpoint and route statistics
+"""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.loadtest import RouteStats, fake_app
+
+
+@pytest.fixture
+def client(settings, monkeypatch):
+    for name in ("LLM_LATENCY", "EMBED_LATENCY", "SEARCH_LATENCY"):
+        monkeypatch.setenv(f"LOADTEST_{name}", "0")
+    monkeypatch.setenv("LOADTEST_SEED_CONTRACTS", "3")
+    with TestClient(fake_app(), base_url="http://localhost") as client:
+        yield client
+
+
+def test_clarify_answers_from_a_seeded_contract(client):
+    response = client.post(
+        "/api/v1/analysis/contract-00001/clarify",
+        json={"question": "When can either party terminate?", "token_budget": 500},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["contract_id"] == "contract-00001"
+    assert body["answer"] and body["citations"]
+    assert client.post("/api/v1/analysis/contract-00001/clarify", json={"question": ""}).status_code == 422
+
+
+def test_upload_is_analyzed_by_fake_backends(client):
+    upload = client.post(
+        "/api/v1/contracts/upload",
+        files={"file": ("msa.txt", b"The term is one year and renews automatically.", "text/plain")},
+        data={"organization_id": "org-a"},
+    )
+    assert upload.status_code == 202
+
+    for _ in range(200):
+        status = client.get(upload.json()["status_url"]).json()
+        if status["status"] in ("succeeded", "failed"):
+            break
+        time.sleep(0.01)
+    assert status["status"] == "succeeded"
+
+
+def test_route_stats_count_server_errors_and_timeouts():
+    stats = RouteStats()
+    for latency, status in [(0.1, 200), (0.2, 202), (0.3, 503), (0.4, None)]:
+        stats.record(latency, status)
+
+    summary = stats.summary(duration=2.0)
+    assert (summary["requests"], summary["throughput"], summary["error_rate"]) == (4, 2.0, 0.5)
+    assert summary["statuses"] == {"0": 1, "200": 1, "202": 1, "503": 1}
+    assert summary["p50_ms"] == pytest.approx(250.0)
@@ -0,0 +1,116 @@
+"""
+Metrics Tests - Histograms, instrumented services and the scrape endpoint
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.metrics import Histogram, MetricsRegistry, instrument
+from app.services import vector_service
+from app.services.vector_service import VectorService
+
+
+class _Service:
+    async def search(self, query: str) -> list:
+        return [query]
+
+    async def summarize_contract(self, text: str) -> str:
+        raise RuntimeError("upstream timeout")
+
+    async def stream(self, count: int):
+        for index in range(count):
+            yield index
+
+    def sync_helper(self) -> int:
+        return 1
+
+    async def _private(self) -> None:
+        return None
+
+
+def test_histogram_buckets_are_upper_bounds():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(2.65)
+
+
+def test_render_cumulates_buckets_and_escapes_labels():
+    registry = MetricsRegistry()
+    registry.histogram("latency_seconds", "Latency", method="search").observe(0.3)
+    registry.counter("calls_total", "Calls", method='say "hi"').inc(2)
+    assert registry.counter("calls_total", method='say "hi"').value == 2
+
+    text = registry.render()
+    assert '# TYPE latency_seconds histogram' in text
+    assert 'latency_seconds_bucket{method="search",le="0.25"} 0' in text
+    assert 'latency_seconds_bucket{method="search",le="0.5"} 1' in text
+    assert 'latency_seconds_bucket{method="search",le="+Inf"} 1' in text
+    assert 'latency_seconds_sum{method="search"} 0.3' in text
+    assert 'calls_total{method="say \\"hi\\""} 2' in text
+
+
+@pytest.mark.asyncio
+async def test_instrument_times_public_async_methods():
+    registry = MetricsRegistry()
+    service = instrument(_Service(), "vector", registry)
+
+    assert await service.search("fees") == ["fees"]
+    assert [item async for item in service.stream(3)] == [0, 1, 2]
+    assert service.sync_helper() == 1
+
+    def value(name: str, method: str) -> float:
+        return registry.counter(name, service="vector", method=method).value
+
+    assert value("contractguard_service_calls_total", "search") == 1
+    assert value("contractguard_service_calls_total", "stream") == 1
+    assert value("contractguard_service_errors_total", "search") == 0
+    assert registry.histogram("contractguard_service_latency_seconds", service="vector", method="search").count == 1
+    assert registry.gauge("contractguard_slo_target_seconds", service="vector", method="search").value == 0.1
+    assert "method=\"_private\"" not in registry.render()
+
+
+@pytest.mark.asyncio
+async def test_instrument_counts_errors_and_early_exit():
+    registry = MetricsRegistry()
+    service = instrument(_Service(), "llm", registry)
+
+    with pytest.raises(RuntimeError):
+        await service.summarize_contract("text")
+    stream = service.stream(5)
+    assert await stream.__anext__() == 0
+    await stream.aclose()
+
+    def value(name: str, method: str) -> float:
+        return registry.counter(name, service="llm", method=method).value
+
+    assert value("contractguard_service_errors_total", "summarize_contract") == 1
+    assert value("contractguard_service_calls_total", "stream") == 1
+    assert value("contractguard_service_errors_total", "stream") == 0
+
+
+@pytest.mark.asyncio
+async def test_absorbed_search_failures_are_counted(monkeypatch):
+    vectors = VectorService(api_key="test", hedge_searches=False)
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("index unavailable")
+
+    monkeypatch.setattr(vectors, "_partitions_for", broken)
+    before = vector_service._SEARCH_ERRORS.value
+
+    assert await vectors.search([1.0] * 1536, top_k=3) == []
+    assert vector_service._SEARCH_ERRORS.value == before + 1
+
+
+def test_metrics_endpoint_serves_prometheus_text(settings):
+    with TestClient(create_app(), base_url="http://localhost") as client:
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'contractguard_slo_target_seconds{method="search",service="vector"} 0.1' in response.text
@@ -0,0 +1,86 @@
+"""
+Near-Duplicate Index Tests - Lookups and embedding reuse stay within an organization
+"""
+
+import numpy as np
+import pytest
+
+from app.services.near_duplicates import NearDuplicateIndex
+from app.services.rag_service import RAGService
+from app.services.vector_service import VectorService
+
+CONTRACT = " ".join(
+    f"Section {number}. The provider shall deliver the services described in schedule {number} "
+    f"and the customer shall pay the fees set out in the order form within thirty days."
+    for number in range(1, 40)
+)
+REVISED = CONTRACT.replace("Section 7.", "Section 7 (amended).")
+
+
+class _CountingEmbedder:
+    def __init__(self):
+        self.embedded = 0
+
+    async def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        self.embedded += len(texts)
+        vector = np.zeros(1536, dtype=np.float32)
+        vector[0] = 1.0
+        return [vector.tolist() for _ in texts]
+
+
+def test_nearest_finds_revision_in_same_organization():
+    index = NearDuplicateIndex()
+    index.add("c1", "org-a", index.signature(CONTRACT), {"contract_id": "c1"})
+
+    match = index.nearest("org-a", index.signature(REVISED))
+    assert match is not None
+    assert match.contract_id == "c1"
+    assert match.similarity >= index.threshold
+
+
+def test_nearest_never_crosses_organizations():
+    index = NearDuplicateIndex()
+    index.add("c1", "org-a", index.signature(CONTRACT), {"contract_id": "c1"})
+
+    assert index.nearest("org-b", index.signature(CONTRACT)) is None
+    index.add("c2", "org-b", index.signature(CONTRACT), {"contract_id": "c2"})
+    assert index.nearest("org-b", index.signature(CONTRACT)).contract_id == "c2"
+    assert index.nearest("org-a", index.signature(CONTRACT)).contract_id == "c1"
+
+
+def test_nearest_skips_excluded_and_removed_contracts():
+    index = NearDuplicateIndex()
+    signature = index.signature(CONTRACT)
+    index.add("c1", "org-a", signature, {"contract_id": "c1"})
+
+    assert index.nearest("org-a", signature, exclude="c1") is None
+    index.remove("c1")
+    assert index.nearest("org-a", signature) is None
+
+
+def test_chunk_donors_are_per_organization():
+    index = NearDuplicateIndex()
+    index.add_chunks("org-a", "c1", [("f1", "c1-0")])
+
+    assert index.chunk_donors("org-a", ["f1", "f2"]) == [("c1", "c1-0"), None]
+    assert index.chunk_donors("org-b", ["f1"]) == [None]
+
+
+@pytest.mark.asyncio
+async def test_revised_contract_reuses_unchanged_chunk_embeddings():
+    llm = _CountingEmbedder()
+    vectors = VectorService(api_key="test")
+    rag = RAGService(llm_service=llm, vector_service=vectors, near_duplicates=NearDuplicateIndex())
+    rag.chunk_size, rag.chunk_overlap = 400, 0
+
+    first = await rag.ingest_document("c1", CONTRACT, {"organization_id": "org-a"})
+    embedded = llm.embedded
+    second = await rag.ingest_document("c2", REVISED, {"organization_id": "org-a"})
+
+    assert len(first) == len(second) > 3
+    assert llm.embedded - embedded == 1
+    stored = await vectors.fetch(second, contract_id="c2")
+    assert all(result.metadata["text_hash"] for result in stored.values())
+
+    await rag.ingest_document("c3", REVISED, {"organization_id": "org-b"})
+    assert llm.embedded - embedded == 1 + len(second)
@@ -0,0 +1,165 @@
+"""
+Extraction Tests - Page-ordered PDF parsing, selective OCR and streaming ingestion
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from app.services import ocr_service, rag_service
+from app.services.ocr_service import OCRService, detect_kind
+from app.services.rag_service import RAGService, chunk_text, prepare_document
+from app.services.storage import LocalDocumentStorage
+from app.services.vector_service import VectorService
+
+_PAGES = [
+    "1. Term. The term is one year and renews automatically.",
+    "",
+    "2. Fees. Customer shall pay all invoices within thirty days.",
+]
+
+
+def _vector() -> list[float]:
+    vector = np.zeros(1536, dtype=np.float32)
+    vector[0] = 1.0
+    return vector.tolist()
+
+
+class _Embedder:
+    async def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        return [_vector() for _ in texts]
+
+
+@pytest.fixture
+def fake_pdf(tmp_path, monkeypatch):
+    """A stored '%PDF-' upload whose page parsing and OCR are faked in-process"""
+    ocr_calls = []
+
+    def ocr_page(path: str, number: int, dpi: int) -> str:
+        ocr_calls.append(number)
+        return f"Scanned page {number}. Confidentiality survives termination."
+
+    monkeypatch.setattr(ocr_service, "_count_pdf_pages", lambda path: len(_PAGES))
+    monkeypatch.setattr(ocr_service, "_extract_pdf_pages", lambda path, first, last: _PAGES[first:last])
+    monkeypatch.setattr(ocr_service, "_ocr_pdf_page", ocr_page)
+    storage = LocalDocumentStorage(str(tmp_path))
+    (tmp_path / "msa.pdf").write_bytes(b"%PDF-1.7 fake")
+    service = OCRService(storage, batch_pages=2, executor=ThreadPoolExecutor(2))
+    yield service, ocr_calls
+    service.executor.shutdown()
+
+
+def test_detect_kind(tmp_path):
+    for name, content in [("a.pdf", b"%PDF-1.4"), ("b.png", b"\x89PNG\r\n"), ("c.txt", b"Fees")]:
+        (tmp_path / name).write_bytes(content)
+
+    assert detect_kind(str(tmp_path / "a.pdf")) == "pdf"
+    assert detect_kind(str(tmp_path / "b.png")) == "image"
+    assert detect_kind(str(tmp_path / "c.txt")) == "text"
+    assert detect_kind(str(tmp_path / "c.txt"), "image/jpeg") == "image"
+
+
+@pytest.mark.asyncio
+async def test_pdf_pages_stream_in_order_with_ocr_for_blank_pages(fake_pdf):
+    service, ocr_calls = fake_pdf
+
+    pages = [page async for page in service.extract_pages("msa.pdf")]
+
+    assert [(page.number, page.total, page.method) for page in pages] == [
+        (1, 3, "text_layer"), (2, 3, "ocr"), (3, 3, "text_layer")
+    ]
+    assert pages[1].text.startswith("Scanned page 2.")
+    assert ocr_calls == [2]
+
+
+@pytest.mark.asyncio
+async def test_text_uploads_split_at_form_feeds(tmp_path):
+    (tmp_path / "nda.txt").write_bytes("Page one.\fPage two.".encode())
+    service = OCRService(LocalDocumentStorage(str(tmp_path)))
+
+    text, offsets = await service.extract_text("nda.txt")
+
+    assert (text, offsets) == ("Page one.\nPage two.", [0, 10])
+
+
+@pytest.mark.asyncio
+async def test_ingest_pages_chunks_while_pages_arrive(fake_pdf):
+    service, _ = fake_pdf
+    vectors = VectorService(api_key="test")
+    rag = RAGService(llm_service=_Embedder(), vector_service=vectors)
+    rag.chunk_size, rag.chunk_overlap = 80, 10
+
+    async def pages():
+        async for page in service.extract_pages("msa.pdf"):
+            yield page.text
+
+    text, chunks = await rag.ingest_pages("c1", pages(), {"organization_id": "org-a"})
+
+    assert text.count("\n") == 2
+    assert [chunk["id"] for chunk in chunks] == [f"c1_chunk_{index}" for index in range(len(chunks))]
+    stored = await vectors.search(_vector(), top_k=20, filters={"contract_id": "c1"}, threshold=0.0)
+    assert {result.metadata["page_number"] for result in stored} == {1, 2, 3}
+    assert all(result.metadata["text"] in text for result in stored)
+
+
+def _sectioned_pages(count: int) -> list[str]:
+    words = "The supplier shall deliver the goods described in each order".split()
+    return [
+        f"{section}. Section {section}\n" + " ".join(
+            f"{' '.join(words[:3 + (section * sentence) % 9])} item {sentence}." for sentence in range(12)
+        )
+        for section in range(1, count + 1)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ingest_pages_chunks_like_a_single_pass():
+    pages = _sectioned_pages(5)
+    rag = RAGService(llm_service=_Embedder(), vector_service=VectorService(api_key="test"))
+
+    async def arriving():
+        for page in pages:
+            yield page
+
+    for chunk_size, chunk_overlap in [(80, 10), (120, 60), (200, 150)]:
+        rag.chunk_size, rag.chunk_overlap = chunk_size, chunk_overlap
+        text, chunks = await rag.ingest_pages("c1", arriving(), {"organization_id": "org-a"})
+
+        offsets, position = [], 0
+        for page in pages:
+            offsets.append(position)
+            position += len(page) + 1
+        joined, metadata = prepare_document("\n".join(pages), {"contract_id": "c1", "page_offsets": offsets})
+        single_pass = chunk_text(joined, {**metadata, "organization_id": "org-a"}, chunk_size, chunk_overlap)
+        assert text == joined
+        fields = ("chunk_index", "start", "end", "section", "page_number")
+        assert [[chunk["metadata"].get(key) for key in fields] for chunk in chunks] == [
+            [chunk["metadata"].get(key) for key in fields] for chunk in single_pass
+        ]
+
+
+@pytest.mark.asyncio
+async def test_ingest_pages_rescans_only_the_open_chunk_for_headings(monkeypatch):
+    pages = _sectioned_pages(40)
+    scanned = []
+    pattern = rag_service._HEADING_PATTERN
+
+    class _Counting:
+        def finditer(self, text, pos=0):
+            scanned.append(len(text) - pos)
+            return pattern.finditer(text, pos)
+
+    monkeypatch.setattr(rag_service, "_HEADING_PATTERN", _Counting())
+    rag = RAGService(llm_service=_Embedder(), vector_service=VectorService(api_key="test"))
+    rag.chunk_size, rag.chunk_overlap = 200, 50
+
+    async def arriving():
+        for page in pages:
+            yield page
+
+    text, chunks = await rag.ingest_pages("c1", arriving(), {"organization_id": "org-a"})
+
+    # Each page's text is scanned about once, not the whole document per page
+    assert sum(scanned) < 2 * len(text)
+    assert chunks[-1]["metadata"]["section"] == "40. Section 40"
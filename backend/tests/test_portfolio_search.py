@@ -0,0 +1,108 @@
+"""
+Portfolio Search Tests - Partitioned fan-out and per-contract grouping
+"""
+
+import numpy as np
+import pytest
+
+from app.services.rag_service import RAGService
+from app.services.vector_service import VectorService
+
+
+def _vector(*weights: float) -> list[float]:
+    vector = np.zeros(1536, dtype=np.float32)
+    vector[:len(weights)] = weights
+    return vector.tolist()
+
+
+class _Embedder:
+    async def embed_text(self, text: str) -> list[float]:
+        return _vector(1.0)
+
+
+async def _portfolio() -> VectorService:
+    vectors = VectorService(api_key="test", partition_count=4)
+    for contract in range(6):
+        for chunk in range(3):
+            await vectors.upsert(
+                f"c{contract}_chunk_{chunk}",
+                _vector(1.0, 0.1 * contract + 0.01 * chunk),
+                {
+                    "contract_id": f"c{contract}", "organization_id": "org-a", "chunk_index": chunk,
+                    "text": f"Contract {contract} chunk {chunk}", "start": 0, "end": 10,
+                },
+            )
+    await vectors.upsert(
+        "other", _vector(1.0, 0.05), {"contract_id": "x1", "organization_id": "org-b", "text": "Other"}
+    )
+    return vectors
+
+
+@pytest.mark.asyncio
+async def test_search_merges_partitions_and_pins_contract_filters():
+    vectors = await _portfolio()
+
+    results = await vectors.search(_vector(1.0), top_k=4, threshold=0.0)
+    assert [result.id for result in results] == ["c0_chunk_0", "c0_chunk_1", "c0_chunk_2", "other"]
+
+    pinned = await vectors.search(_vector(1.0), top_k=10, filters={"contract_id": "c3"}, threshold=0.0)
+    assert {result.metadata["contract_id"] for result in pinned} == {"c3"}
+    assert len(pinned) == 3
+
+
+@pytest.mark.asyncio
+async def test_search_partitions_covers_every_partition_once():
+    vectors = await _portfolio()
+
+    seen = [
+        result.id
+        async for _, results in vectors.search_partitions(
+            _vector(1.0), top_k=20, filters={"organization_id": "org-a"}, threshold=0.0
+        )
+        for result in results
+    ]
+    assert sorted(seen) == sorted(f"c{contract}_chunk_{chunk}" for contract in range(6) for chunk in range(3))
+
+
+@pytest.mark.asyncio
+async def test_retrieve_portfolio_groups_and_ranks_contracts():
+    rag = RAGService(llm_service=_Embedder(), vector_service=await _portfolio())
+
+    portfolio = await rag.retrieve_portfolio("renewals", "org-a", per_contract_limit=2, contract_limit=3, threshold=0.0)
+
+    assert [hits.contract_id for hits in portfolio] == ["c0", "c1", "c2"]
+    assert all(len(hits.chunks) == 2 for hits in portfolio)
+    assert [chunk["source_chunk"] for chunk in portfolio[0].chunks] == ["c0_chunk_0", "c0_chunk_1"]
+    assert portfolio[0].best_score >= portfolio[1].best_score >= portfolio[2].best_score
+
+
+@pytest.mark.asyncio
+async def test_portfolio_prompt_names_each_contract():
+    rag = RAGService(llm_service=_Embedder(), vector_service=await _portfolio())
+
+    prompt = await rag.augment_portfolio_prompt("Which contracts renew?", "org-a", contract_limit=2)
+
+    assert "CONTEXT FROM 2 CONTRACTS" in prompt
+    assert "[Contract c0 |" in prompt and "[Contract c1 |" in prompt
+    assert "x1" not in prompt
+
+
+@pytest.mark.asyncio
+async def test_one_contract_with_many_matches_does_not_crowd_out_others():
+    vectors = VectorService(api_key="test", partition_count=1, hedge_searches=False)
+    for chunk in range(20):
+        await vectors.upsert(
+            f"big_chunk_{chunk}", _vector(1.0, 0.01),
+            {"contract_id": "big", "organization_id": "org-a", "text": "Big", "start": 0, "end": 3},
+        )
+    for contract in range(3):
+        await vectors.upsert(
+            f"c{contract}_chunk_0", _vector(1.0, 0.2 + 0.1 * contract),
+            {"contract_id": f"c{contract}", "organization_id": "org-a", "text": "Small", "start": 0, "end": 5},
+        )
+    rag = RAGService(llm_service=_Embedder(), vector_service=vectors)
+
+    portfolio = await rag.retrieve_portfolio("renewals", "org-a", per_contract_limit=2, contract_limit=3, threshold=0.0)
+
+    assert [hits.contract_id for hits in portfolio] == ["big", "c0", "c1"]
+    assert [len(hits.chunks) for hits in portfolio] == [2, 1, 1]
@@ -0,0 +1,77 @@
+"""
+Rerank Tests - MMR diversification of over-fetched retrieval candidates
+"""
+
+import numpy as np
+import pytest
+
+from app.services.rag_service import RAGService, RetrievalContext, lexical_overlap, maximal_marginal_relevance
+from app.services.vector_service import VectorService
+
+
+def _vector(*weights: float) -> list[float]:
+    """1536-dimensional vector with the given leading components"""
+    vector = np.zeros(1536, dtype=np.float32)
+    vector[:len(weights)] = weights
+    return vector.tolist()
+
+
+class _Embedder:
+    def __init__(self, embedding: list[float]):
+        self.embedding = embedding
+
+    async def embed_text(self, text: str) -> list[float]:
+        return self.embedding
+
+
+def test_mmr_skips_near_duplicates_of_selected_candidates():
+    query = [1.0, 0.0, 0.0]
+    candidates = [
+        [1.0, 0.05, 0.0],   # Most relevant
+        [1.0, 0.06, 0.0],   # Almost the same text again
+        [0.8, 0.0, 0.6],    # Less relevant, but different
+    ]
+
+    assert maximal_marginal_relevance(query, candidates, k=2, lambda_mult=0.5) == [0, 2]
+    # Pure relevance keeps the duplicate
+    assert maximal_marginal_relevance(query, candidates, k=2, lambda_mult=1.0) == [0, 1]
+
+
+def test_mmr_boosts_and_edge_cases():
+    query = [1.0, 0.0]
+    candidates = [[1.0, 0.0], [0.9, 0.1]]
+
+    assert maximal_marginal_relevance(query, candidates, k=1, boosts=[0.0, 0.5]) == [1]
+    assert maximal_marginal_relevance(query, candidates, k=5) == [0, 1]
+    assert maximal_marginal_relevance(query, [], k=3) == []
+    assert maximal_marginal_relevance(query, candidates, k=0) == []
+
+
+def test_lexical_overlap_is_share_of_query_terms():
+    scores = lexical_overlap(
+        "Termination for convenience", ["termination upon notice", None, "For convenience; termination"]
+    )
+
+    assert scores.tolist() == pytest.approx([1 / 3, 0.0, 1.0])
+    assert lexical_overlap("...", ["anything"]).tolist() == [0.0]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_context_returns_diverse_top_k():
+    vectors = VectorService(api_key="test")
+    await vectors.upsert("a", _vector(1.0, 0.05), {"contract_id": "c1", "text": "Liability is capped."})
+    await vectors.upsert("b", _vector(1.0, 0.06), {"contract_id": "c1", "text": "Liability is capped at fees."})
+    await vectors.upsert("c", _vector(0.8, 0.0, 0.6), {"contract_id": "c1", "text": "Indemnity is uncapped."})
+    await vectors.upsert("d", _vector(1.0, 0.0), {"contract_id": "c2", "text": "Other contract."})
+    rag = RAGService(llm_service=_Embedder(_vector(1.0)), vector_service=vectors)
+
+    retrieved = await rag.retrieve_context(RetrievalContext(
+        query="liability", top_k=2, threshold=0.5, filters={"contract_id": "c1"}, mmr_lambda=0.5
+    ))
+    assert [chunk["source_chunk"] for chunk in retrieved] == ["a", "c"]
+    assert retrieved[0]["text"] == "Liability is capped."
+
+    plain = await rag.retrieve_context(RetrievalContext(
+        query="liability", top_k=2, threshold=0.5, filters={"contract_id": "c1"}, rerank=False
+    ))
+    assert [chunk["source_chunk"] for chunk in plain] == ["a", "b"]
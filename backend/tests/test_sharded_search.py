@@ -0,0 +1,81 @@
+"""
+Sharded Search Tests - Scatter-gather top-k matches a single-pass scan
+"""
+
+import numpy as np
+import pytest
+
+from app.services.sharded_search import ShardedScorer, top_k_rows
+from app.services.vector_service import InMemoryIndex, VectorService
+
+
+def _unit_rows(count: int, dimension: int = 32, seed: int = 3) -> np.ndarray:
+    rows = np.random.default_rng(seed).standard_normal((count, dimension)).astype(np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+def test_shards_cover_rows_once():
+    scorer = ShardedScorer(workers=4, shard_rows=100)
+
+    assert scorer.shards(150) == [(0, 150)]
+    assert scorer.shards(250) == [(0, 125), (125, 250)]
+    assert scorer.shards(10_000) == [(0, 2500), (2500, 5000), (5000, 7500), (7500, 10_000)]
+
+
+@pytest.mark.parametrize("masked", [False, True])
+def test_sharded_top_k_matches_a_single_scan(masked):
+    matrix = _unit_rows(1000)
+    query = matrix[17]
+    mask = np.arange(1000) % 3 == 0 if masked else None
+    scorer = ShardedScorer(workers=4, shard_rows=100)
+
+    positions, scores = scorer.top_k(matrix, 900, query, 25, mask)
+    expected_positions, expected_scores = top_k_rows(matrix, 0, 900, query, 25, mask)
+
+    assert positions.tolist() == expected_positions.tolist()
+    assert np.allclose(scores, expected_scores)
+    assert positions.max() < 900
+    if masked:
+        assert all(position % 3 == 0 for position in positions.tolist())
+    assert scorer.stats()["started"]
+    scorer.close()
+
+
+def test_masked_out_rows_are_never_returned():
+    matrix = _unit_rows(50)
+    mask = np.zeros(50, dtype=bool)
+    mask[[4, 9]] = True
+
+    positions, _ = top_k_rows(matrix, 0, 50, matrix[0], 10, mask)
+    assert sorted(positions.tolist()) == [4, 9]
+
+
+def test_contract_filters_use_row_codes():
+    index = InMemoryIndex(dimension=4)
+    for row in range(6):
+        metadata = {"contract_id": f"c{row % 2}", "risk_level": "High" if row < 3 else "Low"}
+        index.upsert(f"v{row}", [1.0, row, 0.0, 0.0], metadata)
+    index.delete("v0")
+
+    results = index.query([1.0, 0.0, 0.0, 0.0], 10, {"contract_id": "c0"})
+    assert sorted(result.id for result in results) == ["v2", "v4"]
+    results = index.query([1.0, 0.0, 0.0, 0.0], 10, {"contract_id": {"$in": ["c1"]}, "risk_level": "Low"})
+    assert sorted(result.id for result in results) == ["v3", "v5"]
+    assert index.query([1.0, 0.0, 0.0, 0.0], 10, {"contract_id": "missing"}) == []
+
+
+@pytest.mark.asyncio
+async def test_large_partition_search_is_sharded():
+    sharded = VectorService(api_key="test", partition_count=1, search_workers=4, shard_rows=64)
+    inline = VectorService(api_key="test", partition_count=1, search_workers=1)
+    rows = _unit_rows(300, dimension=1536)
+    for row, values in enumerate(rows):
+        metadata = {"contract_id": f"c{row % 5}", "organization_id": "org-a"}
+        await sharded.upsert(f"v{row}", values.tolist(), metadata)
+        await inline.upsert(f"v{row}", values.tolist(), metadata)
+
+    for filters in (None, {"organization_id": "org-a"}, {"contract_id": "c2"}):
+        got = await sharded.search(rows[42].tolist(), top_k=10, filters=filters, threshold=-1.0)
+        expected = await inline.search(rows[42].tolist(), top_k=10, filters=filters, threshold=-1.0)
+        assert [result.id for result in got] == [result.id for result in expected]
+    assert got[0].id == "v42"
@@ -0,0 +1,42 @@
+"""
+Startup Tests - Deferred heavy imports, background warmup and import profiling
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from app.dependencies import ServiceContainer
+from app.startup_profile import BACKEND_DIR, by_package, import_profile
+
+
+def test_importing_the_app_skips_heavy_packages():
+    script = "import sys, app.main; print(','.join(m for m in ('numpy', 'httpx') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", script], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == ""
+
+
+@pytest.mark.asyncio
+async def test_ready_before_background_warmup_finishes(settings):
+    services = ServiceContainer.from_settings(settings)
+
+    assert await services.start()
+    assert services.readiness()["ready"]
+    await services.background_warmup
+    assert services.readiness()["background_warmup"] == "done"
+    await services.close()
+
+
+def test_import_profile_groups_app_modules():
+    modules = import_profile("app.config")
+
+    assert any(record["module"] == "app.config" for record in modules)
+    totals = by_package([
+        {"module": "app.services.rag_service", "self_ms": 2.0},
+        {"module": "app.services.text_store", "self_ms": 1.0},
+        {"module": "pydantic.main", "self_ms": 3.0},
+        {"module": "pydantic", "self_ms": 1.0},
+    ])
+    assert totals == {"pydantic": 4.0, "app.services": 3.0}
@@ -0,0 +1,99 @@
+"""
+Document Storage Tests - Streamed local and multipart S3 uploads
+"""
+
+import hashlib
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.services.storage import LocalDocumentStorage, S3DocumentStorage, UploadTooLarge
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+class _S3Client:
+    """Records multipart calls the way boto3's S3 client would receive them"""
+
+    def __init__(self):
+        self.parts: list[bytes] = []
+        self.completed = None
+        self.aborted = False
+
+    def create_multipart_upload(self, Bucket: str, Key: str, **extra) -> dict:
+        self.key = Key
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body: bytes) -> dict:
+        self.parts.append(Body)
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket: str, Key: str, UploadId: str, MultipartUpload: dict) -> None:
+        self.completed = MultipartUpload["Parts"]
+
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str) -> None:
+        self.aborted = True
+
+
+@pytest.mark.asyncio
+async def test_local_save_hashes_while_streaming(tmp_path):
+    storage = LocalDocumentStorage(str(tmp_path))
+
+    stored = await storage.save("org-a/c1/msa.txt", _chunks(b"Fees are ", b"due monthly."), "text/plain")
+
+    assert (stored.size, stored.sha256) == (21, hashlib.sha256(b"Fees are due monthly.").hexdigest())
+    async with storage.local_copy(stored.key) as path:
+        with open(path, "rb") as handle:
+            assert handle.read() == b"Fees are due monthly."
+    assert await storage.delete(stored.key)
+    assert os.listdir(tmp_path) == []
+    assert not await storage.delete(stored.key)
+
+
+@pytest.mark.asyncio
+async def test_local_oversized_upload_leaves_nothing_behind(tmp_path):
+    storage = LocalDocumentStorage(str(tmp_path))
+
+    with pytest.raises(UploadTooLarge):
+        await storage.save("org-a/c1/big.txt", _chunks(b"x" * 6, b"x" * 6), max_bytes=10)
+    assert os.listdir(tmp_path) == []
+
+    with pytest.raises(ValueError):
+        storage.path("../outside.txt")
+
+
+@pytest.mark.asyncio
+async def test_s3_buffers_at_most_one_part():
+    client = _S3Client()
+    storage = S3DocumentStorage("contracts", prefix="uploads/", part_size=0, client=client)
+    part = 5 * 1024 * 1024
+
+    stored = await storage.save("org-a/c1/msa.pdf", _chunks(b"a" * part, b"b" * 10, b"c" * part, b"d"))
+
+    assert client.key == "uploads/org-a/c1/msa.pdf"
+    assert [len(body) for body in client.parts] == [part, part + 10, 1]
+    assert client.completed == [{"ETag": f"etag-{n}", "PartNumber": n} for n in (1, 2, 3)]
+    assert stored.size == 2 * part + 11
+
+
+@pytest.mark.asyncio
+async def test_s3_aborts_oversized_upload():
+    client = _S3Client()
+    storage = S3DocumentStorage("contracts", client=client)
+
+    with pytest.raises(UploadTooLarge):
+        await storage.save("c1.pdf", _chunks(b"x" * 20), max_bytes=10)
+    assert client.aborted and client.completed is None
+
+
+def test_upload_rejects_unsafe_organization_ids(settings):
+    upload = {"file": ("msa.txt", b"Fees are due monthly.", "text/plain")}
+    with TestClient(create_app(), base_url="http://localhost") as client:
+        for organization_id in ("..", "org/a", "org a"):
+            response = client.post("/api/v1/contracts/upload", data={"organization_id": organization_id}, files=upload)
+            assert response.status_code == 422
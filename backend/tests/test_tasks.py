@@ -0,0 +1,258 @@
+"""
+Job Queue Tests - Priorities, tenant fairness, deduplication and retries
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.services.alert_service import AlertScheduler
+from app.tasks import InMemoryJobStore, Job, JobPriority, JobQueue, analyze_contract
+
+
+async def _until_done(queue: JobQueue, job_id: str, timeout: float = 2.0) -> dict:
+    async def poll() -> dict:
+        while True:
+            record = await queue.get(job_id)
+            if record["status"] in ("succeeded", "failed"):
+                return record
+            await asyncio.sleep(0.005)
+
+    return await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_priority_then_round_robin_across_tenants():
+    order = []
+
+    async def record(job: Job, context) -> None:
+        order.append(job.payload["name"])
+
+    queue = JobQueue({"work": record}, concurrency=1)
+    submitted = [
+        await queue.submit("work", {"name": "bulk"}, "org-a", JobPriority.BULK),
+        await queue.submit("work", {"name": "a1"}, "org-a"),
+        await queue.submit("work", {"name": "a2"}, "org-a"),
+        await queue.submit("work", {"name": "a3"}, "org-a"),
+        await queue.submit("work", {"name": "b1"}, "org-b"),
+        await queue.submit("work", {"name": "upload"}, "org-c", JobPriority.INTERACTIVE),
+    ]
+    assert queue.stats()["queued"] == {"bulk": 1, "default": 4, "interactive": 1}
+
+    queue.start()
+    for job in submitted:
+        await _until_done(queue, job["id"])
+    await queue.stop()
+
+    # org-a's backlog does not hold org-b back; bulk work goes last
+    assert order == ["upload", "a1", "b1", "a2", "a3", "bulk"]
+
+
+@pytest.mark.asyncio
+async def test_identical_submissions_share_a_job():
+    runs = []
+
+    async def work(job: Job, context) -> str:
+        runs.append(job.id)
+        return "done"
+
+    queue = JobQueue({"work": work}, concurrency=2)
+    first = await queue.submit("work", {}, "org-a", dedup_key="org-a:sha")
+    second = await queue.submit("work", {}, "org-a", dedup_key="org-a:sha")
+    other = await queue.submit("work", {}, "org-b", dedup_key="org-b:sha")
+    assert second["id"] == first["id"]
+    assert other["id"] != first["id"]
+
+    queue.start()
+    assert (await _until_done(queue, first["id"]))["result"] == "done"
+    await _until_done(queue, other["id"])
+    assert (await queue.submit("work", {}, "org-a", dedup_key="org-a:sha"))["id"] == first["id"]
+    await queue.stop()
+    assert len(runs) == 2
+
+
+@pytest.mark.asyncio
+async def test_failures_retry_with_backoff_then_give_up():
+    attempts = {"flaky": 0, "broken": 0}
+
+    async def flaky(job: Job, context) -> int:
+        attempts[job.payload["name"]] += 1
+        if job.payload["name"] == "broken" or attempts["flaky"] < 2:
+            raise RuntimeError("upstream timeout")
+        job.report(0.5, "halfway")
+        return attempts["flaky"]
+
+    queue = JobQueue({"work": flaky}, concurrency=1, retry_backoff=0.01)
+    flaky_job = await queue.submit("work", {"name": "flaky"}, "org-a", dedup_key="flaky")
+    broken_job = await queue.submit("work", {"name": "broken"}, "org-a", max_attempts=2, dedup_key="broken")
+    queue.start()
+
+    record = await _until_done(queue, flaky_job["id"])
+    assert (record["status"], record["attempts"], record["result"]) == ("succeeded", 2, 2)
+    assert (record["progress"], record["stage"], record["error"]) == (1.0, "halfway", None)
+
+    record = await _until_done(queue, broken_job["id"])
+    assert (record["status"], record["attempts"], record["error"]) == ("failed", 2, "upstream timeout")
+
+    # A failed job does not absorb resubmissions
+    resubmitted = await queue.submit("work", {"name": "broken"}, "org-a", dedup_key="broken")
+    assert resubmitted["id"] != broken_job["id"]
+    await queue.stop()
+
+
+class _SharedStore(InMemoryJobStore):
+    shared = True
+
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    async def save(self, job: Job) -> None:
+        self.writes.append((job.status.value, job.progress, job.stage))
+        await super().save(job)
+
+
+@pytest.mark.asyncio
+async def test_progress_is_written_through_to_a_shared_store():
+    store = _SharedStore()
+    release = asyncio.Event()
+
+    async def slow(job: Job, context) -> None:
+        job.report(0.5, "embedding")
+        await release.wait()
+
+    queue = JobQueue({"work": slow}, concurrency=1, store=store, progress_interval=0.01)
+    job = await queue.submit("work", {}, "org-a")
+    queue.start()
+    for _ in range(200):
+        if ("running", 0.5, "embedding") in store.writes:
+            break
+        await asyncio.sleep(0.005)
+    assert ("running", 0.5, "embedding") in store.writes
+
+    release.set()
+    await _until_done(queue, job["id"])
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_pending_retries():
+    attempts = []
+
+    async def failing(job: Job, context) -> None:
+        attempts.append(job.id)
+        raise RuntimeError("upstream timeout")
+
+    queue = JobQueue({"work": failing}, concurrency=1, retry_backoff=0.05)
+    await queue.submit("work", {}, "org-a")
+    queue.start()
+    for _ in range(200):
+        if queue._retries:
+            break
+        await asyncio.sleep(0.005)
+    await queue.stop()
+
+    await asyncio.sleep(0.1)
+    assert len(attempts) == 1 and not queue._retries
+
+
+@pytest.mark.asyncio
+async def test_failed_stage_stops_the_running_ingest():
+    ingest = {"started": asyncio.Event(), "cancelled": False}
+
+    class _RAG:
+        near_duplicates = None
+
+        async def ingest_pages(self, contract_id, pages, metadata):
+            async for _ in pages:
+                pass
+            ingest["started"].set()
+            try:
+                await asyncio.sleep(10)  # Embedding
+            except asyncio.CancelledError:
+                ingest["cancelled"] = True
+                raise
+
+    class _LLM:
+        async def summarize_contract(self, text, vendor=None):
+            await ingest["started"].wait()
+            raise RuntimeError("upstream timeout")
+
+        async def analyze_risk(self, text):
+            await asyncio.sleep(10)
+
+        async def identify_obligations(self, text):
+            await asyncio.sleep(10)
+
+    services = SimpleNamespace(llm_service=_LLM(), rag_service=_RAG(), alert_scheduler=AlertScheduler())
+    job = Job(id="j1", kind="analyze_contract", tenant_id="org-a", priority=JobPriority.DEFAULT, payload={
+        "contract_id": "c1", "organization_id": "org-a", "text": "Fees are due monthly.",
+    })
+
+    with pytest.raises(RuntimeError, match="upstream timeout"):
+        await asyncio.wait_for(analyze_contract(job, services), 2.0)
+    # A retry must not find the first attempt still embedding
+    assert ingest["cancelled"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_kind_is_rejected():
+    queue = JobQueue({})
+
+    with pytest.raises(ValueError):
+        await queue.submit("missing", {}, "org-a")
+    assert await queue.get("nope") is None
+
+
+@pytest.mark.asyncio
+async def test_forgotten_contract_no_longer_absorbs_submissions():
+    async def work(job: Job, context) -> None:
+        return None
+
+    queue = JobQueue({"work": work})
+    first = await queue.submit("work", {"contract_id": "c1"}, "org-a", dedup_key="org-a:sha")
+    assert await queue.forget_contract("c1")
+    assert not await queue.forget_contract("c1")
+
+    again = await queue.submit("work", {"contract_id": "c2"}, "org-a", dedup_key="org-a:sha")
+    assert again["id"] != first["id"]
+    assert (await queue.submit("work", {"contract_id": "c3"}, "org-a", dedup_key="org-a:sha"))["id"] == again["id"]
+
+
+def test_upload_queues_one_job_per_content(settings):
+    async def analyzed(job: Job, services) -> dict:
+        return {"contract_id": job.payload["contract_id"]}
+
+    with TestClient(create_app(), base_url="http://localhost") as client:
+        client.app.state.services.job_queue.handlers["analyze_contract"] = analyzed
+        upload = {"file": ("msa.txt", b"Fees are due monthly.", "text/plain")}
+
+        first = client.post("/api/v1/contracts/upload", data={"organization_id": "org-a"}, files=upload)
+        assert first.status_code == 202
+        job = first.json()
+        assert job["status_url"] == f"/api/v1/jobs/{job['id']}"
+
+        again = client.post("/api/v1/contracts/upload", data={"organization_id": "org-a"}, files=upload)
+        assert again.json()["id"] == job["id"]
+        bad = client.post(
+            "/api/v1/contracts/upload", data={"organization_id": "org-a", "priority": "urgent"}, files=upload
+        )
+        assert bad.status_code == 422
+
+        for _ in range(200):
+            status = client.get(job["status_url"]).json()
+            if status["status"] == "succeeded":
+                break
+            time.sleep(0.01)
+        assert status["status"] == "succeeded"
+        assert status["result"]["contract_id"]
+        assert client.get("/api/v1/jobs/missing").status_code == 404
+
+        # Once the contract is deleted, the same content is analysed afresh
+        assert client.delete(f"/api/v1/contracts/{status['result']['contract_id']}").status_code == 200
+        reuploaded = client.post("/api/v1/contracts/upload", data={"organization_id": "org-a"}, files=upload)
+        assert reuploaded.json()["id"] != job["id"]
@@ -0,0 +1,81 @@
+"""
+Term Extractor Tests - Deterministic key dates for a fixed reference day
+"""
+
+from datetime import date
+
+from app.services.term_extractor import ContractTerms, extract_terms
+
+AUTO_RENEWING = (
+    "This Agreement is effective as of January 15, 2025 and continues for an initial term of 12 months. "
+    "It shall automatically renew for successive 12-month periods unless either party gives written notice "
+    "of non-renewal at least 60 days prior to the end of the then-current term. "
+    "Invoices are payable within 30 days of receipt."
+)
+
+
+def test_auto_renewal_rolls_past_elapsed_terms():
+    terms = extract_terms(AUTO_RENEWING, today=date(2026, 3, 1))
+
+    assert terms.effective_date == date(2025, 1, 15)
+    assert terms.expiration_date == date(2026, 1, 15)
+    assert terms.auto_renews
+    assert terms.renewal_term == (12, "month")
+    assert terms.renewal_date == date(2027, 1, 15)
+    assert terms.notice == (60, "day")
+    assert terms.notice_deadline == date(2026, 11, 16)
+    assert terms.notice_for == date(2027, 1, 15)
+    assert terms.payment_days == 30
+
+
+def test_missed_notice_deadline_moves_to_next_renewal():
+    terms = extract_terms(AUTO_RENEWING, today=date(2026, 12, 1))
+
+    # Too late to stop the January 2027 renewal; the 2028 one is still avoidable
+    assert terms.renewal_date == date(2027, 1, 15)
+    assert terms.notice_for == date(2028, 1, 15)
+    assert terms.notice_deadline == date(2027, 11, 16)
+
+
+def test_business_day_notice_skips_weekends():
+    text = (
+        "This Agreement expires on December 31, 2026 unless either party gives written notice "
+        "of non-renewal at least 10 business days prior to expiration."
+    )
+    terms = extract_terms(text, today=date(2026, 10, 1))
+
+    assert terms.notice == (10, "business_day")
+    assert terms.notice_deadline == date(2026, 12, 17)
+    assert terms.notice_deadline.weekday() < 5
+
+
+def test_same_text_and_day_give_same_terms():
+    first = extract_terms(AUTO_RENEWING, today=date(2026, 3, 1))
+    second = extract_terms(AUTO_RENEWING, today=date(2026, 3, 1))
+
+    assert first.to_dict(date(2026, 3, 1)) == second.to_dict(date(2026, 3, 1))
+
+
+def test_zero_length_renewal_periods_do_not_hang():
+    text = (
+        "This Agreement is effective as of January 1, 2020 and shall automatically renew "
+        "for successive periods of 0 months."
+    )
+    terms = extract_terms(text, today=date(2026, 1, 1))
+
+    # "0 months" is no period: the end of the term is unknown
+    assert terms.auto_renews and terms.renewal_term is None and terms.renewal_date is None
+
+    stored = ContractTerms(expiration_date=date(2021, 1, 1), auto_renews=True, renewal_term=(0, "month"))
+    assert stored.as_of(date(2026, 1, 1)).renewal_date == date(2021, 1, 1)
+
+
+def test_renewals_past_the_last_representable_date_stop_rolling():
+    text = (
+        "This Agreement expires on December 31, 9998 and shall automatically renew for successive "
+        "5-year periods unless either party gives notice at least 30 days prior to expiration."
+    )
+    terms = extract_terms(text, today=date(9999, 6, 1))
+
+    assert terms.renewal_date == date(9998, 12, 31)
+    assert terms.notice_deadline == date(9998, 12, 1)
@@ -0,0 +1,89 @@
+"""
+Text Store Tests - Block-compressed contract text and offset hydration
+"""
+
+import numpy as np
+import pytest
+
+from app.services.rag_service import RAGService, RetrievalContext
+from app.services.text_store import DocumentTextStore, normalize_text
+from app.services.vector_service import VectorService
+
+
+class _Embedder:
+    """Same direction for every text, so every chunk matches every query"""
+
+    async def embed_text(self, text: str) -> list[float]:
+        vector = np.zeros(1536, dtype=np.float32)
+        vector[0] = 1.0
+        return vector.tolist()
+
+    async def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        return [await self.embed_text(text) for text in texts]
+
+
+def test_normalize_text():
+    text = "Ｆｅｅｓ\r\n\tare   due ﬁne.  \r\n\r\n\r\n\r\nTerm one year.  "
+
+    assert normalize_text(text) == "Fees\nare due fine.\n\nTerm one year."
+
+
+def test_slices_across_block_boundaries(tmp_path):
+    store = DocumentTextStore(str(tmp_path), block_size=16, cache_blocks=2)
+    text = "".join(f"clause {i:03d}; " for i in range(200))
+    store.put("c1", text)
+
+    for start, end in [(0, 5), (10, 40), (15, 17), (1500, len(text)), (0, len(text))]:
+        assert store.get("c1", start, end) == text[start:end]
+    assert store.get("c1") == text
+    assert store.get("c1", 50, 40) == ""
+    assert store.get_many([("c1", 0, 6), ("missing", 0, 6)]) == ["clause", None]
+    assert store.stats()["cached_blocks"] <= 2
+
+
+def test_replace_and_delete(tmp_path):
+    store = DocumentTextStore(str(tmp_path), block_size=8)
+    store.put("c1", "first version of the text")
+    assert store.get("c1", 0, 5) == "first"
+
+    store.put("c1", "second version")
+    assert store.get("c1", 0, 6) == "second"
+
+    assert store.delete("c1")
+    assert not store.has("c1")
+    assert store.get("c1") is None
+    assert not store.delete("c1")
+
+
+def test_ids_that_sanitize_alike_keep_separate_files(tmp_path):
+    store = DocumentTextStore(str(tmp_path))
+    store.put("a/b", "slash")
+    store.put("a_b", "underscore")
+
+    assert (store.get("a/b"), store.get("a_b")) == ("slash", "underscore")
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_open_maps_are_bounded(tmp_path):
+    store = DocumentTextStore(str(tmp_path), max_open_files=2)
+    for contract in range(4):
+        store.put(f"c{contract}", f"text of contract {contract}")
+        assert store.get(f"c{contract}", 0, 4) == "text"
+
+    assert store.stats()["open_files"] == 2
+    store.close()
+    assert store.stats()["open_files"] == 0
+
+
+@pytest.mark.asyncio
+async def test_vectors_reference_stored_text_by_offset(tmp_path):
+    vectors = VectorService(api_key="test")
+    rag = RAGService(llm_service=_Embedder(), vector_service=vectors, text_store=DocumentTextStore(str(tmp_path)))
+    text = "Fees  are due monthly.\r\nThe term is one year."
+
+    await rag.ingest_document("c1", text, {"organization_id": "org-a"})
+    stored = await vectors.search(await _Embedder().embed_text(""), top_k=5, filters={"contract_id": "c1"})
+    assert stored and all("text" not in result.metadata for result in stored)
+
+    retrieved = await rag.retrieve_context(RetrievalContext(query="fees", filters={"contract_id": "c1"}))
+    assert retrieved[0]["text"] == "Fees are due monthly.\nThe term is one year."
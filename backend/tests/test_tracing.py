@@ -0,0 +1,104 @@
+"""
+Tracing Tests - Nested spans, Server-Timing and OTLP export
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.tracing import OTLPExporter, current_trace_id, server_timing, span, start_trace, trace_service
+
+
+class _Service:
+    async def search(self, query: str, top_k: int = 5) -> list:
+        return await asyncio.to_thread(self._search_partition, query, top_k=top_k)
+
+    def _search_partition(self, query: str, top_k: int) -> list:
+        return [query] * top_k
+
+    async def stream(self, count: int):
+        for index in range(count):
+            yield index
+
+    async def fail(self) -> None:
+        raise RuntimeError("boom")
+
+
+class _Client:
+    def __init__(self):
+        self.posts = []
+
+    async def post(self, url: str, json: dict, timeout: float) -> None:
+        self.posts.append((url, json))
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_across_threads():
+    service = trace_service(_Service(), "vector", private=("_search_partition",))
+
+    assert await service.search("fees", top_k=2) == ["fees", "fees"]
+    with start_trace("GET /search", trace_id="a" * 32) as trace:
+        assert current_trace_id() == "a" * 32
+        await service.search("fees", top_k=2)
+        assert [item async for item in service.stream(2)] == [0, 1]
+        with pytest.raises(RuntimeError):
+            await service.fail()
+    assert current_trace_id() is None
+
+    root, search, partition, stream, fail = trace.spans
+    assert [item.name for item in trace.spans] == [
+        "GET /search", "vector.search", "vector.search_partition", "vector.stream", "vector.fail"
+    ]
+    assert search.parent_id == root.span_id
+    assert partition.parent_id == search.span_id
+    assert stream.parent_id == root.span_id
+    assert search.attributes == {"top_k": 2}
+    assert fail.error == "RuntimeError('boom')"
+    assert all(item.end_ns is not None for item in trace.spans)
+
+
+def test_span_is_a_noop_outside_a_trace():
+    with span("orphan") as current:
+        assert current is None
+
+
+def test_server_timing_sums_repeated_stages():
+    with start_trace("request") as trace:
+        for _ in range(2):
+            with span("llm.embed"):
+                pass
+        with span("vector.search"):
+            pass
+    trace.spans[1].end_ns = trace.spans[1].start_ns + 3_000_000
+    trace.spans[2].end_ns = trace.spans[2].start_ns + 2_000_000
+    trace.spans[3].end_ns = trace.spans[3].start_ns + 1_000_000
+
+    assert trace.stage_timings() == {"llm.embed": 5.0, "vector.search": 1.0}
+    assert server_timing(trace, 12.34) == "llm-embed;dur=5.0, vector-search;dur=1.0, total;dur=12.3"
+
+
+@pytest.mark.asyncio
+async def test_exporter_batches_and_drops_under_pressure():
+    client = _Client()
+    exporter = OTLPExporter("http://collector/v1/traces", client, batch_size=2, max_queue=3)
+    for _ in range(4):
+        with start_trace("job") as trace:
+            pass
+        exporter.submit(trace)
+    assert exporter.dropped == 1
+
+    await exporter.stop()
+    assert [len(body["resourceSpans"][0]["scopeSpans"][0]["spans"]) for _, body in client.posts] == [2, 1]
+    exported = client.posts[0][1]["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert exported["kind"] == 2 and exported["status"] == {"code": 1}
+
+
+def test_responses_carry_trace_headers(settings):
+    trace_id = "0af7651916cd43dd8448eb211c80319c"
+    with TestClient(create_app(), base_url="http://localhost") as client:
+        response = client.get("/health", headers={"traceparent": f"00-{trace_id}-b7ad6b7169203331-01"})
+
+    assert response.headers["x-trace-id"] == trace_id
+    assert response.headers["server-timing"].split(", ")[-1].startswith("total;dur=")
@@ -0,0 +1,140 @@
+"""
+Vector Tenancy Tests - Per-organization partitions, memory budgets and spill/load
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from app.services.vector_service import VectorService
+
+# One 16-row matrix of 1536 float32 values: the smallest resident partition
+PARTITION_BYTES = 16 * 1536 * 4
+
+
+def _vector(*weights: float) -> list[float]:
+    vector = np.zeros(1536, dtype=np.float32)
+    vector[:len(weights)] = weights
+    return vector.tolist()
+
+
+async def _fill(vectors: VectorService, organization_id: str, contracts: int) -> None:
+    for contract in range(contracts):
+        await vectors.upsert(
+            f"{organization_id}-c{contract}_chunk_0",
+            _vector(1.0, 0.1 * contract),
+            {"contract_id": f"{organization_id}-c{contract}", "organization_id": organization_id},
+        )
+
+
+@pytest.mark.asyncio
+async def test_searches_scan_only_the_tenants_partitions():
+    vectors = VectorService(api_key="test", partition_count=4, hedge_searches=False)
+    await _fill(vectors, "org-a", 6)
+    await _fill(vectors, "org-b", 6)
+
+    results = await vectors.search(_vector(1.0), top_k=20, filters={"organization_id": "org-a"}, threshold=0.0)
+    assert len(results) == 6 and {result.metadata["organization_id"] for result in results} == {"org-a"}
+
+    pinned = await vectors.search(_vector(1.0), top_k=5, filters={"contract_id": "org-b-c2"}, threshold=0.0)
+    assert [result.id for result in pinned] == ["org-b-c2_chunk_0"]
+
+    stats = (await vectors.get_stats())["tenants"]
+    assert stats["org-a"]["searches"] == stats["org-a"]["partitions"]
+    assert stats["org-b"]["searches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_budget_spills_only_the_tenants_own_partitions(tmp_path):
+    vectors = VectorService(
+        api_key="test", partition_count=4, tenant_memory_bytes=PARTITION_BYTES, spill_dir=str(tmp_path)
+    )
+    await _fill(vectors, "org-b", 1)
+    await _fill(vectors, "org-a", 8)
+
+    stats = (await vectors.get_stats())["tenants"]
+    assert stats["org-a"]["partitions"] > 1
+    assert stats["org-a"]["resident_partitions"] == 1 and stats["org-a"]["unloads"] > 0
+    assert (stats["org-b"]["resident_partitions"], stats["org-b"]["unloads"]) == (1, 0)
+
+    # Spilled partitions load back on use, and every vector is still found
+    results = await vectors.search(_vector(1.0), top_k=20, filters={"organization_id": "org-a"}, threshold=0.0)
+    assert len(results) == 8
+    stats = (await vectors.get_stats())["tenants"]
+    assert stats["org-a"]["loads"] > 0
+    assert stats["org-a"]["resident_bytes"] <= PARTITION_BYTES
+
+
+@pytest.mark.asyncio
+async def test_idle_partitions_spill_and_clean_ones_are_not_rewritten(tmp_path):
+    vectors = VectorService(api_key="test", partition_count=1, spill_dir=str(tmp_path))
+    await _fill(vectors, "org-a", 3)
+
+    assert vectors.unload_idle(idle_seconds=0) == 1
+    spilled = sorted(path.name for path in tmp_path.iterdir())
+    assert len(spilled) == 2
+    written = {path.name: path.stat().st_mtime_ns for path in tmp_path.iterdir()}
+
+    fetched = await vectors.fetch(["org-a-c1_chunk_0"], contract_id="org-a-c1")
+    assert fetched["org-a-c1_chunk_0"].metadata["organization_id"] == "org-a"
+    assert vectors.unload_idle(idle_seconds=0) == 1
+    assert {path.name: path.stat().st_mtime_ns for path in tmp_path.iterdir()} == written
+
+
+@pytest.mark.asyncio
+async def test_deleting_a_tenants_last_vector_drops_its_partition(tmp_path):
+    vectors = VectorService(api_key="test", partition_count=1, spill_dir=str(tmp_path))
+    await _fill(vectors, "org-a", 1)
+    vectors.unload_idle(idle_seconds=0)
+
+    assert await vectors.delete_by_metadata({"contract_id": "org-a-c0"})
+    assert (await vectors.get_stats())["tenants"] == {}
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_partition_io_runs_off_the_event_loop(tmp_path):
+    vectors = VectorService(api_key="test", partition_count=1, spill_dir=str(tmp_path), hedge_searches=False)
+    threads = set()
+    resident = vectors._resident
+
+    def recording(partition):
+        threads.add(threading.get_ident())
+        return resident(partition)
+
+    vectors._resident = recording
+    await _fill(vectors, "org-a", 2)
+    vectors.unload_idle(idle_seconds=0)
+    await vectors.fetch(["org-a-c0_chunk_0"], contract_id="org-a-c0")
+    await vectors.delete("org-a-c1_chunk_0")
+
+    assert threads and threading.get_ident() not in threads
+
+
+@pytest.mark.asyncio
+async def test_queries_see_a_consistent_partition_while_rows_are_deleted():
+    vectors = VectorService(api_key="test", partition_count=1, hedge_searches=False)
+    await vectors.upsert("kept", _vector(1.0), {"contract_id": "kept", "organization_id": "org-a"})
+    await _fill(vectors, "org-a", 40)
+
+    deletes = [vectors.delete(f"org-a-c{contract}_chunk_0") for contract in range(40)]
+    searches = [
+        vectors.search(_vector(1.0), top_k=50, filters={"organization_id": "org-a"}, threshold=0.0)
+        for _ in range(40)
+    ]
+    outcomes = await asyncio.gather(*deletes, *searches)
+
+    assert all(any(result.id == "kept" for result in results) for results in outcomes[40:])
+
+
+@pytest.mark.asyncio
+async def test_upsert_after_the_partition_was_dropped_lands_in_its_replacement():
+    vectors = VectorService(api_key="test", partition_count=1, hedge_searches=False)
+    await _fill(vectors, "org-a", 1)
+    await vectors.delete("org-a-c0_chunk_0")
+    await _fill(vectors, "org-a", 1)
+
+    results = await vectors.search(_vector(1.0), top_k=5, filters={"organization_id": "org-a"}, threshold=0.0)
+    assert [result.id for result in results] == ["org-a-c0_chunk_0"]